@@ -6,24 +6,35 @@ API that the SRT formatter module can call, replacing the original monolithic
 script. The library supports concurrent formatting with different presets
 (broadcast vs social) without global state.
 
-HOW: The single public entry point is format_srt(words, preset). It resolves
+HOW: The main public entry point is format_srt(words, preset). It resolves
 the preset name to a config dict, runs the DP segmentation pipeline, and
-returns the finished SRT string. All internal functions receive the config
-dict as an explicit parameter.
+returns the finished SRT string. format_srt_multi(words, presets) renders
+several presets from shared preprocessing. All internal functions receive
+the config dict as an explicit parameter. Both entry points optionally fill
+a SegmentationStats with DP counters and stage timings.
 
 RULES:
-- format_srt() is the ONLY public API for producing SRT output.
+- format_srt() and format_srt_multi() are the public API for producing SRT
+  output from a complete word list; StreamingSegmenter produces the same
+  cues incrementally. SpanFeatures re-runs segmentation under new weights
+  for tuning.
 - Preset names: "broadcast" (default), "social", "some" (alias for social).
-- The words list must contain Word objects from format_captions.models.
-- Never mutate the preset constants — copies are made internally.
+- The words list must contain Word objects from format_captions.models, or
+  be a columnar WordArray.
+- Never mutate the preset constants — they are compiled into read-only
+  CompiledConfig objects internally.
 - Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
 """
 
-import copy
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Sequence, Union
 
-from .models import Word
+from .cache import LineBreakCache
+from .compiled import CompiledConfig, compile_config, resolve_config
+from .models import Word, WordArray, Words
 from .presets import PRESETS, PRESET_BROADCAST, PRESET_SOCIAL, WEAK_END_WORDS
+from .spans import SpanIndex
+from .stats import SegmentationStats, timed
 from .core import (
     segment_words,
     best_line_break,
@@ -31,10 +42,22 @@ from .core import (
     parse_input,
     try_parse_json,
 )
+from .features import SpanFeatures
+from .reader import iter_words, read_words
+from .parallel import segment_words_parallel
+from .streaming import StreamingSegmenter
 
 __all__ = [
     "format_srt",
+    "format_srt_multi",
+    "CompiledConfig",
+    "compile_config",
+    "LineBreakCache",
+    "SegmentationStats",
+    "SpanFeatures",
+    "StreamingSegmenter",
     "Word",
+    "WordArray",
     "PRESETS",
     "PRESET_BROADCAST",
     "PRESET_SOCIAL",
@@ -43,9 +66,14 @@ __all__ = [
 
 
 def format_srt(
-    words: List[Word],
+    words: Words,
     preset: str = "broadcast",
-    config: Optional[dict] = None,
+    config: Union[dict, CompiledConfig, None] = None,
+    cache: Optional[LineBreakCache] = None,
+    workers: Optional[int] = None,
+    stats: Optional[SegmentationStats] = None,
+    strategy: Optional[str] = None,
+    chunk_words: Optional[int] = None,
 ) -> str:
     """Format timestamped words into an SRT subtitle string.
 
@@ -53,43 +81,120 @@ def format_srt(
     library. External code (the SRT formatter adapter, CLI, tests) calls
     this function instead of reaching into internal modules.
 
-    HOW: Resolves the preset name to a config dict (or uses a custom config),
-    makes a deep copy to avoid mutating constants, then runs the full pipeline:
-    segment_words() -> generate_srt().
+    HOW: Resolves the preset name (or a custom config) to a cached, read-only
+    CompiledConfig — compiled once per process, never copied per call — then
+    runs the full pipeline:
+    segment_words() -> generate_srt(). Line-break layouts are memoized in a
+    bounded LineBreakCache — a fresh one per call unless the caller passes
+    one in to reuse layouts across calls or read its hit/miss counters.
+    With workers > 1, the forced-break partitions are segmented in a process
+    pool instead (see segment_words_parallel()). strategy="beam" trades a
+    little caption quality for speed (drafts, previews); see segment_words().
+    chunk_words splits long single-speaker stretches at sentence anchors so
+    they can be solved in parallel with bounded memory (approximate near
+    the seams; see segment_words_parallel()).
 
     RULES:
     - preset must be one of: "broadcast", "social", "some".
     - If config is provided, it overrides the preset entirely.
     - Returns empty string if words list is empty or segmentation fails.
-    - Thread-safe: each call works on its own config copy.
+    - Thread-safe: compiled configs are read-only and shared. A caller-supplied
+      cache must not be shared between threads.
+    - Parallel output is identical to serial output; the cache is not used
+      in parallel mode.
 
     Args:
-        words: List of Word objects with timing and metadata.
+        words: List of Word objects (or a WordArray) with timing and metadata.
         preset: Preset name ("broadcast", "social", "some"). Default: "broadcast".
-        config: Optional custom config dict. If provided, preset is ignored.
+        config: Optional custom config dict or CompiledConfig. If provided,
+            preset is ignored.
+        cache: Optional LineBreakCache to memoize line-break layouts in.
+        workers: Process count for parallel segmentation. None or 1 runs
+            serially.
+        stats: Optional SegmentationStats to add DP counters and stage
+            times (including "srt" for SRT rendering) to.
+        strategy: Segmentation search, "exact" or "beam". None uses the
+            config's "strategy" key (presets: "exact").
+        chunk_words: Split forced-break-free stretches longer than this
+            into chunks solved independently. None solves them whole.
 
     Returns:
         SRT-formatted subtitle string.
 
     Raises:
-        ValueError: If preset name is not recognized and no config is provided.
+        ValueError: If preset name is not recognized and no config is provided,
+            or strategy is not recognized.
     """
-    if config is not None:
-        cfg = copy.deepcopy(config)
-    else:
-        if preset not in PRESETS:
-            raise ValueError(
-                "Unknown preset '{}'. Available: {}".format(
-                    preset, ", ".join(PRESETS.keys())
-                )
-            )
-        cfg = copy.deepcopy(PRESETS[preset])
+    cfg = resolve_config(preset, config)
 
     if not words:
         return ""
 
-    segments = segment_words(words, cfg)
+    if (workers is not None and workers > 1) or chunk_words is not None:
+        segments = segment_words_parallel(words, cfg, max_workers=workers or 1, stats=stats,
+                                          strategy=strategy, chunk_words=chunk_words)
+    else:
+        if cache is None:
+            cache = LineBreakCache()
+        segments = segment_words(words, cfg, cache, stats=stats, strategy=strategy)
     if not segments:
         return ""
 
-    return generate_srt(segments, cfg)
+    with timed(stats, "srt"):
+        return generate_srt(segments, cfg)
+
+
+def format_srt_multi(
+    words: Words,
+    presets: Sequence[str] = ("broadcast", "social"),
+    stats: Optional[Dict[str, SegmentationStats]] = None,
+) -> Dict[str, str]:
+    """Format one word list into SRT strings for several presets at once.
+
+    WHY: A conversion job usually renders both broadcast and social captions
+    of the same transcript. Calling format_srt() once per preset repeats the
+    preset-independent preprocessing for every output.
+
+    HOW: Builds the SpanIndex (span lengths, speaker flags, forced breaks and
+    timing) once and hands it to segment_words() for each preset. Only the
+    parts that depend on the preset — the character lookback, the DP and the
+    line-break layouts — run per preset.
+
+    RULES:
+    - Each result is identical to format_srt(words, preset=name).
+    - Results are keyed by preset name, in the order given; repeated names
+      are rendered once.
+    - Raises before rendering anything if a preset name is unknown.
+    - With a stats dict, a fresh SegmentationStats is stored under each
+      preset name; the shared "index" time is recorded in every one.
+
+    Args:
+        words: List of Word objects (or a WordArray) with timing and metadata.
+        presets: Preset names ("broadcast", "social", "some").
+        stats: Optional dict to receive one SegmentationStats per preset.
+
+    Returns:
+        Dict mapping each preset name to its SRT-formatted subtitle string.
+
+    Raises:
+        ValueError: If a preset name is not recognized.
+    """
+    configs = {}  # type: Dict[str, CompiledConfig]
+    for name in presets:
+        if name not in configs:
+            configs[name] = resolve_config(name)
+
+    index_start = time.perf_counter()
+    spans = SpanIndex(words) if words else None
+    index_s = time.perf_counter() - index_start
+
+    results = {}  # type: Dict[str, str]
+    for name, cfg in configs.items():
+        preset_stats = None  # type: Optional[SegmentationStats]
+        if stats is not None:
+            preset_stats = stats[name] = SegmentationStats()
+            preset_stats.add_time("index", index_s)
+        segments = segment_words(words, cfg, LineBreakCache(), spans=spans, stats=preset_stats)
+        with timed(preset_stats, "srt"):
+            results[name] = generate_srt(segments, cfg) if segments else ""
+    return results
@@ -0,0 +1,95 @@
+"""Bounded memoization layer for caption line breaking.
+
+WHY: best_line_break() re-normalizes whitespace, re-splits words and re-scores
+every two-line split from scratch on each call. The DP, the greedy fallback
+and repeated renders of the same word list with the same preset ask for the
+same spans again, so their layouts can be reused instead of recomputed.
+
+HOW: LineBreakCache is an LRU map from (i, j, config fingerprint) to the dict
+best_line_break() returned for span words[i:j]. It is bound to one word list:
+binding a different list clears it, because span indices only mean something
+for the list they were computed on. An OrderedDict keeps recency order and
+the oldest entry is evicted once maxsize is reached, so memory stays flat on
+long inputs.
+
+RULES:
+- Results are the exact dicts best_line_break() returns — callers must treat
+  them as read-only.
+- The config fingerprint is value-based (sorted JSON), so equal configs share
+  entries even when they are different dict objects.
+- hits/misses count lookups; they are never reset implicitly.
+- Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
+"""
+
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import Word
+
+DEFAULT_CACHE_SIZE = 8192
+
+
+def config_fingerprint(config: Dict) -> str:
+    """Return a value-based identity string for a config dict."""
+    return json.dumps(config, sort_keys=True)
+
+
+class LineBreakCache:
+    """LRU cache of best_line_break() results keyed on span indices and config.
+
+    Attributes:
+        maxsize: Maximum number of cached spans.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that had to compute a layout.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1, got {}".format(maxsize))
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # type: OrderedDict[Tuple[int, int, str], Dict[str, Any]]
+        self._words = None  # type: Optional[List[Word]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def bind(self, words: List[Word]) -> None:
+        """Attach the cache to a word list, clearing entries for any other list."""
+        if words is not self._words:
+            self._entries.clear()
+            self._words = words
+
+    def get(self, key: Tuple[int, int, str]) -> Optional[Dict[str, Any]]:
+        """Return the cached layout for key, or None, updating the counters."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Tuple[int, int, str], value: Dict[str, Any]) -> None:
+        """Store a layout, evicting the least recently used entry when full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """Counters and size, in the spirit of functools.lru_cache.cache_info()."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
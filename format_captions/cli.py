@@ -5,25 +5,33 @@ the exact same command-line interface so existing workflows and scripts
 continue to work unchanged. It also supports `python -m format_captions`.
 
 HOW: Parses sys.argv for input path, output path, and --format flag, then
-delegates to the library's format_srt() function. Input parsing (JSON with
-fallback for incomplete files) is handled by core.try_parse_json() and
-core.parse_input().
+delegates to the library's format_srt() function. Input is read by
+reader.read_words(), which streams the JSON into a WordArray and repairs
+truncated files in the same pass.
 
 RULES:
 - CLI interface is identical to the original script:
-    python -m format_captions input.json output.srt [--format social]
+    python -m format_captions input.json output.srt [--format social] [--strategy beam]
     python -m format_captions input.json  (outputs to stdout)
     cat input.json | python -m format_captions - output.srt
+- --batch switches to batch mode (see batch.py), parsed with argparse:
+    python -m format_captions --batch archive/ "more/*.json" --out-dir srt/ \
+        --format broadcast,social --jobs 4 [--force]
+  Exit code 1 if any file failed.
 - Exit codes: 0 = success, 1 = error.
 - Progress messages go to stderr; SRT content goes to stdout (if no output file).
 """
 
-import copy
+import argparse
 import sys
+from pathlib import Path
 from typing import List
 
-from .core import parse_input, try_parse_json, segment_words, generate_srt
+from .compiled import STRATEGIES, compiled_preset
+from .batch import collect_inputs, run_batch
+from .core import segment_words, generate_srt
 from .presets import PRESETS
+from .reader import read_words
 
 HELP_TEXT = """format_captions — Swedish SDH caption formatter
 
@@ -32,14 +40,61 @@ Usage:
     python -m format_captions input.json output.srt --format social
     python -m format_captions input.json  # outputs to stdout
     cat input.json | python -m format_captions - output.srt
+    python -m format_captions input.json output.srt --strategy beam  # fast draft
+    python -m format_captions --batch DIR_OR_GLOB... --out-dir DIR \
+        [--format broadcast,social] [--jobs N] [--force]
 
 Format presets:
     --format broadcast  (default) 16:9 TV, 2 lines, max 42 chars/line
     --format social     9:16 vertical/SoMe, 1 line, max 25 chars/line
     --format some       Alias for social
+
+Segmentation strategy:
+    --strategy exact    (default) globally optimal caption boundaries
+    --strategy beam     Approximate, faster search for drafts and previews
 """
 
 
+def batch_main(argv: "List[str]") -> int:
+    """Run batch mode; returns the exit code.
+
+    Args:
+        argv: Arguments after --batch.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m format_captions --batch",
+        description="Render every JSON transcript in directories or globs to SRT.",
+    )
+    parser.add_argument("inputs", nargs="+", help="Directories (their *.json files), globs or files")
+    parser.add_argument("--out-dir", type=Path, required=True,
+                        help="Directory for <stem>.<preset>.srt outputs and the manifest")
+    parser.add_argument("--format", dest="formats", action="append",
+                        help="Preset(s) to render, comma-separated or repeated (default: broadcast)")
+    parser.add_argument("--jobs", type=int, default=1, help="Files rendered in parallel (default: 1)")
+    parser.add_argument("--force", action="store_true", help="Re-render outputs that are up to date")
+    args = parser.parse_args(argv)
+
+    presets = [name.strip().lower() for spec in (args.formats or ["broadcast"])
+               for name in spec.split(",") if name.strip()]
+    for name in presets:
+        if name not in PRESETS:
+            print(
+                "Error: Unknown format '{}'. Available: {}".format(name, ", ".join(PRESETS.keys())),
+                file=sys.stderr,
+            )
+            return 1
+
+    try:
+        inputs = collect_inputs(args.inputs)
+        summary = run_batch(inputs, args.out_dir, presets, jobs=args.jobs, force=args.force)
+    except ValueError as e:
+        print("Error: {}".format(e), file=sys.stderr)
+        return 1
+
+    print(summary.format(), file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
 def main(argv: "List[str]" = None) -> None:
     """Run the caption formatter CLI.
 
@@ -59,8 +114,13 @@ def main(argv: "List[str]" = None) -> None:
         print("  some       Alias for social")
         sys.exit(0)
 
-    # Extract --format argument
+    if "--batch" in args:
+        args.remove("--batch")
+        sys.exit(batch_main(args))
+
+    # Extract --format and --strategy arguments
     format_name = "broadcast"
+    strategy = None
     filtered_args = []  # type: List[str]
     i = 0
     while i < len(args):
@@ -70,6 +130,12 @@ def main(argv: "List[str]" = None) -> None:
         elif args[i].startswith("--format="):
             format_name = args[i].split("=", 1)[1].lower()
             i += 1
+        elif args[i] == "--strategy" and i + 1 < len(args):
+            strategy = args[i + 1].lower()
+            i += 2
+        elif args[i].startswith("--strategy="):
+            strategy = args[i].split("=", 1)[1].lower()
+            i += 1
         else:
             filtered_args.append(args[i])
             i += 1
@@ -83,34 +149,35 @@ def main(argv: "List[str]" = None) -> None:
             file=sys.stderr,
         )
         sys.exit(1)
+    if strategy is not None and strategy not in STRATEGIES:
+        print(
+            "Error: Unknown strategy '{}'. Available: {}".format(strategy, ", ".join(STRATEGIES)),
+            file=sys.stderr,
+        )
+        sys.exit(1)
 
     # Get input/output paths
     input_path = filtered_args[0] if filtered_args else "-"
     output_path = filtered_args[1] if len(filtered_args) > 1 else None
 
-    # Read input
-    if input_path == "-":
-        raw = sys.stdin.read()
-    else:
-        with open(input_path, "r", encoding="utf-8") as f:
-            raw = f.read()
-
-    # Parse JSON
+    # Read and parse input
     try:
-        data = try_parse_json(raw)
+        if input_path == "-":
+            words = read_words(sys.stdin)
+        else:
+            with open(input_path, "r", encoding="utf-8") as f:
+                words = read_words(f)
     except ValueError as e:
         print("Error: {}".format(e), file=sys.stderr)
         sys.exit(1)
 
-    # Parse words
-    words = parse_input(data)
     if not words:
         print("Error: No words found in input", file=sys.stderr)
         sys.exit(1)
 
     # Segment and generate SRT
-    cfg = copy.deepcopy(PRESETS[format_name])
-    segments = segment_words(words, cfg)
+    cfg = compiled_preset(format_name)
+    segments = segment_words(words, cfg, strategy=strategy)
     if not segments:
         print("Error: Segmentation produced no output", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,208 @@
+"""Compiled caption configs: flat, read-only attribute access for the DP.
+
+WHY: The DP and the scorers read limits and weights for every candidate
+span, and each read was a dict lookup — often two, config["weights"] and
+then w["..."], plus .get() calls with defaults. format_srt() also deep-copied
+the preset dict on every call just to protect the module constant.
+
+HOW: CompiledConfig flattens a config dict into __slots__ attributes once:
+limits keep their config key names, weights get a w_ prefix, and optional
+keys have their defaults resolved up front. Compiled objects are read-only,
+so they can be shared freely; compile_config() caches them by the config's
+value fingerprint and compiled_preset() by preset name, so a preset is
+compiled once per process instead of copied once per call.
+
+RULES:
+- Every public core function still accepts a plain config dict; it is
+  compiled on entry. Passing a CompiledConfig skips that step.
+- Derived values are computed with the same arithmetic the scorers used
+  inline, so scores stay bit-identical.
+- The *_floor values and bound_ok feed the DP's span cost lower bound
+  (see _span_cost_lower_bound() in core.py); they never enter a score.
+- A config missing a required key raises KeyError at compile time; an
+  unknown "strategy" raises ValueError.
+- "strategy" and "beam_width" choose the search, not the scores (see
+  segment_words()); they are optional and default to the exact DP.
+- CompiledConfig pickles by its source dict (for process pools).
+- Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Union
+
+from .cache import config_fingerprint
+from .presets import PRESETS
+
+# Distinct custom configs kept compiled (tuning runs create many)
+COMPILED_CACHE_SIZE = 256
+
+# Segmentation search strategies (config key "strategy")
+STRATEGIES = ("exact", "beam")
+
+# Span starts scored per DP end position by the "beam" strategy
+DEFAULT_BEAM_WIDTH = 4
+
+_LIMIT_KEYS = (
+    "max_lines", "max_line_chars", "max_cue_chars", "target_line_chars",
+    "prefer_split_over", "min_line_chars", "target_cps", "max_cps",
+    "target_cue_chars", "min_cue_dur", "max_cue_dur", "min_display_dur",
+    "max_lookback_words",
+)
+
+_WEIGHT_KEYS = (
+    "len_deviation", "balance", "orphan", "weak_end", "short_end",
+    "punct_bonus", "comma_bonus", "single_line_long", "cps_above_target",
+    "cps_above_max", "cue_len_deviation", "cue_dur_below", "cue_dur_above",
+    "boundary_weak_end", "boundary_punct_bonus", "speaker_change_bonus",
+)
+
+
+class CompiledConfig:
+    """Read-only, attribute-based view of a caption config dict.
+
+    Attributes:
+        source: Private deep copy of the dict this was compiled from.
+        key: Value fingerprint of source (LineBreakCache key component).
+        preferred_max_chars: Soft line limit; max_line_chars if unset.
+        two_lines: True if two-line layouts are allowed (max_lines >= 2).
+        w_over_preferred_max: Weight per char over preferred_max_chars (0.0 if unset).
+        w_boundary_no_punct: Boundary penalty without punctuation (1.5 if unset).
+        w_boundary_comma_bonus: boundary_punct_bonus * 0.3, for comma boundaries.
+        two_line_floor: Smallest sum of the weak-end, short-end and
+            punctuation terms of a two-line layout.
+        bound_ok: True if the two-line terms dropped from the lower bound
+            (deviation, preferred max, balance, orphan) have weights >= 0.
+        strategy: Segmentation search, "exact" (default) or "beam".
+        beam_width: Span starts the beam strategy scores per end position
+            (DEFAULT_BEAM_WIDTH if unset).
+        Every limit key and every w_<weight> of the source dict is also
+        available as an attribute.
+    """
+
+    __slots__ = (
+        ("source", "key", "preferred_max_chars", "two_lines",
+         "w_over_preferred_max", "w_boundary_no_punct", "w_boundary_comma_bonus",
+         "two_line_floor", "bound_ok", "strategy", "beam_width")
+        + _LIMIT_KEYS
+        + tuple("w_" + name for name in _WEIGHT_KEYS)
+    )
+
+    def __init__(self, config: Dict) -> None:
+        source = copy.deepcopy(config)
+        set_attr = object.__setattr__
+        set_attr(self, "source", source)
+        set_attr(self, "key", config_fingerprint(source))
+
+        for name in _LIMIT_KEYS:
+            set_attr(self, name, source[name])
+        weights = source["weights"]
+        for name in _WEIGHT_KEYS:
+            set_attr(self, "w_" + name, weights[name])
+
+        set_attr(self, "preferred_max_chars",
+                 source.get("preferred_max_chars", source["max_line_chars"]))
+        set_attr(self, "two_lines", source["max_lines"] >= 2)
+        set_attr(self, "w_over_preferred_max", weights.get("over_preferred_max", 0.0))
+        set_attr(self, "w_boundary_no_punct", weights.get("boundary_no_punct", 1.5))
+        set_attr(self, "w_boundary_comma_bonus", weights["boundary_punct_bonus"] * 0.3)
+
+        set_attr(self, "two_line_floor", (
+            min(0.0, self.w_weak_end) + min(0.0, self.w_short_end)
+            + min(0.0, self.w_punct_bonus, self.w_comma_bonus)
+        ))
+        set_attr(self, "bound_ok", min(
+            self.w_len_deviation, self.w_over_preferred_max,
+            self.w_balance, self.w_orphan,
+        ) >= 0)
+
+        strategy = source.get("strategy", "exact")
+        if strategy not in STRATEGIES:
+            raise ValueError("Unknown strategy '{}'. Available: {}".format(
+                strategy, ", ".join(STRATEGIES)))
+        set_attr(self, "strategy", strategy)
+        set_attr(self, "beam_width", max(1, int(source.get("beam_width", DEFAULT_BEAM_WIDTH))))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CompiledConfig is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("CompiledConfig is read-only")
+
+    def __reduce__(self):
+        return (CompiledConfig, (self.source,))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompiledConfig):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return "CompiledConfig(max_lines={}, max_line_chars={}, max_cue_chars={})".format(
+            self.max_lines, self.max_line_chars, self.max_cue_chars)
+
+    def as_dict(self) -> Dict:
+        """Return a fresh, mutable copy of the source config dict."""
+        return copy.deepcopy(self.source)
+
+
+_lock = threading.Lock()
+_compiled = OrderedDict()  # type: OrderedDict[str, CompiledConfig]
+_compiled_presets = {}  # type: Dict[str, CompiledConfig]
+
+
+def compile_config(config: Union[Dict, CompiledConfig]) -> CompiledConfig:
+    """Return the CompiledConfig for a config dict, compiling it at most once.
+
+    A CompiledConfig is returned unchanged. Dicts are looked up by value, so
+    equal dicts share one compiled object; the least recently used entry is
+    dropped once COMPILED_CACHE_SIZE configs are cached.
+    """
+    if isinstance(config, CompiledConfig):
+        return config
+    key = config_fingerprint(config)
+    with _lock:
+        compiled = _compiled.get(key)
+        if compiled is not None:
+            _compiled.move_to_end(key)
+            return compiled
+    compiled = CompiledConfig(config)
+    with _lock:
+        _compiled[key] = compiled
+        if len(_compiled) > COMPILED_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return compiled
+
+
+def compiled_preset(name: str) -> CompiledConfig:
+    """Return the CompiledConfig for a named preset.
+
+    Raises:
+        ValueError: If the preset name is not recognized.
+    """
+    compiled = _compiled_presets.get(name)
+    if compiled is None:
+        if name not in PRESETS:
+            raise ValueError(
+                "Unknown preset '{}'. Available: {}".format(
+                    name, ", ".join(PRESETS.keys())
+                )
+            )
+        compiled = CompiledConfig(PRESETS[name])
+        _compiled_presets[name] = compiled
+    return compiled
+
+
+def resolve_config(preset: str, config: Union[Dict, CompiledConfig, None] = None) -> CompiledConfig:
+    """Compile config if given, otherwise the named preset.
+
+    Raises:
+        ValueError: If config is None and the preset name is not recognized.
+    """
+    if config is not None:
+        return compile_config(config)
+    return compiled_preset(preset)
@@ -14,21 +14,43 @@ HOW: The pipeline has three stages:
      timestamps and overlap prevention.
 
 RULES:
-- ALL functions accept an explicit `config` dict parameter — no global state.
-  This makes concurrent calls with different presets safe.
+- ALL functions accept an explicit `config` parameter — no global state.
+  This makes concurrent calls with different presets safe. Public functions
+  take a config dict or a CompiledConfig; the private DP helpers read the
+  flat attributes of a CompiledConfig (see compiled.py).
 - Text content is never modified — only structure (line breaks, caption boundaries).
 - All length checks use visible_len() to ignore HTML/XML tags.
 - Speaker markers (em-dashes) force caption boundaries and trigger "– " prefixes.
 - WEAK_END_WORDS is passed explicitly to functions that need it.
+- Instrumentation is opt-in: the DP helpers take an optional
+  SegmentationStats and skip all bookkeeping when it is None.
 """
 
+import heapq
 import json
 import math
 import re
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 
-from .models import Word
+try:
+    import numpy as _np
+except ImportError:  # optional: pip install soniox-converter[fast]
+    _np = None
+
+from .cache import LineBreakCache
+from .compiled import STRATEGIES, CompiledConfig, compile_config
+from .models import Word, Words
 from .presets import WEAK_END_WORDS
+from .spans import SpanIndex
+from .stats import SegmentationStats, timed
+from .wordflags import (
+    COMMA_END,
+    SENTENCE_END,
+    SHORT_END,
+    WEAK_END,
+    clean_word,
+    strip_punct,
+)
 
 # =============================================================================
 # Text Utilities
@@ -49,11 +71,6 @@ def visible_len(s: str) -> int:
     return len(strip_tags(s))
 
 
-def strip_punct(w: str) -> str:
-    """Remove leading/trailing punctuation from a word for clean comparison."""
-    return re.sub(r'^[""\'(]+|[.,!?…:;)\]""\']+$', "", w)
-
-
 def last_word_clean(line: str) -> str:
     """Return the last word of a line, lowercased, with punctuation stripped.
 
@@ -114,43 +131,46 @@ def parse_input(data: Any) -> List[Word]:
             if "words" in item and isinstance(item["words"], list):
                 is_first_in_segment = True
                 for w in item["words"]:
-                    if not isinstance(w, dict):
+                    word_obj = word_from_dict(w, is_first_in_segment)
+                    if word_obj is None:
                         continue
-                    text = w.get("word", w.get("text", w.get("t", "")))
-                    if not text:
-                        continue
-                    start = float(w.get("start", w.get("s", 0)))
-                    end = float(w.get("end", w.get("e", start)))
-                    is_speaker = text.strip() in ("–", "-", "—")
-
-                    word_obj = Word(
-                        text=text.strip(),
-                        start=start,
-                        end=end,
-                        is_speaker_marker=is_speaker,
-                        is_segment_start=is_first_in_segment and not is_speaker
-                    )
                     words.append(word_obj)
-
-                    if not is_speaker:
+                    if not word_obj.is_speaker_marker:
                         is_first_in_segment = False
 
             # Or a direct word object
-            elif any(k in item for k in ("word", "text", "t")):
-                text = item.get("word", item.get("text", item.get("t", "")))
-                if not text:
-                    continue
-                start = float(item.get("start", item.get("s", 0)))
-                end = float(item.get("end", item.get("e", start)))
-                is_speaker = text.strip() in ("–", "-", "—")
-                words.append(Word(
-                    text=text.strip(), start=start, end=end,
-                    is_speaker_marker=is_speaker
-                ))
+            else:
+                word_obj = word_from_dict(item)
+                if word_obj is not None:
+                    words.append(word_obj)
 
     return words
 
 
+def word_from_dict(obj: Any, first_in_segment: bool = False) -> Optional[Word]:
+    """Build a Word from one word object, or None if it has no text.
+
+    Field names are flexible: word/text/t for text, start/s for start, end/e
+    for end. first_in_segment marks the Word as a segment start unless it is
+    a speaker marker.
+    """
+    if not isinstance(obj, dict):
+        return None
+    text = obj.get("word", obj.get("text", obj.get("t", "")))
+    if not text:
+        return None
+    start = float(obj.get("start", obj.get("s", 0)))
+    end = float(obj.get("end", obj.get("e", start)))
+    is_speaker = text.strip() in ("–", "-", "—")
+    return Word(
+        text=text.strip(),
+        start=start,
+        end=end,
+        is_speaker_marker=is_speaker,
+        is_segment_start=first_in_segment and not is_speaker
+    )
+
+
 def try_parse_json(raw: str) -> Any:
     """Try to parse JSON, attempting to fix incomplete input.
 
@@ -214,7 +234,9 @@ def try_parse_json(raw: str) -> Any:
 # Line Breaking
 # =============================================================================
 
-def best_line_break(text: str, start: float, end: float, config: Dict) -> Dict[str, Any]:
+def best_line_break(
+    text: str, start: float, end: float, config: Union[Dict, CompiledConfig]
+) -> Dict[str, Any]:
     """Find optimal line break for a caption block.
 
     WHY: Captions must fit within character limits per line, but naive breaking
@@ -224,6 +246,7 @@ def best_line_break(text: str, start: float, end: float, config: Dict) -> Dict[s
     HOW: Generates single-line and (if max_lines >= 2) two-line candidates for
     every word boundary. Each candidate is scored on length deviation, balance,
     weak-word endings, punctuation alignment, and reading speed (CPS).
+    Two-line splits are scored together by two_line_split_scores().
 
     RULES:
     - Respects config["max_lines"] — social format never generates 2-line candidates.
@@ -234,144 +257,441 @@ def best_line_break(text: str, start: float, end: float, config: Dict) -> Dict[s
         text: Caption text (will be whitespace-normalized).
         start: Start timestamp in seconds (for CPS calculation).
         end: End timestamp in seconds.
-        config: Configuration dict with limits and weights.
+        config: Configuration dict (or CompiledConfig) with limits and weights.
 
     Returns:
         Dict with keys: ok, formatted, lines, score, break_at.
     """
+    cfg = compile_config(config)
     text = " ".join(text.split())  # Normalize whitespace
     words = text.split()
 
     if not words:
         return {"ok": False, "formatted": "", "lines": [], "score": math.inf}
 
-    candidates = []
+    single_score = math.inf
 
     # Single line candidate
-    if visible_len(text) <= config["max_line_chars"]:
-        score = _score_single_line(text, start, end, config)
-        candidates.append({
+    if visible_len(text) <= cfg.max_line_chars:
+        single_score = _score_single_line(text, start, end, cfg)
+
+    # Two-line candidates: only if max_lines >= 2
+    scores = two_line_split_scores(words, text, start, end, cfg) if cfg.two_lines else []
+    return _choose_layout(
+        text, single_score, scores,
+        lambda k: (" ".join(words[:k]), " ".join(words[k:])),
+    )
+
+
+def _choose_layout(
+    text: str, single_score: float, scores: List[float],
+    break_lines: Callable[[int], Tuple[str, str]],
+) -> Dict[str, Any]:
+    """Build best_line_break()'s result from the scored candidates.
+
+    Ties keep the earliest candidate (single line first, then lowest k), as
+    min() over the candidate list in order would. break_lines(k) returns
+    the two lines of a break before word k.
+    """
+    best_k = None  # type: Optional[int]
+    best_two = math.inf
+    for k, score in enumerate(scores, 1):
+        if score < best_two:
+            best_two = score
+            best_k = k
+
+    if best_k is not None and best_two < single_score:
+        line1, line2 = break_lines(best_k)
+        return {
+            "ok": True,
+            "lines": [line1, line2],
+            "formatted": "{}\n{}".format(line1, line2),
+            "score": best_two,
+            "break_at": best_k
+        }
+
+    if math.isfinite(single_score):
+        return {
+            "ok": True,
             "lines": [text],
             "formatted": text,
-            "score": score,
+            "score": single_score,
             "break_at": None
-        })
+        }
 
-    # Two-line candidates: only if max_lines >= 2
-    if config["max_lines"] >= 2:
-        for k in range(1, len(words)):
-            line1 = " ".join(words[:k])
-            line2 = " ".join(words[k:])
+    return {"ok": False, "formatted": text, "lines": [text], "score": math.inf}
 
-            len1, len2 = visible_len(line1), visible_len(line2)
-            if len1 > config["max_line_chars"] or len2 > config["max_line_chars"]:
-                continue
 
-            score = _score_two_lines(line1, line2, text, start, end, config)
-            candidates.append({
-                "lines": [line1, line2],
-                "formatted": "{}\n{}".format(line1, line2),
-                "score": score,
-                "break_at": k
-            })
+def _span_best_line_break(
+    spans: SpanIndex, i: int, j: int, text: str, start: float, end: float,
+    config: CompiledConfig,
+) -> Dict[str, Any]:
+    """best_line_break() for plain span (i, j), from the index's lengths and flags.
 
-    if not candidates:
-        return {"ok": False, "formatted": text, "lines": [text], "score": math.inf}
+    text must be spans.text(i, j); it is only sliced into lines, never
+    re-parsed.
+    """
+    length = spans.text_len(i, j)
+    single_score = math.inf
+    if length <= config.max_line_chars:
+        single_score = _single_line_score(length, start, end, config)
+
+    line1_lens = []  # type: List[int]
+    scores = []  # type: List[float]
+    if config.two_lines:
+        line1_lens, flags = spans.line_breaks(i, j)
+        scores = _score_splits(
+            line1_lens,
+            [length - a - 1 for a in line1_lens],
+            [bool(f & WEAK_END) for f in flags],
+            [bool(f & SHORT_END) for f in flags],
+            [bool(f & SENTENCE_END) for f in flags],
+            [bool(f & COMMA_END) for f in flags],
+            length, start, end, config,
+        )
+    return _choose_layout(
+        text, single_score, scores,
+        lambda k: (text[:line1_lens[k - 1]], text[line1_lens[k - 1] + 1:]),
+    )
 
-    best = min(candidates, key=lambda c: c["score"])
-    return {"ok": True, **best}
 
+def _span_line_break(
+    i: int, j: int, text: str, start: float, end: float,
+    config: CompiledConfig, cache: Optional[LineBreakCache],
+    stats: Optional[SegmentationStats] = None,
+    spans: Optional[SpanIndex] = None,
+) -> Dict[str, Any]:
+    """best_line_break() for span words[i:j], through the cache when given.
 
-def _score_single_line(text: str, start: float, end: float, config: Dict) -> float:
+    With spans, a plain span is laid out from the index's per-word lengths
+    and flags instead of re-parsing text.
+    """
+    if cache is None:
+        if stats is not None:
+            stats.line_break_calls += 1
+        if spans is not None and spans.plain(i, j):
+            return _span_best_line_break(spans, i, j, text, start, end, config)
+        return best_line_break(text, start, end, config)
+    key = (i, j, config.key)
+    lb = cache.get(key)
+    if lb is None:
+        if stats is not None:
+            stats.line_break_calls += 1
+        if spans is not None and spans.plain(i, j):
+            lb = _span_best_line_break(spans, i, j, text, start, end, config)
+        else:
+            lb = best_line_break(text, start, end, config)
+        cache.put(key, lb)
+    elif stats is not None:
+        stats.line_break_cache_hits += 1
+    return lb
+
+
+def _score_single_line(
+    text: str, start: float, end: float, config: Union[Dict, CompiledConfig]
+) -> float:
     """Score a single-line caption layout."""
-    w = config["weights"]
-    length = visible_len(text)
+    return _single_line_score(visible_len(text), start, end, compile_config(config))
+
+
+def _single_line_score(
+    length: int, start: float, end: float, cfg: CompiledConfig
+) -> float:
+    """_score_single_line() for a line of visible length length."""
     score = 0.0
 
     # Length deviation from target
-    score += w["len_deviation"] * abs(length - config["target_line_chars"])
+    score += cfg.w_len_deviation * abs(length - cfg.target_line_chars)
 
     # Penalize exceeding preferred max (soft limit for social)
-    preferred_max = config.get("preferred_max_chars", config["max_line_chars"])
+    preferred_max = cfg.preferred_max_chars
     if length > preferred_max:
-        score += w.get("over_preferred_max", 0.0) * (length - preferred_max)
+        score += cfg.w_over_preferred_max * (length - preferred_max)
 
     # Penalty for long single lines
-    if length > config["prefer_split_over"]:
-        score += w["single_line_long"] * (length - config["prefer_split_over"])
+    if length > cfg.prefer_split_over:
+        score += cfg.w_single_line_long * (length - cfg.prefer_split_over)
 
     # CPS penalty
     dur = max(0.001, end - start)
     cps = length / dur
-    if cps > config["target_cps"]:
-        score += w["cps_above_target"] * (cps - config["target_cps"])
-    if cps > config["max_cps"]:
-        score += w["cps_above_max"] * (cps - config["max_cps"])
+    if cps > cfg.target_cps:
+        score += cfg.w_cps_above_target * (cps - cfg.target_cps)
+    if cps > cfg.max_cps:
+        score += cfg.w_cps_above_max * (cps - cfg.max_cps)
 
     return score
 
 
 def _score_two_lines(
     line1: str, line2: str, full_text: str,
-    start: float, end: float, config: Dict
+    start: float, end: float, config: Union[Dict, CompiledConfig]
 ) -> float:
     """Score a two-line caption layout."""
-    w = config["weights"]
+    cfg = compile_config(config)
     len1, len2 = visible_len(line1), visible_len(line2)
     score = 0.0
 
     # Length deviation
-    score += w["len_deviation"] * (
-        abs(len1 - config["target_line_chars"]) +
-        abs(len2 - config["target_line_chars"])
+    score += cfg.w_len_deviation * (
+        abs(len1 - cfg.target_line_chars) +
+        abs(len2 - cfg.target_line_chars)
     )
 
     # Penalize exceeding preferred max on either line (soft limit)
-    preferred_max = config.get("preferred_max_chars", config["max_line_chars"])
+    preferred_max = cfg.preferred_max_chars
     if len1 > preferred_max:
-        score += w.get("over_preferred_max", 0.0) * (len1 - preferred_max)
+        score += cfg.w_over_preferred_max * (len1 - preferred_max)
     if len2 > preferred_max:
-        score += w.get("over_preferred_max", 0.0) * (len2 - preferred_max)
+        score += cfg.w_over_preferred_max * (len2 - preferred_max)
 
     # Balance
-    score += w["balance"] * abs(len1 - len2)
+    score += cfg.w_balance * abs(len1 - len2)
 
     # Orphan penalty
     min_len = min(len1, len2)
-    if min_len < config["min_line_chars"]:
-        score += w["orphan"] * (config["min_line_chars"] - min_len)
+    if min_len < cfg.min_line_chars:
+        score += cfg.w_orphan * (cfg.min_line_chars - min_len)
 
     # Weak word at end of line 1
     end_word = last_word_clean(line1)
     if end_word in WEAK_END_WORDS:
-        score += w["weak_end"]
+        score += cfg.w_weak_end
 
     # Very short word at end
     if end_word and len(end_word) <= 2:
-        score += w["short_end"]
+        score += cfg.w_short_end
 
     # Punctuation bonuses
     if ends_sentence(line1):
-        score += w["punct_bonus"]
+        score += cfg.w_punct_bonus
     elif ends_comma(line1):
-        score += w["comma_bonus"]
+        score += cfg.w_comma_bonus
 
     # CPS penalty
     dur = max(0.001, end - start)
     cps = len(full_text.replace("\n", "")) / dur
-    if cps > config["target_cps"]:
-        score += w["cps_above_target"] * (cps - config["target_cps"])
-    if cps > config["max_cps"]:
-        score += w["cps_above_max"] * (cps - config["max_cps"])
+    if cps > cfg.target_cps:
+        score += cfg.w_cps_above_target * (cps - cfg.target_cps)
+    if cps > cfg.max_cps:
+        score += cfg.w_cps_above_max * (cps - cfg.max_cps)
 
     return score
 
 
+# =============================================================================
+# Vectorized Two-Line Scoring
+# =============================================================================
+
+# Below this many break positions, array setup costs more than the loop saves.
+# Typical caption spans (under ~20 words) therefore use the plain loop.
+NUMPY_MIN_SPLITS = 32
+
+
+def two_line_split_scores(
+    words: List[str], full_text: str,
+    start: float, end: float, config: Union[Dict, CompiledConfig],
+    use_numpy: Optional[bool] = None
+) -> List[float]:
+    """Score every two-line split of a caption in one pass.
+
+    WHY: best_line_break() used to join, strip and regex-match both lines for
+    every break index k. The terms of _score_two_lines() only depend on the
+    line lengths and on the word before the break, so they can be computed
+    for all k at once from per-word measurements.
+
+    HOW: Measures each word once (length, cleaned last-word form, sentence
+    and comma endings), derives both line lengths for every k from a running
+    sum, then adds the score terms in exactly the order _score_two_lines()
+    does. With NumPy the terms are added as arrays; otherwise the same
+    arithmetic runs in a plain loop. Text containing tags falls back to
+    _score_two_lines() per split, since a tag may span a word boundary.
+
+    RULES:
+    - scores[k - 1] is the score for a break before words[k], k = 1..n-1.
+    - A split with a line longer than max_line_chars scores math.inf.
+    - Scores are bit-identical to _score_two_lines() — same terms, same
+      addition order, and skipped terms add an exact 0.0.
+
+    Args:
+        words: Whitespace-normalized words of the caption.
+        full_text: The words joined by single spaces.
+        start: Start timestamp in seconds (for CPS calculation).
+        end: End timestamp in seconds.
+        config: Configuration dict (or CompiledConfig) with limits and weights.
+        use_numpy: Force (True) or avoid (False) the NumPy backend;
+            None uses NumPy when it is installed and the caption has at
+            least NUMPY_MIN_SPLITS break positions.
+
+    Returns:
+        List of len(words) - 1 scores.
+    """
+    n = len(words)
+    if n < 2:
+        return []
+
+    cfg = compile_config(config)
+    max_chars = cfg.max_line_chars
+
+    if "<" in full_text:
+        scores = []  # type: List[float]
+        for k in range(1, n):
+            line1 = " ".join(words[:k])
+            line2 = " ".join(words[k:])
+            if visible_len(line1) > max_chars or visible_len(line2) > max_chars:
+                scores.append(math.inf)
+            else:
+                scores.append(_score_two_lines(line1, line2, full_text, start, end, cfg))
+        return scores
+
+    # Per-word measurements, indexed by break position k (the word before it)
+    len1 = []  # type: List[int]
+    len2 = []  # type: List[int]
+    weak = []  # type: List[bool]
+    short = []  # type: List[bool]
+    sentence = []  # type: List[bool]
+    comma = []  # type: List[bool]
+
+    total = len(full_text)
+    running = -1
+    end_word = ""
+    for k in range(1, n):
+        prev = words[k - 1]
+        running += len(prev) + 1
+        len1.append(running)
+        len2.append(total - running - 1)
+        cleaned = clean_word(prev)
+        if cleaned:
+            end_word = cleaned
+        weak.append(end_word in WEAK_END_WORDS)
+        short.append(bool(end_word) and len(end_word) <= 2)
+        sentence.append(prev[-1] in ".!?…")
+        comma.append(prev[-1] in ",;:")
+
+    return _score_splits(len1, len2, weak, short, sentence, comma, total,
+                         start, end, cfg, use_numpy)
+
+
+def _score_splits(
+    len1: List[int], len2: List[int],
+    weak: List[bool], short: List[bool],
+    sentence: List[bool], comma: List[bool],
+    total: int, start: float, end: float, cfg: CompiledConfig,
+    use_numpy: Optional[bool] = None
+) -> List[float]:
+    """Score two-line splits from their measurements (see two_line_split_scores()).
+
+    Entry k holds the line lengths and line-1 end flags of one split; total
+    is the caption's length, for the CPS terms.
+    """
+    target = cfg.target_line_chars
+    preferred_max = cfg.preferred_max_chars
+    over_weight = cfg.w_over_preferred_max
+    min_chars = cfg.min_line_chars
+    max_chars = cfg.max_line_chars
+
+    dur = max(0.001, end - start)
+    cps = total / dur
+    cps_terms = []  # type: List[float]
+    if cps > cfg.target_cps:
+        cps_terms.append(cfg.w_cps_above_target * (cps - cfg.target_cps))
+    if cps > cfg.max_cps:
+        cps_terms.append(cfg.w_cps_above_max * (cps - cfg.max_cps))
+
+    if use_numpy is None:
+        use_numpy = _np is not None and len(len1) >= NUMPY_MIN_SPLITS
+    if use_numpy:
+        return _split_scores_numpy(
+            len1, len2, weak, short, sentence, comma, cps_terms, cfg
+        )
+
+    w_len_deviation = cfg.w_len_deviation
+    w_balance = cfg.w_balance
+    w_orphan = cfg.w_orphan
+    w_weak_end = cfg.w_weak_end
+    w_short_end = cfg.w_short_end
+    w_punct_bonus = cfg.w_punct_bonus
+    w_comma_bonus = cfg.w_comma_bonus
+
+    scores = []
+    for k in range(len(len1)):
+        a, b = len1[k], len2[k]
+        if a > max_chars or b > max_chars:
+            scores.append(math.inf)
+            continue
+        score = 0.0
+        score += w_len_deviation * (abs(a - target) + abs(b - target))
+        if a > preferred_max:
+            score += over_weight * (a - preferred_max)
+        if b > preferred_max:
+            score += over_weight * (b - preferred_max)
+        score += w_balance * abs(a - b)
+        min_len = min(a, b)
+        if min_len < min_chars:
+            score += w_orphan * (min_chars - min_len)
+        if weak[k]:
+            score += w_weak_end
+        if short[k]:
+            score += w_short_end
+        if sentence[k]:
+            score += w_punct_bonus
+        elif comma[k]:
+            score += w_comma_bonus
+        for term in cps_terms:
+            score += term
+        scores.append(score)
+    return scores
+
+
+def _split_scores_numpy(
+    len1: List[int], len2: List[int],
+    weak: List[bool], short: List[bool],
+    sentence: List[bool], comma: List[bool],
+    cps_terms: List[float], cfg: CompiledConfig
+) -> List[float]:
+    """NumPy backend of two_line_split_scores(): every term as one array op."""
+    np = _np
+    a = np.array(len1, dtype=np.int64)
+    b = np.array(len2, dtype=np.int64)
+    target = cfg.target_line_chars
+    preferred_max = cfg.preferred_max_chars
+    over_weight = cfg.w_over_preferred_max
+    min_chars = cfg.min_line_chars
+    max_chars = cfg.max_line_chars
+
+    score = np.zeros(len(len1), dtype=np.float64)
+    score += cfg.w_len_deviation * (np.abs(a - target) + np.abs(b - target))
+    score += np.where(a > preferred_max, over_weight * (a - preferred_max), 0.0)
+    score += np.where(b > preferred_max, over_weight * (b - preferred_max), 0.0)
+    score += cfg.w_balance * np.abs(a - b)
+    min_len = np.minimum(a, b)
+    score += np.where(min_len < min_chars, cfg.w_orphan * (min_chars - min_len), 0.0)
+    score += np.where(np.array(weak, dtype=bool), cfg.w_weak_end, 0.0)
+    score += np.where(np.array(short, dtype=bool), cfg.w_short_end, 0.0)
+    score += np.where(
+        np.array(sentence, dtype=bool), cfg.w_punct_bonus,
+        np.where(np.array(comma, dtype=bool), cfg.w_comma_bonus, 0.0),
+    )
+    for term in cps_terms:
+        score += term
+
+    score[(a > max_chars) | (b > max_chars)] = math.inf
+    return score.tolist()
+
+
 # =============================================================================
 # Segmentation (Dynamic Programming)
 # =============================================================================
 
-def segment_words(words: List[Word], config: Dict) -> List[Dict[str, Any]]:
+def segment_words(
+    words: Words,
+    config: Union[Dict, CompiledConfig],
+    cache: Optional[LineBreakCache] = None,
+    spans: Optional[SpanIndex] = None,
+    stats: Optional[SegmentationStats] = None,
+    prune: bool = True,
+    strategy: Optional[str] = None,
+) -> List[Dict[str, Any]]:
     """Segment words into caption blocks using dynamic programming.
 
     WHY: Greedy left-to-right segmentation produces locally acceptable but
@@ -381,148 +701,453 @@ def segment_words(words: List[Word], config: Dict) -> List[Dict[str, Any]]:
     HOW: Standard shortest-path DP over word positions. dp[j] = minimum cost
     to caption words[0:j]. For each position j, try all valid starting positions
     i and compute the cost of the segment words[i:j]. Speaker markers force
-    boundaries; sentence boundaries get a bonus.
+    boundaries; sentence boundaries get a bonus. A SpanIndex answers span
+    length, speaker and timing questions in O(1), and its character budget
+    bounds the lookback so spans that cannot fit max_cue_chars are never
+    visited.
 
     RULES:
-    - Speaker markers (is_speaker_marker) create forced break points.
+    - Speaker markers (is_speaker_marker) create forced break points, and
+      the words between two of them are solved as an independent DP from
+      zero cost (see forced_partitions()). Serial and parallel output are
+      therefore identical; spans whose costs tie within float rounding
+      may resolve differently from one DP over the whole word list.
     - Segment boundaries (is_segment_start) get a -2.0 cost bonus.
+    - Lookback is limited by both max_cue_chars and max_lookback_words.
     - Falls back to greedy_segment() if no valid DP path exists.
     - config is passed through to best_line_break() and scoring functions.
+    - With a cache, line-break layouts are shared with the greedy fallback
+      and with later calls on the same word list and config.
+    - Pruning skips only spans that provably cannot improve dp[j], so the
+      segments are identical with and without it.
+    - The "beam" strategy is approximate: per end position it scores only
+      the beam_width starts with the lowest dp[i] plus span cost lower
+      bound. Meant for drafts and previews; "exact" is the default.
 
     Args:
-        words: Flat list of Word objects.
-        config: Configuration dict with limits and weights.
+        words: Flat list of Word objects, or a WordArray.
+        config: Configuration dict (or CompiledConfig) with limits and weights.
+        cache: Optional LineBreakCache; None runs the uncached path.
+        spans: Optional prebuilt SpanIndex over words, for callers that
+            segment the same list with several configs. Built here if None.
+        stats: Optional SegmentationStats to add DP counters and the
+            "index", "segment" and "greedy" stage times to.
+        prune: Skip spans whose cost lower bound cannot beat the best
+            path so far (branch and bound). Ignored for inputs or configs
+            the bound is not admissible for (see _pruning_exact()).
+        strategy: "exact" or "beam"; None uses the config's "strategy"
+            key (default "exact").
 
     Returns:
         List of segment dicts with text, start, end, formatted, lines, has_speaker.
+
+    Raises:
+        ValueError: If strategy is not recognized.
     """
     if not words:
         return []
 
-    # Find forced break points (speaker changes)
-    forced_breaks = set()
-    for i, w in enumerate(words):
-        if w.is_speaker_marker and i > 0:
-            forced_breaks.add(i)
-
-    # Find preferred break points (segment/sentence boundaries)
-    preferred_breaks = set()
-    for i, w in enumerate(words):
-        if w.is_segment_start and i > 0:
-            preferred_breaks.add(i)
-
-    N = len(words)
-    dp = [math.inf] * (N + 1)
-    back = [-1] * (N + 1)
-    info = [None] * (N + 1)  # type: List[Optional[Dict[str, Any]]]
-    dp[0] = 0.0
+    cfg = compile_config(config)
+    beam_width = search_beam_width(cfg, strategy)
+    if cache is not None:
+        cache.bind(words)
+
+    with timed(stats, "index"):
+        if spans is None:
+            spans = SpanIndex(words)
+        lookback = spans.char_lookback(cfg.max_cue_chars)
+        prune = prune and _pruning_exact(spans, cfg)
+
+    segments = []  # type: List[Dict[str, Any]]
+    with timed(stats, "segment"):
+        for lo, hi in forced_partitions(spans):
+            part = _segment_range(words, spans, lookback, lo, hi, cfg, cache, stats, prune, beam_width)
+            if part is None:
+                break
+            segments.extend(part)
+        else:
+            return segments
 
-    for j in range(1, N + 1):
-        # Check if there's a forced break we must respect
-        must_break_after = None  # type: Optional[int]
-        for fb in forced_breaks:
-            if fb < j and (must_break_after is None or fb > must_break_after):
-                must_break_after = fb
-
-        min_i = max(0, j - config["max_lookback_words"])
-        if must_break_after is not None:
-            min_i = max(min_i, must_break_after)
-
-        for i in range(j - 1, min_i - 1, -1):
-            # Can't cross a forced break
-            crosses_break = any(fb > i and fb < j for fb in forced_breaks)
-            if crosses_break:
-                continue
+    # Fallback: greedy segmentation
+    return _greedy_segment(words, cfg, cache, stats)
 
-            seg_words = words[i:j]
 
-            # Build segment text, handling speaker markers
-            text_parts = []
-            has_speaker_marker = False
-            for sw in seg_words:
-                if sw.is_speaker_marker:
-                    has_speaker_marker = True
-                else:
-                    text_parts.append(sw.text)
+def search_beam_width(config: CompiledConfig, strategy: Optional[str] = None) -> int:
+    """Beam width of a segmentation strategy; 0 for the exact DP.
 
-            if not text_parts:
-                continue
+    Raises:
+        ValueError: If strategy is not recognized.
+    """
+    if strategy is None:
+        strategy = config.strategy
+    if strategy not in STRATEGIES:
+        raise ValueError("Unknown strategy '{}'. Available: {}".format(
+            strategy, ", ".join(STRATEGIES)))
+    return config.beam_width if strategy == "beam" else 0
 
-            seg_text = " ".join(text_parts)
-            if has_speaker_marker:
-                seg_text = "– " + seg_text
 
-            if len(seg_text) > config["max_cue_chars"] + 10:
-                break
-            if len(seg_text) > config["max_cue_chars"]:
-                continue
+def forced_partitions(spans: SpanIndex) -> List[Tuple[int, int]]:
+    """Split the word range at forced breaks into independent DP ranges.
+
+    No caption may cross a speaker-marker forced break, so the segmentation
+    of each (lo, hi) range is independent of every other range.
+    """
+    n = len(spans)
+    bounds = [0]
+    for j in range(2, n + 1):
+        if spans.prev_break[j] != spans.prev_break[j - 1]:
+            bounds.append(spans.prev_break[j])
+    bounds.append(n)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _segment_range(
+    words: Words,
+    spans: SpanIndex,
+    lookback: List[int],
+    lo: int,
+    hi: int,
+    config: CompiledConfig,
+    cache: Optional[LineBreakCache] = None,
+    stats: Optional[SegmentationStats] = None,
+    prune: bool = False,
+    beam_width: int = 0,
+) -> Optional[List[Dict[str, Any]]]:
+    """Run the segmentation DP over words[lo:hi], a forced-break partition.
+
+    See _solve_range(); caption strings are built for the winning path
+    alone, after the DP.
 
-            seg_start = seg_words[0].start
-            seg_end = seg_words[-1].end
+    Returns:
+        Segments for words[lo:hi], or None if no valid DP path exists.
+    """
+    path = _solve_range(spans, lookback, lo, hi, config, cache, stats, prune, beam_width)
+    if path is None:
+        return None
+    return [_span_segment(spans, i, j, break_at) for i, j, break_at in path]
+
+
+def _solve_range(
+    spans: SpanIndex,
+    lookback: List[int],
+    lo: int,
+    hi: int,
+    config: CompiledConfig,
+    cache: Optional[LineBreakCache] = None,
+    stats: Optional[SegmentationStats] = None,
+    prune: bool = False,
+    beam_width: int = 0,
+) -> Optional[List[Tuple[int, int, Optional[int]]]]:
+    """Run the segmentation DP over words[lo:hi] and return its best path.
+
+    The DP restarts at zero cost at lo, so a partition's result does not
+    depend on which partitions were solved before it. Words after hi (if
+    any) only inform the boundary bonuses at j == hi. With prune, spans
+    whose cost lower bound cannot beat the best dp[j] so far are skipped
+    before line breaking; the caller must check that pruning is exact for
+    spans and config (see _pruning_exact()). Only a back-pointer and the
+    chosen line break are kept per position. With beam_width > 0, only
+    the beam_width starts that look cheapest by dp[i] plus the span cost
+    lower bound are scored per end position (approximate); if that finds
+    no path, the range is solved exactly.
 
-            lb = best_line_break(seg_text, seg_start, seg_end, config)
-            if not lb["ok"]:
-                continue
+    Returns:
+        (i, j, break_at) of each caption on the best path, in order, or
+        None if no valid DP path exists.
+    """
+    if stats is not None:
+        stats.partitions += 1
+    size = hi - lo
+    dp = [math.inf] * (size + 1)
+    back = [-1] * (size + 1)
+    # Winning span's line break (break_at of its layout), per end position
+    breaks = [None] * (size + 1)  # type: List[Optional[int]]
+    dp[0] = 0.0
 
-            cost = _compute_segment_cost(
-                seg_text, seg_start, seg_end, lb, has_speaker_marker, config
-            )
-
-            # Bonus if this segment ends at a preferred break point
-            if j < N and words[j].is_segment_start:
-                cost -= 2.0
-
-            # Penalty if we're breaking mid-sentence and not at punctuation
-            if (j < N and not words[j].is_segment_start
-                    and not ends_sentence(seg_text)
-                    and not ends_comma(seg_text)):
-                cost += 2.0  # was 1.0 — stronger penalty for mid-sentence breaks
-
-            # Nudge against tiny mid-stream cues
-            if (seg_end - seg_start) < config["min_cue_dur"] and j != N:
-                cost += 2.0
-
-            # Additional penalty for very short text content (stragglers)
-            if len(seg_text) < 35 and j != N:
-                cost += 1.5
-
-            total = dp[i] + cost
-            if total < dp[j]:
-                dp[j] = total
-                back[j] = i
-                info[j] = {
-                    "text": seg_text,
-                    "start": seg_start,
-                    "end": seg_end,
-                    "formatted": lb["formatted"],
-                    "lines": lb["lines"],
-                    "has_speaker": has_speaker_marker
-                }
+    for j in range(lo + 1, hi + 1):
+        # Spans starting before lookback[j] exceed max_cue_chars; the word
+        # cap is kept because the presets were tuned against it. Starting at
+        # or after the last forced break means no span crosses one.
+        min_i = max(
+            lookback[j],
+            j - config.max_lookback_words,
+            spans.prev_break[j],
+            lo,
+        )
+
+        starts = range(j - 1, min_i - 1, -1)  # type: Sequence[int]
+        if beam_width and j - min_i > beam_width:
+            starts = _beam_starts(dp, spans, lo, min_i, j, config, beam_width)
+            if stats is not None:
+                stats.spans_beam_skipped += j - min_i - len(starts)
+
+        for i in starts:
+            if prune and dp[i - lo] + _span_cost_lower_bound(spans, i, j, config) >= dp[j - lo]:
+                if stats is not None:
+                    stats.spans_pruned += 1
+                continue
+            scored = _span_cost(spans, i, j, config, cache, stats)
+            if scored is None:
+                continue
+            cost, _, lb = scored
+
+            total = dp[i - lo] + cost
+            if total < dp[j - lo]:
+                dp[j - lo] = total
+                back[j - lo] = i - lo
+                breaks[j - lo] = lb["break_at"]
+
+    if not math.isfinite(dp[size]):
+        if beam_width:
+            # The beam lost every valid path: solve this range exactly
+            return _solve_range(spans, lookback, lo, hi, config, cache, stats, prune)
+        return None
+    if stats is not None:
+        stats.path_cost += dp[size]
 
     # Backtrack
-    if not math.isfinite(dp[N]):
-        # Fallback: greedy segmentation
-        return _greedy_segment(words, config)
-
-    segments = []
-    j = N
+    path = []  # type: List[Tuple[int, int, Optional[int]]]
+    j = size
     while j > 0:
         i = back[j]
-        if i < 0 or info[j] is None:
+        if i < 0:
             break
-        segments.append(info[j])
+        path.append((i + lo, j + lo, breaks[j]))
         j = i
 
-    segments.reverse()
-    return segments
+    path.reverse()
+    return path
+
+
+def _span_cost(
+    spans: SpanIndex,
+    i: int,
+    j: int,
+    config: CompiledConfig,
+    cache: Optional[LineBreakCache] = None,
+    stats: Optional[SegmentationStats] = None,
+) -> Optional[Tuple[float, str, Dict[str, Any]]]:
+    """DP cost of captioning span words[i:j] as one block.
+
+    The boundary bonuses depend on the word after the span, words[j]; a span
+    that ends the indexed words (j == len(spans)) ends the transcript and is
+    exempt from them.
+
+    Returns:
+        (cost, caption text, line-break result), or None if the span holds
+        no text or has no valid layout.
+    """
+    if stats is not None:
+        stats.spans_evaluated += 1
+    if not spans.text_count(i, j):
+        if stats is not None:
+            stats.empty_spans += 1
+        return None
+
+    seg_text = spans.text(i, j)
+    has_speaker_marker = spans.has_speaker(i, j)
+    seg_start = spans.starts[i]
+    seg_end = spans.ends[j - 1]
+
+    lb = _span_line_break(i, j, seg_text, seg_start, seg_end, config, cache, stats, spans)
+    if not lb["ok"]:
+        if stats is not None:
+            stats.length_rejections += 1
+        return None
+
+    if spans.plain(i, j):
+        end_flags = spans.end_flags(i, j)
+    else:
+        end_flags = _text_end_flags(seg_text)
+    cost = _compute_segment_cost(
+        seg_text, seg_start, seg_end, lb, has_speaker_marker, config, end_flags
+    )
+
+    if j < len(spans):
+        next_is_segment_start = spans.segment_starts[j]
+
+        # Bonus if this segment ends at a preferred break point
+        if next_is_segment_start:
+            cost -= 2.0
+
+        # Penalty if we're breaking mid-sentence and not at punctuation
+        if (not next_is_segment_start
+                and not end_flags & (SENTENCE_END | COMMA_END)):
+            cost += 2.0  # was 1.0 — stronger penalty for mid-sentence breaks
+
+        # Nudge against tiny mid-stream cues
+        if (seg_end - seg_start) < config.min_cue_dur:
+            cost += 2.0
+
+        # Additional penalty for very short text content (stragglers)
+        if spans.text_len(i, j) < 35:
+            cost += 1.5
+
+    return cost, seg_text, lb
+
+
+def _beam_starts(
+    dp: List[float], spans: SpanIndex, lo: int, min_i: int, j: int,
+    config: CompiledConfig, beam_width: int,
+) -> List[int]:
+    """The beam_width reachable starts i in [min_i, j) with the lowest
+    dp[i - lo] + _span_cost_lower_bound(), in descending order as the
+    exact DP visits them.
+
+    Spans without text or without a layout under the bound are left out,
+    so they do not take the place of a start that can be scored.
+    """
+    candidates = []  # type: List[Tuple[float, int]]
+    for i in range(min_i, j):
+        if dp[i - lo] < math.inf and spans.text_count(i, j):
+            estimate = dp[i - lo] + _span_cost_lower_bound(spans, i, j, config)
+            if estimate < math.inf:
+                candidates.append((estimate, -i))
+    return sorted((-neg_i for _, neg_i in heapq.nsmallest(beam_width, candidates)), reverse=True)
+
+
+def _span_segment(
+    spans: SpanIndex, i: int, j: int, break_at: Optional[int]
+) -> Dict[str, Any]:
+    """Segment dict of span words[i:j] with the layout best_line_break() chose.
+
+    break_at is the layout's "break_at": the index of the first word of
+    line 2 in the whitespace-normalized caption text, or None for a single
+    line. The strings are exactly those of the best_line_break() result.
+    """
+    text = spans.text(i, j)
+    normalized = " ".join(text.split())
+    if break_at is None:
+        lines = [normalized]
+    else:
+        words = normalized.split()
+        lines = [" ".join(words[:break_at]), " ".join(words[break_at:])]
+    return {
+        "text": text,
+        "start": spans.starts[i],
+        "end": spans.ends[j - 1],
+        "formatted": "\n".join(lines),
+        "lines": lines,
+        "has_speaker": spans.has_speaker(i, j)
+    }
+
+
+# Subtracted from every span cost lower bound, so that float rounding in the
+# scorers can never push a span's exact cost below its bound
+BOUND_SLACK = 1e-6
+
+
+def _pruning_exact(spans: SpanIndex, config: CompiledConfig) -> bool:
+    """True if _span_cost_lower_bound() is admissible for spans and config."""
+    return config.bound_ok and spans.is_plain()
+
+
+def _span_cost_lower_bound(
+    spans: SpanIndex, i: int, j: int, config: CompiledConfig
+) -> float:
+    """Lower bound on the cost _span_cost() returns for span words[i:j].
+
+    Uses only the span's length, timing and flags — no text and no line
+    breaking. Terms that _span_cost() computes from these and the text's
+    last character (cue length, duration, CPS, single-line length terms,
+    punctuation, speaker and context bonuses) are taken exactly; the
+    end-word flags decide the weak-end term; the two-line layout terms are
+    replaced by their smallest possible values.
+
+    Admissible (never above the exact cost, math.inf for spans with no valid
+    layout) when _pruning_exact() holds: the span text is then normalized
+    and tag-free, so every scorer measures text_len(), and a two-line split
+    into lines a + b = length - 1 has deviation |a - t| + |b - t| of at
+    least |length - 1 - 2t|.
+    """
+    length = spans.text_len(i, j)
+    start = spans.starts[i]
+    end = spans.ends[j - 1]
+
+    layout = math.inf
+    if length <= config.max_line_chars:
+        layout = config.w_len_deviation * abs(length - config.target_line_chars)
+        if length > config.preferred_max_chars:
+            layout += config.w_over_preferred_max * (length - config.preferred_max_chars)
+        if length > config.prefer_split_over:
+            layout += config.w_single_line_long * (length - config.prefer_split_over)
+    if config.two_lines and length - 1 <= 2 * config.max_line_chars:
+        two = (config.w_len_deviation * abs(length - 1 - 2 * config.target_line_chars)
+               + config.two_line_floor)
+        layout = min(layout, two)
+    if layout == math.inf:
+        return math.inf
+
+    bound = layout
+    dur = max(0.001, end - start)
+    cps = length / dur
+    if cps > config.target_cps:
+        bound += config.w_cps_above_target * (cps - config.target_cps)
+    if cps > config.max_cps:
+        bound += config.w_cps_above_max * (cps - config.max_cps)
+
+    bound += config.w_cue_len_deviation * abs(length - config.target_cue_chars)
+    if dur < config.min_cue_dur:
+        bound += config.w_cue_dur_below * (config.min_cue_dur - dur)
+    if dur > config.max_cue_dur:
+        bound += config.w_cue_dur_above * (dur - config.max_cue_dur)
+    last = spans.last_char(i, j)
+    mid_sentence = False
+    if last in ".!?…":
+        bound += config.w_boundary_punct_bonus
+    elif last in ",;:":
+        bound += config.w_boundary_comma_bonus
+    elif spans.end_flags(i, j) & WEAK_END:
+        bound += config.w_boundary_weak_end
+        mid_sentence = True
+    else:
+        bound += config.w_boundary_no_punct
+        mid_sentence = True
+    if spans.has_speaker(i, j):
+        bound += config.w_speaker_change_bonus
+
+    if j < len(spans):
+        if spans.segment_starts[j]:
+            bound -= 2.0
+        elif mid_sentence:
+            bound += 2.0
+        if (end - start) < config.min_cue_dur:
+            bound += 2.0
+        if length < 35:
+            bound += 1.5
+
+    return bound - BOUND_SLACK
+
+
+def _text_end_flags(text: str) -> int:
+    """wordflags bits of a caption text's end, from the string helpers.
+
+    The reference for SpanIndex.end_flags(), and the path for spans that
+    are not plain (tags, irregular whitespace).
+    """
+    flags = 0
+    end_word = last_word_clean(text)
+    if end_word in WEAK_END_WORDS:
+        flags |= WEAK_END
+    if ends_sentence(text):
+        flags |= SENTENCE_END
+    elif ends_comma(text):
+        flags |= COMMA_END
+    return flags
 
 
 def _compute_segment_cost(
     text: str, start: float, end: float,
-    lb: Dict, has_speaker: bool, config: Dict
+    lb: Dict, has_speaker: bool, config: CompiledConfig,
+    end_flags: Optional[int] = None
 ) -> float:
-    """Compute the total cost of a caption segment for DP scoring."""
-    w = config["weights"]
+    """Compute the total cost of a caption segment for DP scoring.
+
+    end_flags are the text's end flags (SpanIndex.end_flags() or
+    _text_end_flags()); computed from text if None.
+    """
+    if end_flags is None:
+        end_flags = _text_end_flags(text)
     cost = lb["score"]
 
     char_count = len(text.replace("\n", ""))
@@ -530,86 +1155,89 @@ def _compute_segment_cost(
     cps = char_count / dur
 
     # Cue length deviation
-    cost += w["cue_len_deviation"] * abs(char_count - config["target_cue_chars"])
+    cost += config.w_cue_len_deviation * abs(char_count - config.target_cue_chars)
 
     # Duration penalties
-    if dur < config["min_cue_dur"]:
-        cost += w["cue_dur_below"] * (config["min_cue_dur"] - dur)
-    if dur > config["max_cue_dur"]:
-        cost += w["cue_dur_above"] * (dur - config["max_cue_dur"])
+    if dur < config.min_cue_dur:
+        cost += config.w_cue_dur_below * (config.min_cue_dur - dur)
+    if dur > config.max_cue_dur:
+        cost += config.w_cue_dur_above * (dur - config.max_cue_dur)
 
     # Boundary quality
-    end_word = last_word_clean(text)
-    if ends_sentence(text):
-        cost += w["boundary_punct_bonus"]
-    elif ends_comma(text):
-        cost += w["boundary_punct_bonus"] * 0.3
-    elif end_word in WEAK_END_WORDS:
-        cost += w["boundary_weak_end"]
+    if end_flags & SENTENCE_END:
+        cost += config.w_boundary_punct_bonus
+    elif end_flags & COMMA_END:
+        cost += config.w_boundary_comma_bonus
+    elif end_flags & WEAK_END:
+        cost += config.w_boundary_weak_end
     else:
-        cost += w.get("boundary_no_punct", 1.5)
+        cost += config.w_boundary_no_punct
 
     # Speaker change bonus
     if has_speaker:
-        cost += w["speaker_change_bonus"]
+        cost += config.w_speaker_change_bonus
 
     return cost
 
 
-def _greedy_segment(words: List[Word], config: Dict) -> List[Dict[str, Any]]:
+def _greedy_segment(
+    words: Words,
+    config: CompiledConfig,
+    cache: Optional[LineBreakCache] = None,
+    stats: Optional[SegmentationStats] = None,
+) -> List[Dict[str, Any]]:
     """Fallback greedy segmentation when DP fails to find a valid path.
 
     This is extremely rare — only triggers if constraints are so tight that
-    no valid segmentation exists via DP.
+    no valid segmentation exists via DP. Spans the DP already scored are
+    answered from the cache.
     """
-    segments = []
-    i = 0
-
-    while i < len(words):
-        best_j = i + 1
-        best_info = None
-
-        for j in range(i + 1, min(i + config["max_lookback_words"], len(words) + 1)):
-            # Stop at speaker markers (except at start)
-            if j < len(words) and words[j].is_speaker_marker and j > i + 1:
-                break
-
-            seg_words = words[i:j]
-            text_parts = []
-            has_speaker = False
-            for sw in seg_words:
-                if sw.is_speaker_marker:
-                    has_speaker = True
-                else:
-                    text_parts.append(sw.text)
-
-            if not text_parts:
-                continue
+    if stats is not None:
+        stats.greedy_fallbacks += 1
+    with timed(stats, "greedy"):
+        if cache is not None:
+            cache.bind(words)
+
+        segments = []
+        spans = SpanIndex(words)
+        i = 0
+
+        while i < len(words):
+            best_j = i + 1
+            best_info = None
+
+            for j in range(i + 1, min(i + config.max_lookback_words, len(words) + 1)):
+                # Stop at speaker markers (except at start)
+                if j < len(words) and spans.is_marker(j) and j > i + 1:
+                    break
+
+                if not spans.text_count(i, j):
+                    continue
 
-            seg_text = " ".join(text_parts)
-            if has_speaker:
-                seg_text = "– " + seg_text
+                if spans.text_len(i, j) > config.max_cue_chars:
+                    break
 
-            if len(seg_text) > config["max_cue_chars"]:
-                break
+                seg_text = spans.text(i, j)
+                seg_start = spans.starts[i]
+                seg_end = spans.ends[j - 1]
 
-            lb = best_line_break(seg_text, seg_words[0].start, seg_words[-1].end, config)
-            if lb["ok"]:
-                best_j = j
-                best_info = {
-                    "text": seg_text,
-                    "start": seg_words[0].start,
-                    "end": seg_words[-1].end,
-                    "formatted": lb["formatted"],
-                    "lines": lb["lines"],
-                    "has_speaker": has_speaker
-                }
+                lb = _span_line_break(i, j, seg_text, seg_start, seg_end, config, cache, stats, spans)
+                if lb["ok"]:
+                    best_j = j
+                    best_info = {
+                        "text": seg_text,
+                        "start": seg_start,
+                        "end": seg_end,
+                        "formatted": lb["formatted"],
+                        "lines": lb["lines"],
+                        "has_speaker": spans.has_speaker(i, j)
+                    }
 
-        if best_info:
-            segments.append(best_info)
-        i = best_j
+            if best_info:
+                segments.append(best_info)
+            i = best_j
 
-    return segments
+        return segments
 
 
 # =============================================================================
@@ -625,7 +1253,9 @@ def seconds_to_srt_time(seconds: float) -> str:
     return "{:02d}:{:02d}:{:02d},{:03d}".format(hours, minutes, secs, millis)
 
 
-def generate_srt(segments: List[Dict[str, Any]], config: Dict) -> str:
+def generate_srt(
+    segments: List[Dict[str, Any]], config: Union[Dict, CompiledConfig]
+) -> str:
     """Generate SRT content from segments.
 
     WHY: SRT is the standard subtitle format. This function handles the
@@ -643,30 +1273,56 @@ def generate_srt(segments: List[Dict[str, Any]], config: Dict) -> str:
 
     Args:
         segments: List of segment dicts from segment_words().
-        config: Configuration dict with min_display_dur.
+        config: Configuration dict (or CompiledConfig) with min_display_dur.
 
     Returns:
         Complete SRT file content as a string.
     """
-    lines = []
+    cfg = compile_config(config)
+    cues = []
 
     for i, seg in enumerate(segments, 1):
-        start = seg["start"]
-        end = seg["end"]
+        next_start = segments[i]["start"] if i < len(segments) else None
+        cues.append(srt_cue(i, seg, next_start, cfg))
+
+    return "\n".join(cues)
+
 
-        # Ensure minimum display duration
-        if end - start < config["min_display_dur"]:
-            end = start + config["min_display_dur"]
+def srt_cue(
+    index: int,
+    seg: Dict[str, Any],
+    next_start: Optional[float],
+    config: Union[Dict, CompiledConfig],
+) -> str:
+    """Format one SRT cue block, applying generate_srt()'s timing rules.
 
-        # Ensure end doesn't exceed next segment's start
-        if i < len(segments):
-            next_start = segments[i]["start"]
-            if end > next_start - 0.05:
-                end = next_start - 0.05
+    Joining consecutive cues with "\n" gives exactly generate_srt()'s output,
+    which lets streaming callers emit cues one at a time.
 
-        lines.append(str(i))
-        lines.append("{} --> {}".format(seconds_to_srt_time(start), seconds_to_srt_time(end)))
-        lines.append(seg["formatted"])
-        lines.append("")
+    Args:
+        index: 1-based SRT sequence number.
+        seg: Segment dict from segment_words().
+        next_start: Start time of the following segment, or None for the last.
+        config: Configuration dict (or CompiledConfig) with min_display_dur.
 
-    return "\n".join(lines)
+    Returns:
+        "index\nstart --> end\ntext\n".
+    """
+    min_display_dur = compile_config(config).min_display_dur
+    start = seg["start"]
+    end = seg["end"]
+
+    # Ensure minimum display duration
+    if end - start < min_display_dur:
+        end = start + min_display_dur
+
+    # Ensure end doesn't exceed next segment's start
+    if next_start is not None and end > next_start - 0.05:
+        end = next_start - 0.05
+
+    return "{}\n{} --> {}\n{}\n".format(
+        index,
+        seconds_to_srt_time(start),
+        seconds_to_srt_time(end),
+        seg["formatted"],
+    )
@@ -0,0 +1,378 @@
+"""Span feature matrices for re-running the segmentation DP under new weights.
+
+WHY: Every term of the caption cost is a weight times a feature — length
+deviation, balance, orphan shortfall, weak-end flags, CPS overshoot and so
+on — and the features depend only on the words and the preset's limits.
+Tuning runs and A/B comparisons change weights and re-run segment_words()
+from scratch, re-normalizing, re-splitting and re-measuring every span each
+time.
+
+HOW: SpanFeatures.extract() walks the same (i, j) spans as segment_words()
+once and records two matrices:
+
+  layout rows  — one per candidate layout of a span (the single line, if it
+                 fits, and every two-line split that fits), one column per
+                 LAYOUT_COLUMNS weight
+  span rows    — one per span that has a valid layout, one column per
+                 SPAN_COLUMNS weight; the context terms of _span_cost()
+                 (segment-start bonus, mid-sentence and short-cue nudges)
+                 are columns with a fixed weight of 1.0
+
+segment(weights) then scores every layout as a dot product, takes each
+span's minimum as its line-break score, adds the span terms, and runs the
+DP over the stored spans. Only the captions on the winning path are laid
+out with best_line_break().
+
+RULES:
+- Results are identical to segment_words(words, config) with the new
+  weights: products are taken weight-times-feature and summed column by
+  column in the scorers' own term order, and skipped terms add an exact 0.0,
+  so every cost is bit-identical and ties break the same way.
+- Only weights change between calls; limits (line lengths, CPS targets,
+  durations, lookback) are fixed at extraction. Re-extract for new limits.
+- Memory grows with spans x layouts, so this is meant for tuning corpora
+  rather than multi-hour programmes.
+- NumPy is used for the dot products when installed; the pure-Python path
+  gives the same results, only slower.
+- Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as _np
+except ImportError:  # optional: pip install soniox-converter[fast]
+    _np = None
+
+from .compiled import CompiledConfig, compile_config
+from .core import (
+    _greedy_segment,
+    best_line_break,
+    ends_comma,
+    ends_sentence,
+    forced_partitions,
+    last_word_clean,
+    visible_len,
+)
+from .models import Words
+from .presets import WEAK_END_WORDS
+from .spans import SpanIndex
+from .wordflags import clean_word
+
+# Layout terms, in the order _score_single_line() and two_line_split_scores()
+# add them (preferred max appears once per line)
+LAYOUT_COLUMNS = (
+    "len_deviation", "over_preferred_max", "over_preferred_max",
+    "single_line_long", "balance", "orphan", "weak_end", "short_end",
+    "punct_bonus", "comma_bonus", "cps_above_target", "cps_above_max",
+)
+
+# Span terms, in the order _compute_segment_cost() and _span_cost() add
+# them; None marks a context term with a fixed weight of 1.0
+SPAN_COLUMNS = (
+    "cue_len_deviation", "cue_dur_below", "cue_dur_above",
+    "boundary_punct_bonus", "boundary_comma_bonus", "boundary_weak_end",
+    "boundary_no_punct", "speaker_change_bonus", None, None, None, None,
+)
+
+
+def _weight_vector(columns: Sequence[Optional[str]], config: CompiledConfig) -> List[float]:
+    return [1.0 if name is None else getattr(config, "w_" + name) for name in columns]
+
+
+def _cps_features(chars: int, start: float, end: float, config: CompiledConfig) -> Tuple[float, float]:
+    dur = max(0.001, end - start)
+    cps = chars / dur
+    above_target = cps - config.target_cps if cps > config.target_cps else 0.0
+    above_max = cps - config.max_cps if cps > config.max_cps else 0.0
+    return above_target, above_max
+
+
+def _layout_rows(text: str, start: float, end: float, config: CompiledConfig) -> List[List[float]]:
+    """Feature rows of every valid layout of a caption, as best_line_break() sees them."""
+    text = " ".join(text.split())
+    words = text.split()
+    if not words:
+        return []
+
+    rows = []  # type: List[List[float]]
+    target = config.target_line_chars
+    preferred_max = config.preferred_max_chars
+    max_chars = config.max_line_chars
+
+    length = visible_len(text)
+    if length <= max_chars:
+        cps_t, cps_m = _cps_features(length, start, end, config)
+        rows.append([
+            float(abs(length - target)),
+            float(length - preferred_max) if length > preferred_max else 0.0,
+            0.0,
+            float(length - config.prefer_split_over) if length > config.prefer_split_over else 0.0,
+            0.0, 0.0, 0.0, 0.0, 0.0, 0.0, cps_t, cps_m,
+        ])
+
+    if not config.two_lines or len(words) < 2:
+        return rows
+
+    cps_t, cps_m = _cps_features(len(text), start, end, config)
+    tagged = "<" in text
+    total = len(text)
+    running = -1
+    end_word = ""
+    for k in range(1, len(words)):
+        prev = words[k - 1]
+        if tagged:
+            line1 = " ".join(words[:k])
+            a, b = visible_len(line1), visible_len(" ".join(words[k:]))
+            end_word = last_word_clean(line1)
+            sentence, comma = ends_sentence(line1), ends_comma(line1)
+        else:
+            running += len(prev) + 1
+            a, b = running, total - running - 1
+            cleaned = clean_word(prev)
+            if cleaned:
+                end_word = cleaned
+            sentence, comma = prev[-1] in ".!?…", prev[-1] in ",;:"
+        if a > max_chars or b > max_chars:
+            continue
+        min_len = min(a, b)
+        rows.append([
+            float(abs(a - target) + abs(b - target)),
+            float(a - preferred_max) if a > preferred_max else 0.0,
+            float(b - preferred_max) if b > preferred_max else 0.0,
+            0.0,
+            float(abs(a - b)),
+            float(config.min_line_chars - min_len) if min_len < config.min_line_chars else 0.0,
+            1.0 if end_word in WEAK_END_WORDS else 0.0,
+            1.0 if end_word and len(end_word) <= 2 else 0.0,
+            1.0 if sentence else 0.0,
+            1.0 if comma and not sentence else 0.0,
+            cps_t, cps_m,
+        ])
+    return rows
+
+
+def _span_row(spans: SpanIndex, i: int, j: int, text: str, config: CompiledConfig) -> List[float]:
+    """Feature row of the span terms _compute_segment_cost() and _span_cost() add."""
+    start = spans.starts[i]
+    end = spans.ends[j - 1]
+    char_count = len(text.replace("\n", ""))
+    dur = max(0.001, end - start)
+
+    row = [
+        float(abs(char_count - config.target_cue_chars)),
+        config.min_cue_dur - dur if dur < config.min_cue_dur else 0.0,
+        dur - config.max_cue_dur if dur > config.max_cue_dur else 0.0,
+        0.0, 0.0, 0.0, 0.0,
+        1.0 if spans.has_speaker(i, j) else 0.0,
+        0.0, 0.0, 0.0, 0.0,
+    ]
+    if ends_sentence(text):
+        row[3] = 1.0
+    elif ends_comma(text):
+        row[4] = 1.0
+    elif last_word_clean(text) in WEAK_END_WORDS:
+        row[5] = 1.0
+    else:
+        row[6] = 1.0
+
+    if j < len(spans):
+        next_is_segment_start = spans.segment_starts[j]
+        if next_is_segment_start:
+            row[8] = -2.0
+        if (not next_is_segment_start
+                and not ends_sentence(text)
+                and not ends_comma(text)):
+            row[9] = 2.0
+        if (end - start) < config.min_cue_dur:
+            row[10] = 2.0
+        if spans.text_len(i, j) < 35:
+            row[11] = 1.5
+    return row
+
+
+class SpanFeatures:
+    """Weight-independent features of every DP span of one word list.
+
+    Usage:
+        features = SpanFeatures.extract(words, PRESETS["social"])
+        for weights in candidates:
+            segments = features.segment(weights)
+
+    Attributes:
+        words: The word list the features were extracted from.
+        config: The CompiledConfig whose limits the features use.
+        n_spans: Number of spans with at least one valid layout.
+        n_layouts: Number of layout rows over all spans.
+    """
+
+    def __init__(
+        self,
+        words: Words,
+        config: CompiledConfig,
+        spans: SpanIndex,
+        span_ij: List[Tuple[int, int]],
+        layout_starts: List[int],
+        layout_rows: List[List[float]],
+        span_rows: List[List[float]],
+        partitions: List[Tuple[int, int, int, int]],
+    ) -> None:
+        self.words = words
+        self.config = config
+        self._spans = spans
+        self._span_ij = span_ij
+        self._layout_starts = layout_starts
+        self._partitions = partitions
+        if _np is not None:
+            self._layouts = _np.array(layout_rows, dtype=_np.float64).reshape(-1, len(LAYOUT_COLUMNS))
+            self._span_features = _np.array(span_rows, dtype=_np.float64).reshape(-1, len(SPAN_COLUMNS))
+        else:
+            self._layouts = layout_rows
+            self._span_features = span_rows
+
+    @property
+    def n_spans(self) -> int:
+        return len(self._span_ij)
+
+    @property
+    def n_layouts(self) -> int:
+        return len(self._layouts)
+
+    @classmethod
+    def extract(
+        cls,
+        words: Words,
+        config: Union[Dict, CompiledConfig],
+        spans: Optional[SpanIndex] = None,
+    ) -> "SpanFeatures":
+        """Measure every span segment_words() would score for config's limits.
+
+        Args:
+            words: Flat list of Word objects, or a WordArray.
+            config: Configuration dict (or CompiledConfig); its weights are
+                the defaults for segment(), its limits are fixed.
+            spans: Optional prebuilt SpanIndex over words.
+        """
+        cfg = compile_config(config)
+        if spans is None:
+            spans = SpanIndex(words)
+        lookback = spans.char_lookback(cfg.max_cue_chars) if len(spans) else [0]
+
+        span_ij = []  # type: List[Tuple[int, int]]
+        layout_starts = []  # type: List[int]
+        layout_rows = []  # type: List[List[float]]
+        span_rows = []  # type: List[List[float]]
+        partitions = []  # type: List[Tuple[int, int, int, int]]
+
+        for lo, hi in (forced_partitions(spans) if len(spans) else []):
+            first = len(span_ij)
+            for j in range(lo + 1, hi + 1):
+                min_i = max(lookback[j], j - cfg.max_lookback_words, spans.prev_break[j], lo)
+                for i in range(j - 1, min_i - 1, -1):
+                    if not spans.text_count(i, j):
+                        continue
+                    text = spans.text(i, j)
+                    rows = _layout_rows(text, spans.starts[i], spans.ends[j - 1], cfg)
+                    if not rows:
+                        continue
+                    span_ij.append((i, j))
+                    layout_starts.append(len(layout_rows))
+                    layout_rows.extend(rows)
+                    span_rows.append(_span_row(spans, i, j, text, cfg))
+            partitions.append((lo, hi, first, len(span_ij)))
+
+        return cls(words, cfg, spans, span_ij, layout_starts, layout_rows,
+                   span_rows, partitions)
+
+    def with_weights(self, weights: Optional[Dict[str, float]] = None) -> CompiledConfig:
+        """The extraction config with some or all of its weights replaced."""
+        if not weights:
+            return self.config
+        config = self.config.as_dict()
+        config["weights"].update(weights)
+        return compile_config(config)
+
+    def span_costs(self, weights: Optional[Dict[str, float]] = None) -> List[float]:
+        """DP cost of every stored span under weights (see with_weights())."""
+        cfg = self.with_weights(weights)
+        layout_w = _weight_vector(LAYOUT_COLUMNS, cfg)
+        span_w = _weight_vector(SPAN_COLUMNS, cfg)
+        if not self._span_ij:
+            return []
+
+        if _np is not None:
+            scores = _np.zeros(len(self._layouts), dtype=_np.float64)
+            for k, w in enumerate(layout_w):
+                scores += self._layouts[:, k] * w
+            costs = _np.minimum.reduceat(scores, self._layout_starts)
+            for k, w in enumerate(span_w):
+                costs += self._span_features[:, k] * w
+            return costs.tolist()
+
+        ends = self._layout_starts[1:] + [len(self._layouts)]
+        costs = []
+        for start, end, span_row in zip(self._layout_starts, ends, self._span_features):
+            best = math.inf
+            for row in self._layouts[start:end]:
+                score = 0.0
+                for f, w in zip(row, layout_w):
+                    score += f * w
+                if score < best:
+                    best = score
+            cost = best
+            for f, w in zip(span_row, span_w):
+                cost += f * w
+            costs.append(cost)
+        return costs
+
+    def segment(self, weights: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """Segment the words under weights, exactly as segment_words() would.
+
+        Args:
+            weights: Weight overrides on top of the extraction config's
+                weights; None keeps them.
+
+        Returns:
+            List of segment dicts with text, start, end, formatted, lines,
+            has_speaker.
+        """
+        cfg = self.with_weights(weights)
+        costs = self.span_costs(weights)
+        spans = self._spans
+        span_ij = self._span_ij
+
+        segments = []  # type: List[Dict[str, Any]]
+        for lo, hi, first, last in self._partitions:
+            size = hi - lo
+            dp = [math.inf] * (size + 1)
+            choice = [-1] * (size + 1)
+            dp[0] = 0.0
+            for s in range(first, last):
+                i, j = span_ij[s]
+                total = dp[i - lo] + costs[s]
+                if total < dp[j - lo]:
+                    dp[j - lo] = total
+                    choice[j - lo] = s
+
+            if not math.isfinite(dp[size]):
+                return _greedy_segment(self.words, cfg)
+
+            path = []  # type: List[Dict[str, Any]]
+            j = size
+            while j > 0:
+                i, _ = span_ij[choice[j]]
+                text = spans.text(i, j + lo)
+                lb = best_line_break(text, spans.starts[i], spans.ends[j + lo - 1], cfg)
+                path.append({
+                    "text": text,
+                    "start": spans.starts[i],
+                    "end": spans.ends[j + lo - 1],
+                    "formatted": lb["formatted"],
+                    "lines": lb["lines"],
+                    "has_speaker": spans.has_speaker(i, j + lo)
+                })
+                j = i - lo
+            path.reverse()
+            segments.extend(path)
+        return segments
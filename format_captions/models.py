@@ -15,9 +15,13 @@ RULES:
 - is_segment_start marks the first real word in a source segment (sentence),
   used by the DP algorithm to prefer breaking at natural boundaries.
 - Timestamps are in seconds (float), not milliseconds.
+- WordArray holds the same fields column-wise for long inputs; every
+  pipeline entry point that takes a Word list also takes a WordArray.
 """
 
+from array import array
 from dataclasses import dataclass
+from typing import Iterator, List, Union, overload
 
 
 @dataclass
@@ -36,3 +40,143 @@ class Word:
     end: float
     is_speaker_marker: bool = False
     is_segment_start: bool = False
+
+
+# WordArray flag bits
+MARKER_FLAG = 1
+SEGMENT_START_FLAG = 2
+
+
+class WordArray:
+    """Columnar word list: the fields of Word stored in parallel arrays.
+
+    WHY: A list of Word dataclasses costs several Python objects per word
+    (instance, attribute dict, two floats, text string). On multi-hour
+    archives that is millions of small objects for data that is only ever
+    read column by column.
+
+    HOW: Start and end times live in array('d') columns and the two flags
+    share one array('B') bit column. Texts are UTF-8 encoded into a single
+    bytearray with an array('q') of byte offsets. Indexing returns a fresh
+    Word view, so code written against Word lists keeps working; the caption
+    engine (SpanIndex) reads the columns directly instead.
+
+    Attributes:
+        starts: Word start times in seconds.
+        ends: Word end times in seconds.
+        flags: MARKER_FLAG and SEGMENT_START_FLAG bits per word.
+    """
+
+    __slots__ = ("starts", "ends", "flags", "_offsets", "_text")
+
+    def __init__(self) -> None:
+        self.starts = array("d")
+        self.ends = array("d")
+        self.flags = array("B")
+        self._offsets = array("q", [0])
+        self._text = bytearray()
+
+    @classmethod
+    def from_words(cls, words: "List[Word]") -> "WordArray":
+        """Build a WordArray from Word objects."""
+        result = cls()
+        for w in words:
+            result.append(w.text, w.start, w.end, w.is_speaker_marker, w.is_segment_start)
+        return result
+
+    def append(
+        self,
+        text: str,
+        start: float,
+        end: float,
+        is_speaker_marker: bool = False,
+        is_segment_start: bool = False,
+    ) -> None:
+        """Append one word's fields."""
+        self.starts.append(start)
+        self.ends.append(end)
+        self.flags.append(
+            (MARKER_FLAG if is_speaker_marker else 0)
+            | (SEGMENT_START_FLAG if is_segment_start else 0)
+        )
+        self._text += text.encode("utf-8")
+        self._offsets.append(len(self._text))
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    @overload
+    def __getitem__(self, index: int) -> Word: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "WordArray": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> "Union[Word, WordArray]":
+        if isinstance(index, slice):
+            return self._slice(index)
+        n = len(self.flags)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("WordArray index out of range")
+        flag = self.flags[index]
+        return Word(
+            text=self.text(index),
+            start=self.starts[index],
+            end=self.ends[index],
+            is_speaker_marker=bool(flag & MARKER_FLAG),
+            is_segment_start=bool(flag & SEGMENT_START_FLAG),
+        )
+
+    def __iter__(self) -> Iterator[Word]:
+        for k in range(len(self.flags)):
+            yield self[k]
+
+    def _slice(self, index: slice) -> "WordArray":
+        lo, hi, step = index.indices(len(self.flags))
+        if step != 1:
+            raise ValueError("WordArray slices must be contiguous")
+        hi = max(lo, hi)
+        result = WordArray()
+        result.starts = self.starts[lo:hi]
+        result.ends = self.ends[lo:hi]
+        result.flags = self.flags[lo:hi]
+        base = self._offsets[lo]
+        result._offsets = array("q", (off - base for off in self._offsets[lo:hi + 1]))
+        result._text = self._text[base:self._offsets[hi]]
+        return result
+
+    def text(self, k: int) -> str:
+        """Text of word k."""
+        return self._text[self._offsets[k]:self._offsets[k + 1]].decode("utf-8")
+
+    def iter_texts(self) -> Iterator[str]:
+        """Texts of all words, in order."""
+        offsets = self._offsets
+        data = self._text
+        for k in range(len(self.flags)):
+            yield data[offsets[k]:offsets[k + 1]].decode("utf-8")
+
+    def is_speaker_marker(self, k: int) -> bool:
+        return bool(self.flags[k] & MARKER_FLAG)
+
+    def is_segment_start(self, k: int) -> bool:
+        return bool(self.flags[k] & SEGMENT_START_FLAG)
+
+    def to_words(self) -> "List[Word]":
+        """Materialize the whole array as Word objects."""
+        return list(self)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, in bytes."""
+        return (
+            self.starts.buffer_info()[1] * self.starts.itemsize
+            + self.ends.buffer_info()[1] * self.ends.itemsize
+            + self.flags.buffer_info()[1] * self.flags.itemsize
+            + self._offsets.buffer_info()[1] * self._offsets.itemsize
+            + len(self._text)
+        )
+
+
+# Anything the caption pipeline accepts as its word sequence
+Words = Union[List[Word], WordArray]
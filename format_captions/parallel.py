@@ -0,0 +1,335 @@
+"""Parallel caption segmentation across forced-break partitions.
+
+WHY: Speaker markers are hard caption boundaries, so the segmentation DP of a
+debate or panel programme falls apart into independent sub-problems between
+consecutive speaker changes. On multi-hour programmes these can be solved on
+all cores of a conversion box instead of one. A single-speaker lecture has
+no forced breaks at all, so its long stretches need cutting up as well.
+
+HOW: forced_partitions() lists the (lo, hi) word ranges between forced breaks.
+Consecutive partitions are grouped into batches of roughly equal word count,
+and each batch is sent to a ProcessPoolExecutor worker as a slice of the word
+list (plus the word after it, which the DP needs for its boundary bonuses).
+Workers run the same _solve_range() DP as the serial path and return each
+partition's caption path as (i, j, break_at) triples; the parent builds the
+caption strings and stitches the results back together in order.
+
+With chunk_words, partitions longer than that are split at sentence anchors
+(sentence_anchors()): a segment start right after a sentence end, about
+every chunk_words words. Each chunk is solved as a window that reaches
+overlap_words into its neighbours, and at each anchor the two windows'
+paths are joined at a caption boundary they share, nearest the anchor. If
+they share none, the stretch from the left path's last boundary before the
+anchor to the right path's next boundary after it is re-solved exactly (a
+repaired seam).
+
+RULES:
+- Without chunk_words, output is identical to segment_words(): both run
+  _solve_range() on the same partitions, and each partition's DP restarts
+  at zero cost.
+- With chunk_words, output may differ from segment_words() near seams (see
+  tests/fixtures/caption_tuning/CHUNKED_SEGMENTATION_REPORT.md); each DP
+  holds one window, whatever the partition length.
+- If any partition has no valid DP path, the whole word list falls back to
+  greedy segmentation, exactly as in the serial path.
+- Fewer than two DP ranges, or max_workers == 1, runs serially in-process.
+- Workers do not share a LineBreakCache; the cache is a serial-path feature.
+- With a SegmentationStats, each batch collects its own counters in its
+  worker and they are merged in order; "segment" is the pool's wall time.
+- Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .compiled import CompiledConfig, compile_config
+from .core import (
+    _greedy_segment,
+    _pruning_exact,
+    _solve_range,
+    _span_segment,
+    forced_partitions,
+    search_beam_width,
+    segment_words,
+)
+from .models import Words
+from .spans import SpanIndex
+from .stats import SegmentationStats, timed
+from .wordflags import SENTENCE_END
+
+# Batches per worker: enough to balance uneven partitions, few enough that
+# pickling overhead stays small.
+BATCHES_PER_WORKER = 4
+
+# Words each chunk window reaches into its neighbours (several captions at
+# the presets' max_lookback_words)
+DEFAULT_OVERLAP_WORDS = 64
+
+# A caption on a DP path: (first word, end word, layout break_at)
+Caption = Tuple[int, int, Optional[int]]
+
+
+def _solve_batch(
+    words: Words,
+    bounds: List[Tuple[int, int]],
+    config: CompiledConfig,
+    collect_stats: bool = False,
+    prune: bool = True,
+    beam_width: int = 0,
+) -> Tuple[List[Optional[List[Caption]]], Optional[SegmentationStats]]:
+    """Worker entry point: solve each range of one word-list slice."""
+    stats = SegmentationStats() if collect_stats else None
+    spans = SpanIndex(words)
+    lookback = spans.char_lookback(config.max_cue_chars)
+    prune = prune and _pruning_exact(spans, config)
+    paths = [
+        _solve_range(spans, lookback, lo, hi, config, stats=stats, prune=prune,
+                     beam_width=beam_width)
+        for lo, hi in bounds
+    ]
+    return paths, stats
+
+
+def _batch_partitions(
+    partitions: List[Tuple[int, int]],
+    n_batches: int,
+) -> List[List[Tuple[int, int]]]:
+    """Group consecutive partitions into about n_batches equal-sized batches."""
+    total = partitions[-1][1] - partitions[0][0]
+    target = max(1, total // max(1, n_batches))
+    batches = []  # type: List[List[Tuple[int, int]]]
+    current = []  # type: List[Tuple[int, int]]
+    size = 0
+    for lo, hi in partitions:
+        current.append((lo, hi))
+        size += hi - lo
+        if size >= target:
+            batches.append(current)
+            current = []
+            size = 0
+    if current:
+        batches.append(current)
+    return batches
+
+
+def sentence_anchors(
+    spans: SpanIndex, lo: int, hi: int, chunk_words: int,
+    overlap_words: int = DEFAULT_OVERLAP_WORDS,
+) -> List[int]:
+    """Positions in (lo, hi) to split a long partition at, about chunk_words apart.
+
+    An anchor is a word that starts a transcript segment right after a word
+    that ends a sentence, where the DP almost always puts a caption
+    boundary. The first anchor at least chunk_words after the previous one
+    is taken; none is taken within overlap_words (or chunk_words / 4) of hi.
+    """
+    anchors = []  # type: List[int]
+    starts = spans.segment_starts
+    flags = spans.word_flags
+    limit = hi - max(overlap_words, chunk_words // 4)
+    k = lo + chunk_words
+    while k < limit:
+        if starts[k] and flags[k - 1] & SENTENCE_END:
+            anchors.append(k)
+            k += chunk_words
+        else:
+            k += 1
+    return anchors
+
+
+def _chunk_windows(lo: int, hi: int, anchors: List[int], overlap_words: int) -> List[Tuple[int, int]]:
+    """DP windows of the chunks between anchors, overlapping their neighbours."""
+    cuts = [lo] + anchors + [hi]
+    windows = []  # type: List[Tuple[int, int]]
+    for c in range(len(cuts) - 1):
+        start = lo if c == 0 else max(cuts[c - 1], cuts[c] - overlap_words)
+        end = hi if c == len(cuts) - 2 else min(cuts[c + 2], cuts[c + 1] + overlap_words)
+        windows.append((start, end))
+    return windows
+
+
+def _boundaries(path: List[Caption]) -> List[int]:
+    """Caption boundaries of a path, its start and end included."""
+    return [i for i, _, _ in path] + [path[-1][1]]
+
+
+def _stitch(
+    paths: List[List[Caption]],
+    lo: int,
+    anchors: List[int],
+    spans: SpanIndex,
+    lookback: List[int],
+    config: CompiledConfig,
+    stats: Optional[SegmentationStats],
+    prune: bool,
+    beam_width: int,
+) -> Optional[List[Caption]]:
+    """Join the chunk windows' paths of one partition at its anchors.
+
+    Returns:
+        The partition's captions, or None if a repaired seam has no valid
+        DP path.
+    """
+    captions = []  # type: List[Caption]
+    pos = lo
+    current = paths[0]
+    for k, following in zip(anchors, paths[1:]):
+        left = _boundaries(current)
+        right = set(_boundaries(following))
+        shared = [b for b in left if b > pos and b in right]
+        if stats is not None:
+            stats.seams += 1
+        if shared:
+            seam = min(shared, key=lambda b: (abs(b - k), b))
+            captions.extend(c for c in current if c[0] >= pos and c[1] <= seam)
+            pos = seam
+        else:
+            seam = max(b for b in left if pos <= b <= k)
+            rejoin = min(b for b in right if b > seam and b >= k)
+            captions.extend(c for c in current if c[0] >= pos and c[1] <= seam)
+            repair = _solve_range(spans, lookback, seam, rejoin, config, stats=stats,
+                                  prune=prune, beam_width=beam_width)
+            if repair is None:
+                return None
+            captions.extend(repair)
+            pos = rejoin
+            if stats is not None:
+                stats.seams_repaired += 1
+        current = following
+    captions.extend(c for c in current if c[0] >= pos)
+    return captions
+
+
+def segment_words_parallel(
+    words: Words,
+    config: Union[Dict, CompiledConfig],
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    stats: Optional[SegmentationStats] = None,
+    prune: bool = True,
+    strategy: Optional[str] = None,
+    chunk_words: Optional[int] = None,
+    overlap_words: int = DEFAULT_OVERLAP_WORDS,
+) -> List[Dict[str, Any]]:
+    """Segment words like segment_words(), solving partitions in parallel.
+
+    Args:
+        words: Flat list of Word objects, or a WordArray.
+        config: Configuration dict (or CompiledConfig) with limits and weights.
+        max_workers: Process count; None uses os.cpu_count().
+        executor: Optional existing executor to submit batches to, for
+            callers that keep a long-lived pool. max_workers then only
+            sizes the batching.
+        stats: Optional SegmentationStats to add the workers' counters to.
+        prune: Skip spans that cannot improve the DP (see segment_words()).
+        strategy: "exact" or "beam"; None uses the config's (see
+            segment_words()).
+        chunk_words: Split partitions longer than this at sentence anchors
+            and solve the chunks independently (approximate near seams).
+            None solves every partition whole.
+        overlap_words: Words each chunk window reaches into its neighbours.
+
+    Returns:
+        List of segment dicts; identical to segment_words(words, config)
+        unless chunk_words is set.
+
+    Raises:
+        ValueError: If strategy is not recognized, or chunk_words is not
+            larger than 2 * overlap_words.
+    """
+    if not words:
+        return []
+
+    config = compile_config(config)
+    beam_width = search_beam_width(config, strategy)
+    if chunk_words is not None and chunk_words <= 2 * overlap_words:
+        raise ValueError("chunk_words ({}) must be larger than 2 * overlap_words ({})".format(
+            chunk_words, overlap_words))
+    workers = max_workers or os.cpu_count() or 1
+    spans = SpanIndex(words)
+    partitions = forced_partitions(spans)
+    if chunk_words is None and (workers == 1 or len(partitions) < 2):
+        return segment_words(words, config, spans=spans, stats=stats, prune=prune, strategy=strategy)
+
+    # DP windows; per partition its first window index, lo and anchors
+    windows = []  # type: List[Tuple[int, int]]
+    groups = []  # type: List[Tuple[int, int, List[int]]]
+    for lo, hi in partitions:
+        anchors = []  # type: List[int]
+        if chunk_words is not None and hi - lo > chunk_words:
+            anchors = sentence_anchors(spans, lo, hi, chunk_words, overlap_words)
+        groups.append((len(windows), lo, anchors))
+        windows.extend(_chunk_windows(lo, hi, anchors, overlap_words))
+
+    lookback = spans.char_lookback(config.max_cue_chars)
+    serial_prune = prune and _pruning_exact(spans, config)
+    if workers == 1 or len(windows) < 2:
+        with timed(stats, "segment"):
+            paths = [
+                _solve_range(spans, lookback, lo, hi, config, stats=stats, prune=serial_prune,
+                             beam_width=beam_width)
+                for lo, hi in windows
+            ]  # type: List[Optional[List[Caption]]]
+    else:
+        paths = _solve_parallel(words, windows, config, workers, executor, stats, prune, beam_width)
+
+    segments = []  # type: List[Dict[str, Any]]
+    for first, lo, anchors in groups:
+        chunk_paths = paths[first:first + len(anchors) + 1]
+        if any(path is None for path in chunk_paths):
+            return _greedy_segment(words, config, stats=stats)
+        captions = chunk_paths[0]
+        if anchors:
+            captions = _stitch(chunk_paths, lo, anchors, spans, lookback, config, stats,
+                               serial_prune, beam_width)
+            if captions is None:
+                return _greedy_segment(words, config, stats=stats)
+        segments.extend(_span_segment(spans, i, j, break_at) for i, j, break_at in captions)
+    return segments
+
+
+def _solve_parallel(
+    words: Words,
+    windows: List[Tuple[int, int]],
+    config: CompiledConfig,
+    workers: int,
+    executor: Optional[Executor],
+    stats: Optional[SegmentationStats],
+    prune: bool,
+    beam_width: int,
+) -> List[Optional[List[Caption]]]:
+    """Solve DP windows in batches on a process pool; paths in window order."""
+    n = len(words)
+    batches = _batch_partitions(windows, workers * BATCHES_PER_WORKER)
+    slices = []
+    relative_bounds = []
+    offsets = []
+    for batch in batches:
+        lo = batch[0][0]
+        hi = max(end for _, end in batch)
+        # Include the next word so boundary bonuses at hi see it
+        slices.append(words[lo:min(hi + 1, n)])
+        relative_bounds.append([(a - lo, b - lo) for a, b in batch])
+        offsets.append(lo)
+    configs = [config] * len(batches)
+    flags = [stats is not None] * len(batches)
+    prunes = [prune] * len(batches)
+    widths = [beam_width] * len(batches)
+
+    with timed(stats, "segment"):
+        if executor is not None:
+            results = list(executor.map(_solve_batch, slices, relative_bounds, configs, flags, prunes, widths))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_solve_batch, slices, relative_bounds, configs, flags, prunes, widths))
+
+    paths = []  # type: List[Optional[List[Caption]]]
+    for offset, (batch_paths, batch_stats) in zip(offsets, results):
+        if stats is not None:
+            stats.merge(batch_stats)
+        for path in batch_paths:
+            if path is not None:
+                path = [(i + offset, j + offset, break_at) for i, j, break_at in path]
+            paths.append(path)
+    return paths
@@ -0,0 +1,371 @@
+"""Streaming, self-repairing JSON reader for caption input.
+
+WHY: The CLI used to read the whole input file into one string, parse it
+into a full JSON tree with try_parse_json() — which, for a truncated file,
+re-parses the entire input once per candidate bracket suffix — and then
+build a Word list with parse_input(). Large speech-to-text exports paid for
+the raw text, the dict tree and the Word list at once, and for up to 14
+full parses when the file was cut short.
+
+HOW: iter_words() reads the input in chunks and walks the top-level array
+itself. Segment objects are walked key by key, and the elements of their
+"words" array are decoded one at a time, so each Word is yielded as soon as
+its object has been read. Every other value (a flat word object, a segment
+field, a non-dict item) is decoded in place with JSONDecoder.raw_decode();
+when a decode fails, a bracket- and string-aware scan tells a value cut off
+by the end of the buffer (read on) from invalid JSON (ValueError).
+Consumed input is dropped from the buffer as it goes. A truncated file is repaired in the same single pass:
+when the input ends, open arrays and objects count as closed, an object cut
+off mid-way keeps its completed fields, and a cut-off value is dropped.
+
+RULES:
+- Yields the same Words as parse_input(try_parse_json(text)) for every
+  input try_parse_json() accepts, and additionally recovers files truncated
+  inside a word object or string.
+- Input shapes and field aliases are those of parse_input() (see
+  core.word_from_dict()). A top-level value that is not an array is parsed
+  whole by try_parse_json() and parse_input(), as before.
+- Malformed JSON before the end of the input raises ValueError; only the
+  tail of the input is ever repaired. One comma that ends the input is
+  dropped, as try_parse_json() does, also right after an opening bracket
+  ("[," reads as an empty list).
+- A segment object is treated as a segment as soon as a "words" key with an
+  array value is read, whatever its other keys.
+- Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
+"""
+
+import io
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple, Union
+
+from .core import parse_input, try_parse_json, word_from_dict
+from .models import Word, WordArray
+
+# Characters read per chunk from the input stream
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_SCALAR = re.compile(r"[^ \t\n\r,\]}]*")
+_DELIMITERS = " \t\n\r,]}"
+
+_DECODER = json.JSONDecoder()
+
+_PARSE_ERROR = "Could not parse JSON input"
+
+
+class _Truncated:
+    """A value cut off by the end of the input."""
+
+    __slots__ = ("fragment",)
+
+    def __init__(self, fragment: str) -> None:
+        self.fragment = fragment
+
+
+class _JsonStream:
+    """Chunked cursor over JSON text with whole-value decoding."""
+
+    def __init__(self, stream: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read one more chunk; False at the end of the input."""
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def advance(self) -> None:
+        """Consume the character peek() returned."""
+        self._pos += 1
+
+    def trailing_comma(self) -> bool:
+        """Consume a "," that ends the input (True); otherwise consume nothing.
+
+        try_parse_json() strips one trailing comma before it repairs the
+        input, so a dangling comma is the end of the input, not a value.
+        """
+        if self.peek() != ",":
+            return False
+        self.advance()
+        if not self.peek():
+            return True
+        # peek() may have dropped the consumed input: put the comma back
+        self._buf = "," + self._buf[self._pos:]
+        self._pos = 0
+        return False
+
+    def rest(self) -> str:
+        """Consume and return everything left in the input."""
+        while self._fill():
+            pass
+        rest = self._buf[self._pos:]
+        self._buf, self._pos = "", 0
+        return rest
+
+    def _value_end(self, pos: int) -> Optional[int]:
+        """End of the value starting at pos, or None if it is incomplete."""
+        buf = self._buf
+        first = buf[pos]
+        if first == '"':
+            match = _STRING_TAIL.match(buf, pos + 1)
+            return match.end() if match else None
+        if first not in "[{":
+            end = _SCALAR.match(buf, pos).end()
+            return end if end < len(buf) or self._eof else None
+        depth = 0
+        i = pos
+        while True:
+            match = _STRUCTURAL.search(buf, i)
+            if match is None:
+                return None
+            char = match.group()
+            if char == '"':
+                tail = _STRING_TAIL.match(buf, match.end())
+                if tail is None:
+                    return None
+                i = tail.end()
+                continue
+            depth += 1 if char in "[{" else -1
+            i = match.end()
+            if depth == 0:
+                return i
+
+    def value(self) -> Any:
+        """Decode and consume the next value; a _Truncated at the end of the input.
+
+        Raises:
+            ValueError: If the value is complete but not valid JSON.
+        """
+        if not self.peek():
+            return _Truncated("")
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Invalid, or cut off by the end of the buffer: only the
+                # bracket scan can tell, so it runs on failures alone
+                end = self._value_end(self._pos)
+                if end is not None:
+                    text = self._buf[self._pos:end]
+                    if end == len(self._buf) and self._eof:
+                        self._pos = end
+                        return _Truncated(text)
+                    raise ValueError("{}: invalid value {!r}".format(_PARSE_ERROR, text[:80]))
+                if not self._fill():
+                    fragment = self._buf[self._pos:]
+                    self._pos = len(self._buf)
+                    return _Truncated(fragment)
+                continue
+            buf = self._buf
+            if buf[self._pos] in '"[{' or (end < len(buf) and buf[end] in _DELIMITERS):
+                self._pos = end
+                return value
+            # A number or literal may continue in the next chunk
+            if self._fill():
+                continue
+            if end == len(buf):
+                self._pos = end
+                return value
+            scalar_end = _SCALAR.match(buf, self._pos).end()
+            if scalar_end == len(buf):
+                fragment = buf[self._pos:]
+                self._pos = scalar_end
+                return _Truncated(fragment)
+            raise ValueError("{}: invalid value {!r}".format(_PARSE_ERROR, buf[self._pos:scalar_end][:80]))
+
+    def expect_separator(self, close: str) -> bool:
+        """Consume a "," (True) or the closing bracket (False) after a value.
+
+        The end of the input counts as the closing bracket.
+
+        Raises:
+            ValueError: On any other character.
+        """
+        char = self.peek()
+        if char == ",":
+            self.advance()
+            return True
+        if char == close:
+            self.advance()
+            return False
+        if not char:
+            return False
+        raise ValueError("{}: expected ',' or '{}', found {!r}".format(_PARSE_ERROR, close, char))
+
+
+def _read_object(js: _JsonStream, stream_words: bool) -> Iterator[Word]:
+    """Read an object's fields after its "{"; a generator returning (fields, streamed).
+
+    With stream_words, the elements of a "words" array are yielded as Words
+    while they are read, and streamed is True.
+    """
+    fields = {}  # type: Dict[str, Any]
+    streamed = False
+    if js.peek() == "}":
+        js.advance()
+        return fields, streamed
+    if js.trailing_comma():
+        return fields, streamed
+    while True:
+        key = js.value()
+        if isinstance(key, _Truncated):
+            break
+        if not isinstance(key, str):
+            raise ValueError("{}: object key {!r} is not a string".format(_PARSE_ERROR, key))
+        char = js.peek()
+        if not char:
+            break
+        if char != ":":
+            raise ValueError("{}: expected ':', found {!r}".format(_PARSE_ERROR, char))
+        js.advance()
+        if stream_words and key == "words" and js.peek() == "[":
+            js.advance()
+            streamed = True
+            yield from _read_segment_words(js)
+        else:
+            value = js.value()
+            if isinstance(value, _Truncated):
+                break
+            fields[key] = value
+        if not js.expect_separator("}"):
+            break
+    return fields, streamed
+
+
+def _drain(gen: Iterator[Word]) -> Tuple[Dict[str, Any], bool]:
+    """Run a _read_object() generator that yields nothing; return its result."""
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _repair_object(fragment: str) -> Dict[str, Any]:
+    """Completed fields of an object cut off by the end of the input."""
+    js = _JsonStream(io.StringIO(fragment))
+    js.peek()
+    js.advance()  # "{"
+    fields, _ = _drain(_read_object(js, stream_words=False))
+    return fields
+
+
+def _read_segment_words(js: _JsonStream) -> Iterator[Word]:
+    """Yield the Words of a segment's "words" array, after its "["."""
+    first_in_segment = True
+    if js.peek() == "]":
+        js.advance()
+        return
+    if js.trailing_comma():
+        return
+    while True:
+        value = js.value()
+        if isinstance(value, _Truncated):
+            if not value.fragment.startswith("{"):
+                return
+            value = _repair_object(value.fragment)
+        word = word_from_dict(value, first_in_segment)
+        if word is not None:
+            if not word.is_speaker_marker:
+                first_in_segment = False
+            yield word
+        if not js.expect_separator("]"):
+            return
+
+
+def _iter_items(js: _JsonStream) -> Iterator[Word]:
+    """Yield the Words of the top-level array's items, after its "["."""
+    if js.peek() == "]":
+        js.advance()
+        return
+    if js.trailing_comma():
+        return
+    while True:
+        char = js.peek()
+        if not char:
+            return
+        if char == "]":
+            # Trailing comma before the closing bracket
+            js.advance()
+            return
+        if char == "{":
+            js.advance()
+            fields, streamed = yield from _read_object(js, stream_words=True)
+            if not streamed:
+                word = word_from_dict(fields)
+                if word is not None:
+                    yield word
+        else:
+            js.value()
+        if not js.expect_separator("]"):
+            return
+
+
+def iter_words(source: Union[str, TextIO], chunk_size: int = CHUNK_SIZE) -> Iterator[Word]:
+    """Yield the Words of a JSON transcript as it is read.
+
+    Args:
+        source: JSON text, or a text stream (an open file, sys.stdin).
+        chunk_size: Characters read from a stream at a time.
+
+    Yields:
+        Word objects, in input order, as parse_input() would build them.
+
+    Raises:
+        ValueError: If the input is empty or not valid (possibly truncated) JSON.
+    """
+    stream = io.StringIO(source) if isinstance(source, str) else source
+    js = _JsonStream(stream, chunk_size)
+    char = js.peek()
+    if not char:
+        raise ValueError("{} (empty input)".format(_PARSE_ERROR))
+    if char != "[":
+        yield from parse_input(try_parse_json(js.rest()))
+        return
+    js.advance()
+    yield from _iter_items(js)
+    # A snippet cut from a larger file may end with the comma that followed it
+    js.trailing_comma()
+    extra = js.rest().strip()
+    if extra:
+        raise ValueError("{}: unexpected data after the word list {!r}".format(_PARSE_ERROR, extra[:80]))
+
+
+def read_words(source: Union[str, TextIO], chunk_size: int = CHUNK_SIZE) -> WordArray:
+    """Read a JSON transcript straight into a columnar WordArray.
+
+    Args:
+        source: JSON text, or a text stream (an open file, sys.stdin).
+        chunk_size: Characters read from a stream at a time.
+
+    Raises:
+        ValueError: If the input is empty or not valid (possibly truncated) JSON.
+    """
+    words = WordArray()
+    for w in iter_words(source, chunk_size):
+        words.append(w.text, w.start, w.end, w.is_speaker_marker, w.is_segment_start)
+    return words
@@ -0,0 +1,287 @@
+"""Prefix-sum span index for O(1) caption span measurements.
+
+WHY: The segmentation DP evaluates every (i, j) word span inside the lookback
+window. Rebuilding and re-measuring the caption text for each candidate made
+every DP cell cost O(span length) in string work, which dominated conversion
+time on multi-hour broadcast files.
+
+HOW: SpanIndex walks the word list once and stores cumulative sums of text
+length, text-word count and speaker-marker count, plus flat start/end arrays.
+Any span's caption length, speaker flag and duration then follow from two
+array lookups. The non-marker word texts are joined once into a single
+string, so a span's caption text is one slice of it, built only for spans
+that pass the O(1) length checks. Each spoken word's boundary flags
+(wordflags.word_flags()) are computed once, so a span's or line's end word
+is looked up rather than re-parsed.
+
+RULES:
+- Span lengths match len() of the text segment_words() builds: non-marker
+  word texts joined by single spaces, plus 2 for the "– " speaker prefix.
+- Lengths are raw len(), not visible_len() — the same measure the DP uses
+  for its max_cue_chars check.
+- Forced breaks are speaker markers at index > 0; prev_break gives the
+  nearest one before any end index, so the legal start range is O(1).
+- Span length never decreases when a span is extended to the left, which
+  is what makes the two-pointer lookback in char_lookback() exact.
+- Flag lookups (end_flags(), line_breaks()) match the string helpers
+  only for plain spans (see plain()); callers check first.
+- A WordArray is read column by column (its start/end columns are shared,
+  not copied), so no Word objects are created for it.
+- Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
+"""
+
+from typing import List, Tuple, Union
+
+from .models import MARKER_FLAG, SEGMENT_START_FLAG, Word, WordArray
+from .wordflags import CLEAN, COMMA_END, END_WORD_FLAGS, SENTENCE_END, word_flags
+
+SPEAKER_PREFIX = "– "
+
+# End-word flags of the speaker prefix, the first word of a marked caption
+_PREFIX_FLAGS = word_flags(SPEAKER_PREFIX.strip()) & END_WORD_FLAGS
+
+
+def _is_plain_word(text: str) -> bool:
+    """True if text is one non-empty token with no tags or whitespace."""
+    return "<" not in text and text.split() == [text]
+
+
+class SpanIndex:
+    """Cumulative per-word measurements over a fixed word list.
+
+    Spans use half-open word indices: span (i, j) covers words[i:j].
+
+    Attributes:
+        words: The indexed word list or WordArray.
+        starts: Word start times, indexed by word.
+        ends: Word end times, indexed by word.
+        segment_starts: Word is_segment_start flags, indexed by word.
+        prev_break: For each end index j, the position of the last forced
+            break (speaker marker at index > 0) before j, or 0 if none.
+            A span ending at j may not start before prev_break[j].
+        word_flags: wordflags bits per word (0 for speaker markers).
+    """
+
+    __slots__ = ("words", "starts", "ends", "segment_starts", "prev_break",
+                 "word_flags", "_len_cum", "_text_cum", "_marker_cum",
+                 "_impure_cum", "_last_clean", "_blob")
+
+    def __init__(self, words: Union[List[Word], WordArray]) -> None:
+        n = len(words)
+        len_cum = [0] * (n + 1)
+        text_cum = [0] * (n + 1)
+        marker_cum = [0] * (n + 1)
+        impure_cum = [0] * (n + 1)
+        last_clean = [-1] * (n + 1)
+        prev_break = [0] * (n + 1)
+        flags = [0] * n
+
+        if isinstance(words, WordArray):
+            texts = words.iter_texts()
+            markers = [bool(f & MARKER_FLAG) for f in words.flags]
+            self.starts = words.starts
+            self.ends = words.ends
+            self.segment_starts = [bool(f & SEGMENT_START_FLAG) for f in words.flags]
+        else:
+            texts = (w.text for w in words)
+            markers = [w.is_speaker_marker for w in words]
+            self.starts = [w.start for w in words]
+            self.ends = [w.end for w in words]
+            self.segment_starts = [w.is_segment_start for w in words]
+
+        spoken = []  # type: List[str]
+        for k, text in enumerate(texts):
+            # A marker at k > 0 is a forced break for every span ending after it
+            is_marker = markers[k]
+            prev_break[k + 1] = k if (is_marker and k > 0) else prev_break[k]
+            if is_marker:
+                len_cum[k + 1] = len_cum[k]
+                text_cum[k + 1] = text_cum[k]
+                marker_cum[k + 1] = marker_cum[k] + 1
+                impure_cum[k + 1] = impure_cum[k]
+                last_clean[k + 1] = last_clean[k]
+            else:
+                spoken.append(text)
+                len_cum[k + 1] = len_cum[k] + len(text)
+                text_cum[k + 1] = text_cum[k] + 1
+                marker_cum[k + 1] = marker_cum[k]
+                impure_cum[k + 1] = impure_cum[k] + (not _is_plain_word(text))
+                flags[k] = word_flags(text)
+                last_clean[k + 1] = k if flags[k] & CLEAN else last_clean[k]
+
+        self.words = words
+        self.prev_break = prev_break
+        self.word_flags = flags
+        self._len_cum = len_cum
+        self._text_cum = text_cum
+        self._marker_cum = marker_cum
+        self._impure_cum = impure_cum
+        self._last_clean = last_clean
+        # Word k's text (if spoken) starts at len_cum[k] + text_cum[k]
+        self._blob = " ".join(spoken)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def append(self, word: Word) -> None:
+        """Extend the index (and its word list) by one word.
+
+        O(1) apart from extending the joined text, which is meant for the
+        short buffers of StreamingSegmenter.
+        """
+        k = len(self.words)
+        self.words.append(word)
+        self.starts.append(word.start)
+        self.ends.append(word.end)
+        self.segment_starts.append(word.is_segment_start)
+        self.prev_break.append(
+            k if (word.is_speaker_marker and k > 0) else self.prev_break[k]
+        )
+        if word.is_speaker_marker:
+            self._len_cum.append(self._len_cum[k])
+            self._text_cum.append(self._text_cum[k])
+            self._marker_cum.append(self._marker_cum[k] + 1)
+            self._impure_cum.append(self._impure_cum[k])
+            self.word_flags.append(0)
+            self._last_clean.append(self._last_clean[k])
+        else:
+            self._blob = self._blob + " " + word.text if self._text_cum[k] else word.text
+            self._len_cum.append(self._len_cum[k] + len(word.text))
+            self._text_cum.append(self._text_cum[k] + 1)
+            self._marker_cum.append(self._marker_cum[k])
+            self._impure_cum.append(self._impure_cum[k] + (not _is_plain_word(word.text)))
+            flags = word_flags(word.text)
+            self.word_flags.append(flags)
+            self._last_clean.append(k if flags & CLEAN else self._last_clean[k])
+
+    def is_marker(self, k: int) -> bool:
+        """True if word k is a speaker marker."""
+        return self._marker_cum[k + 1] > self._marker_cum[k]
+
+    def text_count(self, i: int, j: int) -> int:
+        """Number of non-marker words in span (i, j)."""
+        return self._text_cum[j] - self._text_cum[i]
+
+    def has_speaker(self, i: int, j: int) -> bool:
+        """True if span (i, j) contains a speaker marker."""
+        return self._marker_cum[j] > self._marker_cum[i]
+
+    def text_len(self, i: int, j: int) -> int:
+        """Length of the caption text for span (i, j), without building it."""
+        count = self._text_cum[j] - self._text_cum[i]
+        if count == 0:
+            return 0
+        length = self._len_cum[j] - self._len_cum[i] + count - 1
+        if self._marker_cum[j] > self._marker_cum[i]:
+            length += len(SPEAKER_PREFIX)
+        return length
+
+    def text(self, i: int, j: int) -> str:
+        """Build the caption text for span (i, j)."""
+        count = self._text_cum[j] - self._text_cum[i]
+        if count:
+            lo = self._len_cum[i] + self._text_cum[i]
+            seg_text = self._blob[lo:lo + self._len_cum[j] - self._len_cum[i] + count - 1]
+        else:
+            seg_text = ""
+        if self._marker_cum[j] > self._marker_cum[i]:
+            seg_text = SPEAKER_PREFIX + seg_text
+        return seg_text
+
+    def last_char(self, i: int, j: int) -> str:
+        """Last character of the caption text for span (i, j), "" if none."""
+        if self._text_cum[j] == self._text_cum[i]:
+            return ""
+        # The last spoken word before j ends just before this blob offset
+        return self._blob[self._len_cum[j] + self._text_cum[j] - 2]
+
+    def is_plain(self) -> bool:
+        """True if every spoken word is one non-empty, tag-free token.
+
+        Then a span's caption text is already whitespace-normalized and its
+        visible_len() equals text_len(), so the layout scorers measure
+        exactly the lengths this index reports.
+        """
+        return self._impure_cum[-1] == 0
+
+    def plain(self, i: int, j: int) -> bool:
+        """True if every spoken word of span (i, j) is one non-empty, tag-free token."""
+        return self._impure_cum[j] == self._impure_cum[i]
+
+    def end_flags(self, i: int, j: int) -> int:
+        """wordflags bits of plain span (i, j)'s caption text as a whole.
+
+        Matches last_word_clean(), ends_sentence() and ends_comma() on
+        text(i, j): WEAK_END and SHORT_END describe the last word with a
+        non-empty cleaned form (the speaker prefix if there is none), and
+        SENTENCE_END and COMMA_END the text's last character.
+        """
+        if self._text_cum[j] == self._text_cum[i]:
+            return 0
+        last = self._last_clean[j]
+        if last >= i:
+            flags = self.word_flags[last] & END_WORD_FLAGS
+        elif self._marker_cum[j] > self._marker_cum[i]:
+            flags = _PREFIX_FLAGS
+        else:
+            flags = 0
+        char = self.last_char(i, j)
+        if char in ".!?…":
+            flags |= SENTENCE_END
+        elif char in ",;:":
+            flags |= COMMA_END
+        return flags
+
+    def line_breaks(self, i: int, j: int) -> Tuple[List[int], List[int]]:
+        """First-line length and line-1 end flags for every break of plain span (i, j).
+
+        Entry k - 1 describes the break before word k of the caption text
+        (speaker prefix included), as two_line_split_scores() numbers them;
+        the flags are those end_flags() would give the first line.
+        """
+        lengths = []  # type: List[int]
+        flags = []  # type: List[int]
+        len_cum = self._len_cum
+        text_cum = self._text_cum
+        word_flags = self.word_flags
+        running = -1
+        end_word = 0
+        if self._marker_cum[j] > self._marker_cum[i]:
+            running = len(SPEAKER_PREFIX) - 1
+            end_word = _PREFIX_FLAGS
+            lengths.append(running)
+            flags.append(end_word)
+        for k in range(i, j):
+            if text_cum[k + 1] == text_cum[k]:
+                continue
+            running += len_cum[k + 1] - len_cum[k] + 1
+            word = word_flags[k]
+            if word & CLEAN:
+                end_word = word & END_WORD_FLAGS
+            lengths.append(running)
+            flags.append(end_word | (word & (SENTENCE_END | COMMA_END)))
+        if lengths:
+            # No break after the last word
+            lengths.pop()
+            flags.pop()
+        return lengths, flags
+
+    def duration(self, i: int, j: int) -> float:
+        """Time from the first word's start to the last word's end."""
+        return self.ends[j - 1] - self.starts[i]
+
+    def char_lookback(self, budget: int) -> List[int]:
+        """Smallest start index per end index whose span fits in budget chars.
+
+        Returns a list lo of length N + 1 where, for every j, span (i, j)
+        satisfies text_len(i, j) <= budget exactly when lo[j] <= i < j.
+        lo is non-decreasing, so a single two-pointer sweep computes it.
+        """
+        n = len(self.words)
+        lo = [0] * (n + 1)
+        i = 0
+        for j in range(1, n + 1):
+            while i < j and self.text_len(i, j) > budget:
+                i += 1
+            lo[j] = i
+        return lo
@@ -0,0 +1,120 @@
+"""Segmentation counters and stage timings for diagnosing slow caption runs.
+
+WHY: When captioning a file is slow, the output alone does not say why — a
+long lookback window, a flood of spans without a valid layout, a cold
+line-break cache, or the greedy fallback all look the same from outside.
+
+HOW: SegmentationStats is a plain counter object that callers pass to
+format_srt(), format_srt_multi() or segment_words(). The DP increments its
+counters as it scores spans and adds the wall time of each pipeline stage.
+Without a stats object the engine skips all bookkeeping.
+
+RULES:
+- Counters only ever accumulate; pass a fresh object per render, or read
+  the difference between two as_dict() snapshots.
+- spans_evaluated counts DP spans scored inside the lookback window; spans
+  beyond max_cue_chars are never visited, and spans_pruned counts those the
+  cost lower bound skipped before scoring. spans_beam_skipped counts those
+  the approximate "beam" strategy never looked at.
+- seams counts chunk seams joined by chunked segmentation
+  (segment_words_parallel(chunk_words=...)); seams_repaired those whose
+  chunk paths shared no caption boundary and were re-solved.
+- path_cost sums the DP cost of the chosen segmentation over partitions
+  (greedy fallback output has none), for comparing search strategies.
+- line_break_calls counts best_line_break() computations (DP and greedy);
+  layouts answered by a LineBreakCache count as line_break_cache_hits.
+- length_rejections counts scored spans whose text fits no layout within
+  the line limits.
+- as_dict() is JSON-serializable, for job metadata and logs.
+- Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Stage names used by the engine, in pipeline order
+STAGES = ("index", "segment", "greedy", "srt")
+
+
+class SegmentationStats:
+    """Counters and per-stage wall times collected during segmentation.
+
+    Attributes:
+        spans_evaluated: DP spans scored (empty spans included).
+        spans_pruned: DP spans skipped because their cost lower bound could
+            not beat the best path found so far.
+        empty_spans: Spans skipped because they hold only speaker markers.
+        line_break_calls: best_line_break() computations.
+        line_break_cache_hits: Layouts answered from a LineBreakCache.
+        length_rejections: Spans with no layout inside the line limits.
+        spans_beam_skipped: DP spans left outside the beam by the "beam"
+            strategy.
+        partitions: Forced-break partitions solved by the DP.
+        greedy_fallbacks: Times the DP found no path and greedy segmentation ran.
+        seams: Chunk seams joined by chunked segmentation.
+        seams_repaired: Seams re-solved because the chunk paths shared no
+            caption boundary near the anchor.
+        path_cost: Total DP cost of the chosen captions.
+        stage_times: Seconds spent per stage ("index", "segment", "greedy", "srt").
+    """
+
+    __slots__ = ("spans_evaluated", "spans_pruned", "empty_spans", "line_break_calls",
+                 "line_break_cache_hits", "length_rejections", "spans_beam_skipped",
+                 "partitions", "greedy_fallbacks", "seams", "seams_repaired", "path_cost",
+                 "stage_times")
+
+    def __init__(self) -> None:
+        self.spans_evaluated = 0
+        self.spans_pruned = 0
+        self.empty_spans = 0
+        self.line_break_calls = 0
+        self.line_break_cache_hits = 0
+        self.length_rejections = 0
+        self.spans_beam_skipped = 0
+        self.partitions = 0
+        self.greedy_fallbacks = 0
+        self.seams = 0
+        self.seams_repaired = 0
+        self.path_cost = 0.0
+        self.stage_times = {}  # type: Dict[str, float]
+
+    def __repr__(self) -> str:
+        return "SegmentationStats(spans_evaluated={}, line_break_calls={}, greedy_fallbacks={})".format(
+            self.spans_evaluated, self.line_break_calls, self.greedy_fallbacks)
+
+    @property
+    def pruning_ratio(self) -> float:
+        """Fraction of visited DP spans that pruning skipped."""
+        visited = self.spans_evaluated + self.spans_pruned
+        return self.spans_pruned / visited if visited else 0.0
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add wall time to a stage."""
+        self.stage_times[stage] = self.stage_times.get(stage, 0.0) + seconds
+
+    def merge(self, other: "SegmentationStats") -> None:
+        """Add another stats object's counters and times to this one."""
+        for name in self.__slots__[:-1]:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for stage, seconds in other.stage_times.items():
+            self.add_time(stage, seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters and stage times as a JSON-serializable dict."""
+        result = {name: getattr(self, name) for name in self.__slots__[:-1]}  # type: Dict[str, Any]
+        result["stage_times"] = dict(self.stage_times)
+        return result
+
+
+@contextmanager
+def timed(stats: Optional[SegmentationStats], stage: str) -> Iterator[None]:
+    """Add the wall time of the with-block to stats (no-op if stats is None)."""
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_time(stage, time.perf_counter() - start)
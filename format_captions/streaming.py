@@ -0,0 +1,277 @@
+"""Online caption segmentation with bounded latency.
+
+WHY: format_srt() needs the complete word list before it produces a single
+caption. Live feeds never have a complete list, and long files would benefit
+from delivering captions while the transcript is still being processed.
+
+HOW: StreamingSegmenter runs the same shortest-path DP as segment_words(),
+one word at a time, over a buffer of uncommitted words. After each word it
+looks at the frontier — every buffered position a future caption could
+start from — and follows their back-pointer chains. Once all chains meet at
+a common position (Viterbi-style convergence), every caption before it is
+final and is committed. Speaker markers are forced breaks, so everything
+before one is committed when it arrives. If the buffer grows longer than the
+latency budget without converging, the first caption of the best partial
+path is committed anyway and the DP restarts after it.
+
+RULES:
+- Uses the same presets, span costs and line breaking as segment_words().
+- Without latency-forced commits, the committed captions are exactly those
+  of segment_words() on the whole list, and the cues joined with "\n" are
+  exactly format_srt()'s output.
+- Latency-forced commits (and the rare spans with no valid layout, which
+  use greedy segmentation on the buffer rather than on the whole list) may
+  differ from batch output — that is the price of bounded latency.
+- A cue is emitted once the following caption is committed, since its end
+  time is clipped against the next start (see srt_cue()).
+- Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
+"""
+
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .compiled import CompiledConfig, resolve_config
+from .core import _greedy_segment, _span_cost, _span_segment, srt_cue
+from .models import Word
+from .spans import SpanIndex
+
+
+class StreamingSegmenter:
+    """Incremental caption segmenter that commits blocks as soon as they are final.
+
+    Usage:
+        segmenter = StreamingSegmenter(preset="broadcast")
+        for cue in segmenter.iter_cues(word_source):
+            send(cue)
+
+    Attributes:
+        config: The resolved CompiledConfig.
+        max_latency: Maximum buffered duration in seconds before a caption
+            is committed without convergence.
+    """
+
+    def __init__(
+        self,
+        preset: str = "broadcast",
+        config: Union[Dict, CompiledConfig, None] = None,
+        max_latency: Optional[float] = None,
+    ) -> None:
+        """Initialize the segmenter.
+
+        Args:
+            preset: Preset name ("broadcast", "social", "some").
+            config: Optional custom config dict. If provided, preset is ignored.
+            max_latency: Latency budget in seconds; None uses twice the
+                preset's max_cue_dur. math.inf disables forced commits.
+
+        Raises:
+            ValueError: If preset name is not recognized and no config is provided.
+        """
+        self.config = resolve_config(preset, config)
+
+        if max_latency is None:
+            max_latency = 2 * self.config.max_cue_dur
+        self.max_latency = max_latency
+
+        self._seen_words = 0
+        self._held = None  # type: Optional[Dict[str, Any]]
+        self._cue_index = 0
+        self._restart([])
+
+    @property
+    def pending_words(self) -> int:
+        """Number of buffered words not yet covered by a committed caption."""
+        return len(self._spans)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def push(self, word: Word) -> List[Dict[str, Any]]:
+        """Add one word and return the caption segments it made final."""
+        is_forced_break = word.is_speaker_marker and self._seen_words > 0
+        self._seen_words += 1
+
+        self._spans.append(word)
+        last = len(self._spans) - 1
+        if last > 0:
+            self._solve_end(last)
+
+        if is_forced_break:
+            # Every path passes through the marker: close the partition
+            committed = self._commit_through(last)
+            self._restart([word])
+            return committed
+
+        committed = self._commit_converged()
+        while (len(self._spans) > 1
+               and self._spans.ends[-1] - self._spans.starts[0] > self.max_latency):
+            forced = self._commit_first_of_best()
+            if not forced:
+                break
+            committed.extend(forced)
+        return committed
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """End the stream and return all remaining caption segments."""
+        if not len(self._spans):
+            return []
+        end = len(self._spans)
+        self._solve_end(end)
+        committed = self._commit_through(end)
+        self._restart([])
+        return committed
+
+    def iter_segments(self, words: Iterable[Word]) -> Iterator[Dict[str, Any]]:
+        """Yield caption segments for a word stream as they become final."""
+        for word in words:
+            for seg in self.push(word):
+                yield seg
+        for seg in self.flush():
+            yield seg
+
+    def iter_cues(self, words: Iterable[Word]) -> Iterator[str]:
+        """Yield SRT cue blocks for a word stream as they become final.
+
+        Joining the yielded cues with "\\n" gives a complete SRT file.
+        """
+        for seg in self.iter_segments(words):
+            if self._held is not None:
+                yield self._emit(seg["start"])
+            self._held = seg
+        if self._held is not None:
+            yield self._emit(None)
+            self._held = None
+
+    # ------------------------------------------------------------------
+    # DP over the buffer
+    # ------------------------------------------------------------------
+
+    def _restart(self, words: List[Word], base_cost: float = 0.0) -> None:
+        """Reset the buffer to words, with dp[0] = base_cost, and re-solve it."""
+        self._spans = SpanIndex(list(words))
+        self._dp = [base_cost]  # type: List[float]
+        self._back = [-1]  # type: List[int]
+        self._breaks = [None]  # type: List[Optional[int]]
+        self._lookback_ptr = 0
+        for j in range(1, len(words)):
+            self._solve_end(j)
+
+    def _lookback(self, j: int) -> int:
+        """Smallest buffer start whose span to j fits max_cue_chars (j increasing)."""
+        budget = self.config.max_cue_chars
+        i = self._lookback_ptr
+        while i < j and self._spans.text_len(i, j) > budget:
+            i += 1
+        self._lookback_ptr = i
+        return i
+
+    def _min_start(self, j: int) -> int:
+        return max(self._lookback(j), j - self.config.max_lookback_words)
+
+    def _solve_end(self, j: int) -> None:
+        """Compute dp[j]: best cost of captioning buffer[0:j].
+
+        Spans ending before the newest buffered word see it as the next word
+        for their boundary bonuses; spans ending at the buffer end (only
+        solved by flush()) are treated as ending the transcript.
+        """
+        dp = self._dp
+        best = math.inf
+        best_i = -1
+        best_break = None  # type: Optional[int]
+        for i in range(j - 1, self._min_start(j) - 1, -1):
+            if not math.isfinite(dp[i]):
+                continue
+            scored = _span_cost(self._spans, i, j, self.config)
+            if scored is None:
+                continue
+            cost, _, lb = scored
+            total = dp[i] + cost
+            if total < best:
+                best = total
+                best_i = i
+                best_break = lb["break_at"]
+        dp.append(best)
+        self._back.append(best_i)
+        self._breaks.append(best_break)
+
+    # ------------------------------------------------------------------
+    # Commit policies
+    # ------------------------------------------------------------------
+
+    def _chain(self, j: int) -> List[Dict[str, Any]]:
+        """Segments on the back-pointer path from buffer start to j."""
+        segments = []
+        while j > 0:
+            segments.append(_span_segment(self._spans, self._back[j], j, self._breaks[j]))
+            j = self._back[j]
+        segments.reverse()
+        return segments
+
+    def _frontier(self) -> List[int]:
+        """Reachable buffer positions a future caption could start from."""
+        end = len(self._spans)
+        return [
+            b for b in range(self._min_start(end), end)
+            if math.isfinite(self._dp[b])
+        ]
+
+    def _rebase(self, c: int) -> None:
+        """Drop buffer[0:c], keeping absolute costs so later choices match batch."""
+        words = self._spans.words[c:]
+        self._spans = SpanIndex(words)
+        self._dp = self._dp[c:]
+        self._back = [b - c if b >= c else -1 for b in self._back[c:]]
+        self._breaks = self._breaks[c:]
+        self._breaks[0] = None
+        self._lookback_ptr = max(0, self._lookback_ptr - c)
+
+    def _commit_through(self, j: int) -> List[Dict[str, Any]]:
+        """Commit buffer[0:j]; greedy if the DP found no path there."""
+        if math.isfinite(self._dp[j]):
+            return self._chain(j)
+        return _greedy_segment(self._spans.words[:j], self.config)
+
+    def _commit_converged(self) -> List[Dict[str, Any]]:
+        """Commit every caption before the point all frontier paths share."""
+        frontier = self._frontier()
+        if not frontier:
+            # No reachable start for any future caption: no DP path can
+            # continue through the buffer, so hand all but the newest word
+            # to the greedy fallback and restart from it.
+            end = len(self._spans) - 1
+            committed = _greedy_segment(self._spans.words[:end], self.config)
+            self._restart(self._spans.words[end:])
+            return committed
+
+        positions = set(frontier)
+        while len(positions) > 1:
+            latest = max(positions)
+            positions.discard(latest)
+            positions.add(self._back[latest])
+        c = positions.pop()
+        if c <= 0:
+            return []
+
+        committed = self._chain(c)
+        self._rebase(c)
+        return committed
+
+    def _commit_first_of_best(self) -> List[Dict[str, Any]]:
+        """Commit the first caption of the cheapest-per-word partial path."""
+        frontier = [b for b in self._frontier() if b > 0]
+        if not frontier:
+            return []
+        base = self._dp[0]
+        best = min(frontier, key=lambda b: (self._dp[b] - base) / b)
+        first = best
+        while self._back[first] > 0:
+            first = self._back[first]
+        committed = [_span_segment(self._spans, self._back[first], first, self._breaks[first])]
+        self._restart(self._spans.words[first:])
+        return committed
+
+    def _emit(self, next_start: Optional[float]) -> str:
+        self._cue_index += 1
+        return srt_cue(self._cue_index, self._held, next_start, self.config)
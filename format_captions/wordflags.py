@@ -0,0 +1,75 @@
+"""Per-word boundary flags for the caption scorers.
+
+WHY: Every candidate line end and caption end is judged by its last word:
+is it a weak word, a very short word, does it end a sentence or a clause.
+last_word_clean(), ends_sentence() and ends_comma() answer that by
+stripping tags and punctuation from a freshly joined string with regexes,
+once per candidate line and span — the same few thousand words re-parsed
+millions of times on a long transcript.
+
+HOW: word_flags() measures one word once and packs the answers into bits.
+SpanIndex stores the bits per word, so the scorers look a line or caption
+end up instead of re-parsing text.
+
+RULES:
+- Flags describe a single tag-free, whitespace-free word; the string
+  helpers in core stay the reference for anything else (tagged text).
+- WEAK_END and SHORT_END follow last_word_clean(): they describe the word's
+  cleaned (punctuation-stripped, lowercased) form, and CLEAN is set when
+  that form is non-empty — a word of only punctuation leaves the previous
+  word as the line's end word.
+- SENTENCE_END and COMMA_END follow ends_sentence() / ends_comma(): the
+  word's last character.
+- Python 3.9.6 compatible (no slots=True, no match/case, no X | Y unions).
+"""
+
+import re
+
+from .presets import WEAK_END_WORDS
+
+PUNCT_STRIP_RE = re.compile(r'^[""\'(]+|[.,!?…:;)\]""\']+$')
+
+# Flag bits
+CLEAN = 1
+WEAK_END = 2
+SHORT_END = 4
+SENTENCE_END = 8
+COMMA_END = 16
+
+# Bits that come from a word's cleaned form (carried to later line ends
+# past words without one)
+END_WORD_FLAGS = WEAK_END | SHORT_END
+
+
+def strip_punct(w: str) -> str:
+    """Remove leading/trailing punctuation from a word for clean comparison."""
+    return PUNCT_STRIP_RE.sub("", w)
+
+
+def clean_word(word: str) -> str:
+    """Lowercased, punctuation-stripped form of one word (see last_word_clean)."""
+    return strip_punct(word).lower()
+
+
+def end_word_flags(cleaned: str) -> int:
+    """CLEAN, WEAK_END and SHORT_END bits for a cleaned end word."""
+    if not cleaned:
+        return 0
+    flags = CLEAN
+    if cleaned in WEAK_END_WORDS:
+        flags |= WEAK_END
+    if len(cleaned) <= 2:
+        flags |= SHORT_END
+    return flags
+
+
+def word_flags(word: str) -> int:
+    """All flag bits of one tag-free, whitespace-free word."""
+    flags = end_word_flags(clean_word(word))
+    if word:
+        last = word[-1]
+        if last in ".!?…":
+            flags |= SENTENCE_END
+        elif last in ",;:":
+            flags |= COMMA_END
+    return flags
@@ -26,12 +26,16 @@ RULES:
 - Maximum 3 consecutive punctuation tokens merge onto one word.
 - The first word in the entire transcript gets is_segment_start=True.
 - Em-dash marker words inherit the timestamp of the following word.
+- columnar=True runs the same four steps in one pass straight into a
+  format_captions WordArray, without intermediate per-word objects; both
+  outputs describe identical words.
 - Python 3.9.6 compatible — no slots, no match/case, no X | Y unions.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from format_captions.models import Word as CaptionWord
+from format_captions.models import WordArray
 from soniox_converter.core.ir import AssembledWord, Transcript
 
 # Punctuation characters that merge onto the preceding word.
@@ -70,7 +74,10 @@ class _MergedWord:
         self.is_speaker_marker = is_speaker_marker
 
 
-def transcript_to_caption_words(transcript: Transcript) -> List[CaptionWord]:
+def transcript_to_caption_words(
+    transcript: Transcript,
+    columnar: bool = False,
+) -> Union[List[CaptionWord], WordArray]:
     """Convert a Transcript IR into a flat list of caption Word objects.
 
     WHY: The SRT caption formatter needs caption Words, not IR AssembledWords.
@@ -87,10 +94,16 @@ def transcript_to_caption_words(transcript: Transcript) -> List[CaptionWord]:
 
     Args:
         transcript: Complete Transcript IR with segments and speaker info.
+        columnar: Return a WordArray instead of a list of Word objects —
+            for long transcripts, where per-word objects dominate memory.
 
     Returns:
-        Flat list of format_captions.Word objects ready for format_srt().
+        Flat list of format_captions.Word objects (or a WordArray) ready
+        for format_srt().
     """
+    if columnar:
+        return _caption_word_array(transcript)
+
     # --- Step 0: Flatten all segments into a single word stream ---
     flat_words: List[AssembledWord] = []
     for segment in transcript.segments:
@@ -221,3 +234,63 @@ def _apply_segment_starts(merged: List[_MergedWord]) -> List[CaptionWord]:
         next_is_segment_start = mw.ends_sentence
 
     return result
+
+
+def _caption_word_array(transcript: Transcript) -> WordArray:
+    """Run all four adapter steps in one pass, writing into a WordArray.
+
+    A merged word is held in local variables until the next word proves it
+    complete (punctuation may still extend it), then emitted together with
+    any speaker marker in front of it.
+    """
+    result = WordArray()
+
+    # The merged word being built
+    text = ""
+    start = end = 0.0
+    speaker = None  # type: Optional[str]
+    ends_sentence = False
+    have_word = False
+    merge_count = 0
+
+    # State of the emitted stream
+    prev_speaker = None  # type: Optional[str]
+    emitted_any = False
+    next_is_segment_start = True
+
+    def emit() -> None:
+        nonlocal prev_speaker, emitted_any, next_is_segment_start
+        if emitted_any and speaker != prev_speaker and speaker is not None:
+            result.append("\u2013", start, start, True, False)
+        prev_speaker = speaker
+        emitted_any = True
+        result.append(text, start, end, False, next_is_segment_start)
+        next_is_segment_start = ends_sentence
+
+    for segment in transcript.segments:
+        for word in segment.words:
+            is_merge_punct = (
+                word.word_type == "punctuation" and word.text in _MERGE_PUNCTUATION
+            )
+            if is_merge_punct and have_word and merge_count < 3:
+                text += word.text
+                end = word.start_s + word.duration_s
+                if word.text in _SENTENCE_ENDING:
+                    ends_sentence = True
+                merge_count += 1
+            elif is_merge_punct and not have_word:
+                continue
+            else:
+                if have_word:
+                    emit()
+                merge_count = 0
+                text = word.text
+                start = word.start_s
+                end = word.start_s + word.duration_s
+                speaker = word.speaker
+                ends_sentence = False
+                have_word = True
+
+    if have_word:
+        emit()
+    return result
@@ -14,7 +14,8 @@ RULES:
 - Always clean up files and transcriptions after processing
 """
 
+from soniox_converter.api.cache import TokenCache
 from soniox_converter.api.client import SonioxClient
 from soniox_converter.api.models import SonioxToken, TranscriptionStatus
 
-__all__ = ["SonioxClient", "SonioxToken", "TranscriptionStatus"]
+__all__ = ["SonioxClient", "SonioxToken", "TokenCache", "TranscriptionStatus"]
@@ -0,0 +1,203 @@
+"""Content-addressed on-disk cache of fetched Soniox token arrays.
+
+WHY: Re-running a file with different output formats used to upload and
+transcribe it again — minutes of latency and a second Soniox bill for a
+token array we already had. The token array only depends on the audio
+and the transcription parameters, so it can be reused safely.
+
+HOW: cache_key() hashes the audio file content together with everything
+sent to POST /v1/transcriptions: model, language hints, diarization,
+language identification and the context object. TokenCache stores one
+gzip-compressed JSON file per key. A hit refreshes the file's mtime;
+after each store, the least recently used files are evicted until the
+cache fits its size budget.
+
+RULES:
+- Consult the cache before SonioxClient.upload_file(); store the tokens
+  right after fetch_transcript().
+- The cache never fails a job: unreadable or corrupt entries are misses
+  and are deleted, write errors are logged and ignored.
+- Writes go to a temporary file first and are renamed into place, so
+  concurrent readers never see a partial entry.
+- Defaults come from config: TOKEN_CACHE_DIR (SONIOX_CACHE_DIR) and
+  TOKEN_CACHE_MAX_MB (SONIOX_CACHE_MAX_MB).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from soniox_converter.api.client import _build_context
+from soniox_converter.api.models import SonioxToken
+from soniox_converter.config import TOKEN_CACHE_DIR, TOKEN_CACHE_MAX_MB
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored format or the key recipe changes.
+_CACHE_VERSION = 1
+
+_ENTRY_SUFFIX = ".json.gz"
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file's content, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(
+    audio_path: Path,
+    model: str,
+    language_hints: list[str] | None = None,
+    enable_diarization: bool = True,
+    enable_language_identification: bool = True,
+    script_text: str | None = None,
+    terms: list[str] | None = None,
+    general_context: list[dict] | None = None,
+) -> str:
+    """Build the cache key for one transcription request.
+
+    WHY: Two requests may share a token array only if Soniox would see the
+    same audio and the same parameters.
+
+    HOW: SHA-256 over the audio content hash and a canonical JSON dump of
+    the request parameters. The context is assembled the same way
+    SonioxClient.create_transcription() assembles it, so inputs that
+    produce the same request body produce the same key.
+
+    RULES:
+    - Arguments mirror SonioxClient.create_transcription()
+    - Renaming or moving the audio file keeps its key
+    """
+    params = {
+        "version": _CACHE_VERSION,
+        "audio_sha256": file_sha256(Path(audio_path)),
+        "model": model,
+        "language_hints": language_hints or [],
+        "enable_diarization": enable_diarization,
+        "enable_language_identification": enable_language_identification,
+        "context": _build_context(script_text, terms, general_context),
+    }
+    canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """Size-bounded LRU cache of token arrays, one compressed file per key.
+
+    WHY: CLI runs, API jobs and Slack requests for the same file and
+    settings should pay for one transcription, not one per run.
+
+    HOW: Entries are {key}.json.gz files in cache_dir. get() reads and
+    touches an entry; put() writes it and evicts by oldest mtime.
+
+    RULES:
+    - Use as: tokens = cache.get(key); ...; cache.put(key, tokens)
+    - max_bytes bounds the total size of all entries; an entry larger
+      than the whole budget is not stored
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir if cache_dir is not None else TOKEN_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else TOKEN_CACHE_MAX_MB * 1024 * 1024
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / (key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> list[SonioxToken] | None:
+        """Return the cached tokens for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            tokens = [SonioxToken.from_dict(t) for t in data["tokens"]]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Discarding unreadable token cache entry %s: %s", path.name, exc)
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return tokens
+
+    def put(self, key: str, tokens: list[SonioxToken]) -> None:
+        """Store tokens under key, then evict old entries to fit max_bytes."""
+        payload = {
+            "version": _CACHE_VERSION,
+            "tokens": [dataclasses.asdict(t) for t in tokens],
+        }
+        tmp_name = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_name, self._path(key))
+            tmp_name = None
+            self._evict()
+        except OSError as exc:
+            logger.warning("Could not write token cache entry %s: %s", key, exc)
+        finally:
+            if tmp_name is not None:
+                self._remove(Path(tmp_name))
+
+    def clear(self) -> None:
+        """Delete every cache entry."""
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def size_bytes(self) -> int:
+        """Total size of all cache entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        """(path, size, mtime) of every entry, least recently used first."""
+        entries = []
+        try:
+            paths = list(self.cache_dir.glob("*" + _ENTRY_SUFFIX))
+        except OSError:
+            return []
+        for path in paths:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        entries.sort(key=lambda e: e[2])
+        return entries
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
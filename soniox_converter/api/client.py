@@ -135,6 +135,11 @@ class SonioxClient:
         self._model = model or SONIOX_MODEL
         self._client: httpx.AsyncClient | None = None
 
+    @property
+    def model(self) -> str:
+        """Soniox model used for new transcriptions."""
+        return self._model
+
     async def __aenter__(self) -> SonioxClient:
         self._client = httpx.AsyncClient(
             base_url=self._base_url,
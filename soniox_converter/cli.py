@@ -21,6 +21,8 @@ RULES:
 - Output naming: {stem}{suffix}, numeric suffix for conflicts (-transcript-2.json)
 - Status output goes to stderr (not stdout)
 - Always cleans up Soniox file and transcription after processing
+- Token arrays are cached per audio content and settings (api/cache.py);
+  --no-cache bypasses the cache for one run
 - Python 3.9.6 compatible — no match/case, no X | Y unions, no slots=True
 """
 
@@ -32,17 +34,15 @@ import sys
 from pathlib import Path
 from typing import List, Optional
 
+from soniox_converter.api.cache import TokenCache, cache_key
 from soniox_converter.api.client import SonioxClient
+from soniox_converter.api.models import SonioxToken
 from soniox_converter.config import (
     DEFAULT_DIARIZATION,
     DEFAULT_PRIMARY_LANGUAGE,
     SONIOX_SUPPORTED_FORMATS,
 )
-from soniox_converter.core.assembler import (
-    assemble_tokens,
-    build_transcript,
-    filter_translation_tokens,
-)
+from soniox_converter.core.assembler import assemble_transcript
 from soniox_converter.core.context import (
     build_context,
     load_default_terms,
@@ -50,7 +50,7 @@ from soniox_converter.core.context import (
     load_terms,
     resolve_companion_files,
 )
-from soniox_converter.formatters import DEFAULT_FORMATTERS, FORMATTERS
+from soniox_converter.formatters import DEFAULT_FORMATTERS, FORMATTERS, run_formatters
 from soniox_converter.formatters.base import FormatterOutput
 
 
@@ -324,46 +324,54 @@ async def _run_pipeline(args: argparse.Namespace) -> None:
 
     try:
         async with SonioxClient() as client:
-            # Step 1: Upload
-            file_id = await client.upload_file(input_path, on_status=_status)
-
-            # Step 2: Create transcription
-            transcription_id = await client.create_transcription(
-                file_id=file_id,
-                language_hints=language_hints,
-                enable_diarization=args.diarization,
-                enable_language_identification=True,
-                script_text=script_text,
-                terms=terms,
-                on_status=_status,
-            )
-
-            # Step 3: Poll until complete
-            await client.poll_until_complete(transcription_id, on_status=_status)
-
-            # Step 4: Fetch transcript tokens
-            tokens = await client.fetch_transcript(transcription_id, on_status=_status)
-
-            # Step 5: Assemble tokens into words
+            # Step 0: Look for a cached token array for this audio + settings
+            cache = None if args.no_cache else TokenCache()
+            cache_entry = None  # type: Optional[str]
+            tokens = None  # type: Optional[List[SonioxToken]]
+            if cache is not None:
+                cache_entry = cache_key(
+                    input_path,
+                    model=client.model,
+                    language_hints=language_hints,
+                    enable_diarization=args.diarization,
+                    enable_language_identification=True,
+                    script_text=script_text,
+                    terms=terms,
+                )
+                tokens = cache.get(cache_entry)
+                if tokens is not None:
+                    _status("Using cached transcript ({} tokens)".format(len(tokens)))
+
+            if tokens is None:
+                # Step 1: Upload
+                file_id = await client.upload_file(input_path, on_status=_status)
+
+                # Step 2: Create transcription
+                transcription_id = await client.create_transcription(
+                    file_id=file_id,
+                    language_hints=language_hints,
+                    enable_diarization=args.diarization,
+                    enable_language_identification=True,
+                    script_text=script_text,
+                    terms=terms,
+                    on_status=_status,
+                )
+
+                # Step 3: Poll until complete
+                await client.poll_until_complete(transcription_id, on_status=_status)
+
+                # Step 4: Fetch transcript tokens
+                tokens = await client.fetch_transcript(transcription_id, on_status=_status)
+                if cache is not None and cache_entry is not None:
+                    cache.put(cache_entry, tokens)
+
+            # Step 5: Assemble tokens into the Transcript IR
             _status("Assembling tokens...")
-            token_dicts = [
-                {
-                    "text": t.text,
-                    "start_ms": t.start_ms,
-                    "end_ms": t.end_ms,
-                    "confidence": t.confidence,
-                    "speaker": t.speaker,
-                    "language": t.language,
-                    "translation_status": t.translation_status,
-                }
-                for t in tokens
-            ]
-            filtered = filter_translation_tokens(token_dicts)
-            words = assemble_tokens(filtered)
-            _status("  Assembled {} words".format(len(words)))
-
-            # Step 6: Build Transcript IR
-            transcript = build_transcript(words, input_path.name)
+            transcript = assemble_transcript(tokens, input_path.name)
+            _status("  Assembled {} words".format(
+                sum(len(seg.words) for seg in transcript.segments)))
+
+            # Step 6: Summarize the Transcript IR
             _status("  {} segments, {} speakers, primary language: {}".format(
                 len(transcript.segments),
                 len(transcript.speakers),
@@ -373,17 +381,15 @@ async def _run_pipeline(args: argparse.Namespace) -> None:
             # Step 7: Run formatters and save output
             _status("Formatting output...")
             saved_files: List[Path] = []
-            for key in format_keys:
-                formatter = FORMATTERS[key]()
-                _status("  Running {} formatter...".format(formatter.name))
-                outputs = formatter.format(transcript)
+            for outputs in run_formatters(transcript, format_keys, on_status=_status).values():
                 for output in outputs:
                     saved_path = _save_output(output, stem, output_dir)
                     saved_files.append(saved_path)
                     _status("  Saved: {}".format(saved_path.name))
 
-            # Step 8: Cleanup
-            await client.cleanup(transcription_id, file_id, on_status=_status)
+            # Step 8: Cleanup (nothing was uploaded on a cache hit)
+            if file_id and transcription_id:
+                await client.cleanup(transcription_id, file_id, on_status=_status)
 
             # Summary
             _status("")
@@ -430,6 +436,7 @@ def build_parser() -> argparse.ArgumentParser:
     - Optional: --language, --secondary-language, --diarization/--no-diarization
     - Optional: --formats (comma-separated), --output-dir
     - Optional: --script, --terms (repeatable), --default-terms
+    - Optional: --no-cache
     """
     parser = argparse.ArgumentParser(
         prog="soniox_converter",
@@ -497,6 +504,13 @@ def build_parser() -> argparse.ArgumentParser:
              "Defaults to 'default-terms.txt' in CWD if it exists.",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Transcribe again even if a cached transcript exists for this file "
+             "and these settings (the new result is not cached either).",
+    )
+
     return parser
 
 
@@ -91,6 +91,16 @@ DEFAULT_PRIMARY_LANGUAGE = os.getenv("DEFAULT_PRIMARY_LANGUAGE", "sv")
 DEFAULT_SECONDARY_LANGUAGE = os.getenv("DEFAULT_SECONDARY_LANGUAGE", "en")
 DEFAULT_DIARIZATION = os.getenv("DEFAULT_DIARIZATION", "true").lower() == "true"
 
+# ---------------------------------------------------------------------------
+# Token result cache (see api/cache.py)
+# ---------------------------------------------------------------------------
+
+TOKEN_CACHE_DIR = os.getenv(
+    "SONIOX_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "soniox-converter", "tokens"),
+)
+TOKEN_CACHE_MAX_MB = int(os.getenv("SONIOX_CACHE_MAX_MB", "1024"))
+
 
 def load_api_key() -> str:
     """Load the Soniox API key from the environment.
@@ -4,7 +4,8 @@ WHY: The core package contains the stable heart of the converter —
 the IR dataclasses and the token assembly logic. These are consumed
 by all formatters and must remain backward-compatible.
 
-HOW: ir.py defines the data structures, assembler.py builds them
+HOW: ir.py defines the data structures, columnar.py a column-wise
+variant of them for long transcripts, assembler.py builds them
 from flat Soniox token arrays, context.py handles companion file
 discovery and context parameter construction.
 
@@ -23,6 +23,14 @@ RULES:
 - EOS: word immediately before ".", "?", or "!" gets eos=True
 - Translation tokens (translation_status="translation") must be filtered
   before calling assemble_tokens
+- With NumPy installed, long token arrays take the vectorized path
+  (assemble_tokens_numpy); its output is identical to the token loop.
+- assemble_transcript() fuses filtering, assembly, EOS inference and
+  build_transcript into one pass over the tokens; the CLI, API and GUI
+  use it. The separate steps remain for callers that need the words.
+- IncrementalAssembler runs that pass over token chunks as they arrive,
+  emitting each word once no later token can change it; assemble_transcript
+  is one feed of all tokens.
 """
 
 from __future__ import annotations
@@ -30,10 +38,20 @@ from __future__ import annotations
 import re
 import uuid
 from collections import Counter
-from typing import Any, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
 
+try:
+    import numpy as _np
+except ImportError:  # optional: pip install soniox-converter[fast]
+    _np = None
+
+from soniox_converter.core.columnar import to_columnar
 from soniox_converter.core.ir import AssembledWord, Segment, SpeakerInfo, Transcript
 
+if TYPE_CHECKING:
+    # The api package pulls in httpx; the assembler only duck-types tokens.
+    from soniox_converter.api.models import SonioxToken
+
 
 # Regex matching tokens that consist entirely of punctuation characters.
 # These become standalone punctuation items in the IR.
@@ -42,6 +60,13 @@ _PUNCTUATION_RE = re.compile(r"^[.,!?;:…—–\-]+$")
 # Punctuation marks that signal end of sentence.
 _EOS_PUNCTUATION = frozenset({".", "?", "!"})
 
+# Characters of _PUNCTUATION_RE, for the vectorized punctuation mask.
+_PUNCTUATION_CHARS = ".,!?;:…—–-"
+
+# assemble_tokens() takes the NumPy path from this many tokens on; below
+# it, building the arrays costs more than the token loop.
+NUMPY_MIN_TOKENS = 256
+
 
 def filter_translation_tokens(tokens: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Remove translation tokens from the Soniox token array.
@@ -63,7 +88,10 @@ def filter_translation_tokens(tokens: list[dict[str, Any]]) -> list[dict[str, An
     ]
 
 
-def assemble_tokens(tokens: list[dict[str, Any]]) -> list[AssembledWord]:
+def assemble_tokens(
+    tokens: list[dict[str, Any]],
+    use_numpy: Optional[bool] = None,
+) -> list[AssembledWord]:
     """Assemble Soniox sub-word tokens into whole words.
 
     WHY: Soniox uses BPE tokenization, splitting words like "fantastic"
@@ -84,11 +112,19 @@ def assemble_tokens(tokens: list[dict[str, Any]]) -> list[AssembledWord]:
 
     Args:
         tokens: Flat list of Soniox token dicts from the async API response.
+        use_numpy: Force (True) or avoid (False) assemble_tokens_numpy();
+            by default it is used when NumPy is installed and there are at
+            least NUMPY_MIN_TOKENS tokens.
 
     Returns:
         List of AssembledWord objects with unified text, timing, confidence,
         speaker, and language fields ready for segmentation and formatting.
     """
+    if use_numpy is None:
+        use_numpy = _np is not None and len(tokens) >= NUMPY_MIN_TOKENS
+    if use_numpy:
+        return assemble_tokens_numpy(tokens)
+
     words: list[AssembledWord] = []
 
     # Accumulator for building multi-token words
@@ -161,6 +197,91 @@ def assemble_tokens(tokens: list[dict[str, Any]]) -> list[AssembledWord]:
     return words
 
 
+def assemble_tokens_numpy(tokens: list[dict[str, Any]]) -> list[AssembledWord]:
+    """Vectorized assemble_tokens(): same words, computed over token columns.
+
+    WHY: The token loop runs a regex match, a closure call and a list
+    append per token. On hour-long transcripts (100k+ tokens) that
+    dominates assembly; the arithmetic itself is trivial.
+
+    HOW: Loads each token field into a column once, then:
+    1. Punctuation mask: stripping _PUNCTUATION_CHARS leaves nothing.
+    2. Word starts: punctuation, a leading space, the token after
+       punctuation, or the first token. Consecutive start indices
+       delimit each word's token group.
+    3. Per group: start_ms of the first token, end_ms of the last, and
+       np.minimum.reduceat over confidences; text is the joined slice.
+    4. EOS: a running maximum of word indices gives, for each item, the
+       nearest word at or before it; shifted by one it names the word
+       before each sentence-ending punctuation mark.
+
+    RULES:
+    - Output equals assemble_tokens(tokens, use_numpy=False) exactly,
+      EOS flags included.
+    - Texts containing a newline are re-checked with _PUNCTUATION_RE,
+      whose "$" also matches before a trailing newline.
+    - Requires NumPy (the "fast" extra).
+    """
+    np = _np
+    if np is None:
+        raise ImportError("assemble_tokens_numpy requires NumPy: pip install soniox-converter[fast]")
+    if not tokens:
+        return []
+
+    texts = [t["text"] for t in tokens]
+    text_arr = np.array(texts, dtype=str)
+    start_ms = np.array([t["start_ms"] for t in tokens], dtype=np.float64)
+    end_ms = np.array([t["end_ms"] for t in tokens], dtype=np.float64)
+    confidence = np.array([t["confidence"] for t in tokens], dtype=np.float64)
+
+    # 1. Punctuation-only tokens
+    punct = (np.char.str_len(np.char.strip(text_arr, _PUNCTUATION_CHARS)) == 0) & (
+        np.char.str_len(text_arr) > 0
+    )
+    for k in np.flatnonzero(np.char.find(text_arr, "\n") >= 0).tolist():
+        punct[k] = _PUNCTUATION_RE.match(texts[k]) is not None
+
+    # 2. Word group boundaries
+    starts = punct | np.char.startswith(text_arr, " ")
+    starts[1:] |= punct[:-1]
+    starts[0] = True
+    first = np.flatnonzero(starts)
+    last = np.append(first[1:] - 1, len(tokens) - 1)
+
+    # 3. Per-group reductions
+    item_start = start_ms[first]
+    item_duration = ((end_ms[last] - item_start) / 1000.0).tolist()
+    item_conf = np.minimum.reduceat(confidence, first).tolist()
+    item_punct = punct[first]
+
+    # 4. EOS: the nearest word before each ".", "?" or "!"
+    n_items = len(first)
+    is_eos_punct = item_punct & np.isin(text_arr[first], list(_EOS_PUNCTUATION))
+    last_word = np.maximum.accumulate(np.where(item_punct, -1, np.arange(n_items)))
+    targets = last_word[np.flatnonzero(is_eos_punct[1:])]
+    eos = np.zeros(n_items, dtype=bool)
+    eos[targets[targets >= 0]] = True
+
+    # Word text: the first token without its leading space, plus the
+    # continuation tokens (punctuation tokens never start with a space)
+    first_list = first.tolist()
+    last_list = last.tolist()
+    item_text = [texts[lo].lstrip(" ") for lo in first_list]
+    for k in np.flatnonzero(last > first).tolist():
+        item_text[k] += "".join(texts[first_list[k] + 1:last_list[k] + 1])
+    first_tokens = [tokens[lo] for lo in first_list]
+
+    return [
+        AssembledWord(text, start_s, duration_s, conf,
+                      "punctuation" if is_punct else "word", is_eos,
+                      token.get("speaker"), token.get("language"))
+        for text, start_s, duration_s, conf, is_punct, is_eos, token in zip(
+            item_text, (item_start / 1000.0).tolist(), item_duration, item_conf,
+            item_punct.tolist(), eos.tolist(), first_tokens,
+        )
+    ]
+
+
 def _infer_eos(words: list[AssembledWord]) -> None:
     """Set eos=True on words immediately before sentence-ending punctuation.
 
@@ -226,6 +347,7 @@ def _build_segment(
 def build_transcript(
     words: List[AssembledWord],
     source_filename: str,
+    columnar: bool = False,
 ) -> Transcript:
     """Build a Transcript IR from assembled words.
 
@@ -246,6 +368,9 @@ def build_transcript(
     Args:
         words: Flat list of AssembledWord objects from the assembler.
         source_filename: Original audio/video filename for output naming.
+        columnar: Store the words in a WordTable with TableSegment index
+            ranges (see core.columnar) — for long transcripts, where
+            per-word objects dominate memory.
 
     Returns:
         Complete Transcript IR ready for formatters.
@@ -304,10 +429,342 @@ def build_transcript(
     last_word = words[-1]
     duration_s = last_word.start_s + last_word.duration_s
 
-    return Transcript(
+    transcript = Transcript(
         segments=segments,
         speakers=speaker_list,
         primary_language=primary_language,
         source_filename=source_filename,
         duration_s=duration_s,
     )
+    if columnar:
+        return to_columnar(transcript)
+    return transcript
+
+
+class _TranscriptBuilder:
+    """Cuts speaker segments and tallies languages as items arrive in order.
+
+    Produces the same segments, speakers and primary language as
+    build_transcript() on the full item list. Languages are counted per
+    segment; the transcript tally sums the segment tallies in order,
+    which keeps most_common()'s first-seen tie-break.
+    """
+
+    def __init__(self) -> None:
+        self.segments = []  # type: List[Segment]
+        self.speakers = []  # type: List[SpeakerInfo]
+        self._seen_speakers = set()  # type: set
+        self._closed_langs = []  # type: List[Counter]
+        self._seg_words = []  # type: List[AssembledWord]
+        self._seg_speaker = None  # type: Optional[str]
+        self._seg_langs = Counter()  # type: Counter
+        self._last_item = None  # type: Optional[AssembledWord]
+
+    def add(self, item: AssembledWord) -> None:
+        """Append one finalized item to the open segment."""
+        if (item.speaker != self._seg_speaker and item.word_type == "word") or not self._seg_words:
+            self.close()
+            self._open(item.speaker)
+        self._seg_words.append(item)
+        if item.language:
+            self._seg_langs[item.language] += 1
+        self._last_item = item
+
+    def close(self) -> None:
+        """Close the open segment, if any."""
+        if self._seg_words:
+            self.segments.append(self._segment())
+            self._closed_langs.append(self._seg_langs)
+            self._seg_words = []
+            self._seg_langs = Counter()
+
+    def transcript(self, source_filename: str, columnar: bool = False) -> Transcript:
+        """Transcript of all items added so far, the open segment included."""
+        segments = list(self.segments)
+        lang_counts = Counter()  # type: Counter
+        for counts in self._closed_langs:
+            lang_counts.update(counts)
+        if self._seg_words:
+            segments.append(self._segment(copy=True))
+            lang_counts.update(self._seg_langs)
+        last_item = self._last_item
+        transcript = Transcript(
+            segments=segments,
+            speakers=list(self.speakers),
+            primary_language=lang_counts.most_common(1)[0][0] if lang_counts else "",
+            source_filename=source_filename,
+            duration_s=last_item.start_s + last_item.duration_s if last_item is not None else 0.0,
+        )
+        if columnar:
+            return to_columnar(transcript)
+        return transcript
+
+    def _open(self, speaker: Optional[str]) -> None:
+        self._seg_speaker = speaker
+        if speaker is not None and speaker not in self._seen_speakers:
+            self._seen_speakers.add(speaker)
+            self.speakers.append(SpeakerInfo(
+                soniox_label=speaker,
+                display_name="Speaker {}".format(len(self.speakers) + 1),
+                uuid=str(uuid.uuid4()),
+            ))
+
+    def _segment(self, copy: bool = False) -> Segment:
+        first = self._seg_words[0]
+        last = self._last_item
+        return Segment(
+            speaker=self._seg_speaker,
+            language=self._seg_langs.most_common(1)[0][0] if self._seg_langs else "",
+            start_s=first.start_s,
+            duration_s=(last.start_s + last.duration_s) - first.start_s,
+            words=list(self._seg_words) if copy else self._seg_words,
+        )
+
+
+class IncrementalAssembler:
+    """Assembles Soniox tokens chunk by chunk, emitting only settled words.
+
+    WHY: assemble_tokens() needs the whole token array before it returns a
+    single word. Downloads and streaming JSON parses of long transcripts
+    deliver tokens piece by piece; formatters and caption streaming can
+    start on the words that can no longer change.
+
+    HOW: feed() runs the same per-token rules as assemble_tokens(), but
+    two things stay held back between chunks:
+    - the partial word — a later continuation token may extend it;
+    - the last completed word and the punctuation after it — a later
+      ".", "?" or "!" would still set its eos.
+    Both settle as soon as the next word begins. Settled items are
+    returned from feed() in order and added to the speaker segments.
+
+    RULES:
+    - feed() outputs concatenated with finish() equal
+      assemble_tokens(filter_translation_tokens(tokens)), for any chunking.
+    - transcript() after finish() equals build_transcript() on those words
+      apart from the random SpeakerInfo UUIDs; before finish() it covers
+      the settled items only.
+    - segments holds the closed speaker segments, speakers every speaker
+      seen so far; both only grow.
+    - Tokens may be SonioxToken objects or raw token dicts; translation
+      tokens are skipped.
+
+    Usage:
+        assembler = IncrementalAssembler()
+        for chunk in token_chunks:
+            send(assembler.feed(chunk))
+        send(assembler.finish())
+        transcript = assembler.transcript("episode.mp4")
+    """
+
+    def __init__(self) -> None:
+        self._builder = _TranscriptBuilder()
+        # Last completed word, and the punctuation items after it
+        self._held_word = None  # type: Optional[AssembledWord]
+        self._held_punct = []  # type: List[AssembledWord]
+        # Partial word: text, start_ms, end_ms, confidence, speaker, language
+        self._partial = None  # type: Optional[tuple]
+        self._finished = False
+
+    @property
+    def segments(self) -> List[Segment]:
+        """Closed speaker segments, in order."""
+        return self._builder.segments
+
+    @property
+    def speakers(self) -> List[SpeakerInfo]:
+        """Speakers of all settled items, in order of first appearance."""
+        return self._builder.speakers
+
+    def feed(self, tokens: Iterable[Union[SonioxToken, Dict[str, Any]]]) -> List[AssembledWord]:
+        """Add a chunk of tokens and return the items it settled.
+
+        Raises:
+            RuntimeError: If finish() has already been called.
+        """
+        settled = []  # type: List[AssembledWord]
+        self._push(tokens, settled)
+        return settled
+
+    def finish(self) -> List[AssembledWord]:
+        """End the token stream and return the remaining items."""
+        settled = []  # type: List[AssembledWord]
+        self._finish(settled)
+        return settled
+
+    def transcript(self, source_filename: str, columnar: bool = False) -> Transcript:
+        """Transcript IR of the settled items.
+
+        Args:
+            source_filename: Original audio/video filename for output naming.
+            columnar: Return the columnar IR, as in build_transcript().
+        """
+        return self._builder.transcript(source_filename, columnar)
+
+    def _push(
+        self,
+        tokens: Iterable[Union[SonioxToken, Dict[str, Any]]],
+        out: Optional[List[AssembledWord]],
+    ) -> None:
+        """feed() body; out=None skips collecting the settled items."""
+        if self._finished:
+            raise RuntimeError("IncrementalAssembler.feed() called after finish()")
+        add = self._builder.add
+        held_word = self._held_word
+        held_punct = self._held_punct
+        if self._partial is None:
+            cur_text = None  # type: Optional[str]
+            cur_start = cur_end = 0
+            cur_conf = 0.0
+            cur_speaker = cur_language = None  # type: Optional[str]
+        else:
+            cur_text, cur_start, cur_end, cur_conf, cur_speaker, cur_language = self._partial
+
+        for token in tokens:
+            if isinstance(token, dict):
+                if token.get("translation_status", "none") == "translation":
+                    continue
+                text = token["text"]
+                start_ms = token["start_ms"]
+                end_ms = token["end_ms"]
+                confidence = token["confidence"]
+                speaker = token.get("speaker")
+                language = token.get("language")
+            else:
+                if token.translation_status == "translation":
+                    continue
+                text = token.text
+                start_ms = token.start_ms
+                end_ms = token.end_ms
+                confidence = token.confidence
+                speaker = token.speaker
+                language = token.language
+
+            is_punct = _PUNCTUATION_RE.match(text) is not None
+            if cur_text is not None and (is_punct or text.startswith(" ")):
+                # The partial word is complete: settle what came before it
+                if held_word is not None:
+                    add(held_word)
+                    if out is not None:
+                        out.append(held_word)
+                    if held_punct:
+                        for item in held_punct:
+                            add(item)
+                        if out is not None:
+                            out.extend(held_punct)
+                        held_punct = []
+                held_word = AssembledWord(
+                    cur_text, cur_start / 1000.0, (cur_end - cur_start) / 1000.0,
+                    cur_conf, "word", False, cur_speaker, cur_language,
+                )
+                cur_text = None
+
+            if is_punct:
+                item = AssembledWord(
+                    text, start_ms / 1000.0, (end_ms - start_ms) / 1000.0,
+                    confidence, "punctuation", False, speaker, language,
+                )
+                if held_word is not None:
+                    # Still open: a sentence end sets the held word's eos
+                    if text in _EOS_PUNCTUATION:
+                        held_word.eos = True
+                    held_punct.append(item)
+                else:
+                    add(item)
+                    if out is not None:
+                        out.append(item)
+            elif cur_text is None:
+                # A new word begins: the held word can no longer change
+                if held_word is not None:
+                    add(held_word)
+                    if out is not None:
+                        out.append(held_word)
+                    if held_punct:
+                        for item in held_punct:
+                            add(item)
+                        if out is not None:
+                            out.extend(held_punct)
+                        held_punct = []
+                    held_word = None
+                cur_text = text.lstrip(" ")
+                cur_start = start_ms
+                cur_end = end_ms
+                cur_conf = confidence
+                cur_speaker = speaker
+                cur_language = language
+            else:
+                cur_text += text
+                cur_end = end_ms
+                if confidence < cur_conf:
+                    cur_conf = confidence
+
+        self._held_word = held_word
+        self._held_punct = held_punct
+        if cur_text is None:
+            self._partial = None
+        else:
+            self._partial = (cur_text, cur_start, cur_end, cur_conf, cur_speaker, cur_language)
+
+    def _finish(self, out: Optional[List[AssembledWord]]) -> None:
+        """finish() body; out=None skips collecting the settled items."""
+        if self._finished:
+            return
+        items = []  # type: List[AssembledWord]
+        if self._held_word is not None:
+            items.append(self._held_word)
+            items.extend(self._held_punct)
+        if self._partial is not None:
+            text, start_ms, end_ms, confidence, speaker, language = self._partial
+            items.append(AssembledWord(
+                text, start_ms / 1000.0, (end_ms - start_ms) / 1000.0,
+                confidence, "word", False, speaker, language,
+            ))
+        for item in items:
+            self._builder.add(item)
+        if out is not None:
+            out.extend(items)
+        self._held_word = None
+        self._held_punct = []
+        self._partial = None
+        self._builder.close()
+        self._finished = True
+
+
+def assemble_transcript(
+    tokens: Iterable[Union[SonioxToken, Dict[str, Any]]],
+    source_filename: str,
+    columnar: bool = False,
+) -> Transcript:
+    """Build a Transcript IR straight from Soniox tokens in one pass.
+
+    WHY: The step-by-step pipeline converts every SonioxToken back to a
+    dict, copies the list to drop translations, assembles words, scans
+    them again for EOS and once more for segments and language counts.
+    On long transcripts those copies and re-scans cost as much as the
+    assembly itself.
+
+    HOW: One IncrementalAssembler pass over all tokens. Each token either
+    extends the current word or completes it; a sentence-ending mark
+    sets eos on the last completed word while it is still held back.
+    Settled items go straight into the current speaker segment, updating
+    the segment and transcript language tallies as they land.
+
+    RULES:
+    - Output equals build_transcript(assemble_tokens(
+      filter_translation_tokens(dicts)), source_filename) apart from the
+      random SpeakerInfo UUIDs.
+    - tokens may be SonioxToken objects or raw token dicts, mixed freely,
+      and may be any iterable (e.g. a streaming JSON reader).
+    - Translation tokens are skipped, as in filter_translation_tokens().
+
+    Args:
+        tokens: Soniox tokens, as SonioxToken objects or API dicts.
+        source_filename: Original audio/video filename for output naming.
+        columnar: Return the columnar IR, as in build_transcript().
+
+    Returns:
+        Complete Transcript IR ready for formatters.
+    """
+    assembler = IncrementalAssembler()
+    assembler._push(tokens, None)
+    assembler._finish(None)
+    return assembler.transcript(source_filename, columnar)
@@ -0,0 +1,309 @@
+"""Columnar Transcript IR: words stored in typed arrays, segments as index ranges.
+
+WHY: The object IR holds one AssembledWord dataclass per word and
+punctuation mark, each with its own attribute dict, three floats, a text
+string and an empty tags list, plus speaker and language strings. A
+10-hour archive is millions of small objects for data that formatters
+only ever read front to back.
+
+HOW: WordTable keeps the AssembledWord fields column-wise:
+  starts / durations / confidences — array('d')
+  flags        — array('B'), PUNCTUATION_FLAG and EOS_FLAG bits
+  speakers     — array('H') codes into speaker_labels (0 is None)
+  languages    — array('H') codes into language_codes (0 is None)
+  text         — one UTF-8 bytearray with an array('q') of byte offsets
+  tags         — sparse {index: tags}; Soniox words never have any
+TableSegment replaces Segment with the table and a [lo, hi) word range.
+Its words attribute is a WordRange, a read-only sequence that builds
+AssembledWord views on access, so every formatter iterating
+segment.words works unchanged. to_columnar() converts an object
+Transcript; build_transcript(..., columnar=True) returns one directly.
+
+RULES:
+- Views are fresh AssembledWord copies: editing one does not change the
+  table. EOS inference runs before conversion, and formatters copy words
+  into their own structs before editing them.
+- Segment metadata (speaker, language, start_s, duration_s) is copied
+  from the object IR, so both IRs produce identical formatter output.
+- Columns are plain array.array buffers — numpy.frombuffer() wraps them
+  without copying.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Union, overload
+
+from soniox_converter.core.ir import AssembledWord, Segment, Transcript
+
+# WordTable flag bits
+PUNCTUATION_FLAG = 1
+EOS_FLAG = 2
+
+
+def _intern(codes: List[Optional[str]], index: Dict[Optional[str], int], value: Optional[str]) -> int:
+    """Code of value in codes, adding it on first sight."""
+    code = index.get(value)
+    if code is None:
+        code = len(codes)
+        codes.append(value)
+        index[value] = code
+    return code
+
+
+class WordTable:
+    """AssembledWord fields for a whole transcript, stored in parallel arrays.
+
+    Indexing returns a fresh AssembledWord view; slicing returns a
+    WordRange over the same table.
+
+    Attributes:
+        starts: Word start times in seconds.
+        durations: Word durations in seconds.
+        confidences: Word confidences (minimum over sub-word tokens).
+        flags: PUNCTUATION_FLAG and EOS_FLAG bits per word.
+        speakers: Codes into speaker_labels; 0 means no speaker.
+        languages: Codes into language_codes; 0 means no language.
+        speaker_labels: Interned speaker labels, [None, "1", "2", ...].
+        language_codes: Interned language codes, [None, "sv", ...].
+    """
+
+    __slots__ = (
+        "starts", "durations", "confidences", "flags", "speakers", "languages",
+        "speaker_labels", "language_codes", "_speaker_index", "_language_index",
+        "_offsets", "_text", "_tags",
+    )
+
+    def __init__(self) -> None:
+        self.starts = array("d")
+        self.durations = array("d")
+        self.confidences = array("d")
+        self.flags = array("B")
+        self.speakers = array("H")
+        self.languages = array("H")
+        self.speaker_labels = [None]  # type: List[Optional[str]]
+        self.language_codes = [None]  # type: List[Optional[str]]
+        self._speaker_index = {None: 0}  # type: Dict[Optional[str], int]
+        self._language_index = {None: 0}  # type: Dict[Optional[str], int]
+        self._offsets = array("q", [0])
+        self._text = bytearray()
+        self._tags = {}  # type: Dict[int, List[str]]
+
+    @classmethod
+    def from_words(cls, words: Iterable[AssembledWord]) -> "WordTable":
+        """Build a WordTable from AssembledWord objects."""
+        table = cls()
+        for w in words:
+            table.append(w.text, w.start_s, w.duration_s, w.confidence, w.word_type,
+                         w.eos, w.speaker, w.language, w.tags)
+        return table
+
+    def append(
+        self,
+        text: str,
+        start_s: float,
+        duration_s: float,
+        confidence: float,
+        word_type: str = "word",
+        eos: bool = False,
+        speaker: Optional[str] = None,
+        language: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> None:
+        """Append one word's fields."""
+        if tags:
+            self._tags[len(self.flags)] = list(tags)
+        self.starts.append(start_s)
+        self.durations.append(duration_s)
+        self.confidences.append(confidence)
+        self.flags.append(
+            (PUNCTUATION_FLAG if word_type == "punctuation" else 0)
+            | (EOS_FLAG if eos else 0)
+        )
+        self.speakers.append(_intern(self.speaker_labels, self._speaker_index, speaker))
+        self.languages.append(_intern(self.language_codes, self._language_index, language))
+        self._text += text.encode("utf-8")
+        self._offsets.append(len(self._text))
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    @overload
+    def __getitem__(self, index: int) -> AssembledWord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "WordRange": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> "Union[AssembledWord, WordRange]":
+        if isinstance(index, slice):
+            return WordRange(self, 0, len(self.flags))[index]
+        n = len(self.flags)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("WordTable index out of range")
+        flag = self.flags[index]
+        tags = self._tags.get(index)
+        return AssembledWord(
+            text=self.text(index),
+            start_s=self.starts[index],
+            duration_s=self.durations[index],
+            confidence=self.confidences[index],
+            word_type="punctuation" if flag & PUNCTUATION_FLAG else "word",
+            eos=bool(flag & EOS_FLAG),
+            speaker=self.speaker_labels[self.speakers[index]],
+            language=self.language_codes[self.languages[index]],
+            tags=list(tags) if tags else [],
+        )
+
+    def __iter__(self) -> Iterator[AssembledWord]:
+        for k in range(len(self.flags)):
+            yield self[k]
+
+    def text(self, k: int) -> str:
+        """Text of word k."""
+        return self._text[self._offsets[k]:self._offsets[k + 1]].decode("utf-8")
+
+    def speaker(self, k: int) -> Optional[str]:
+        """Speaker label of word k."""
+        return self.speaker_labels[self.speakers[k]]
+
+    def language(self, k: int) -> Optional[str]:
+        """Language code of word k."""
+        return self.language_codes[self.languages[k]]
+
+    def is_punctuation(self, k: int) -> bool:
+        return bool(self.flags[k] & PUNCTUATION_FLAG)
+
+    def is_eos(self, k: int) -> bool:
+        return bool(self.flags[k] & EOS_FLAG)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, in bytes."""
+        columns = (self.starts, self.durations, self.confidences, self.flags,
+                   self.speakers, self.languages, self._offsets)
+        return sum(col.buffer_info()[1] * col.itemsize for col in columns) + len(self._text)
+
+
+class WordRange(Sequence):
+    """Read-only view of words [lo, hi) of a WordTable."""
+
+    __slots__ = ("table", "lo", "hi")
+
+    def __init__(self, table: WordTable, lo: int, hi: int) -> None:
+        self.table = table
+        self.lo = lo
+        self.hi = hi
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            lo, hi, step = index.indices(self.hi - self.lo)
+            if step != 1:
+                return [self[k] for k in range(lo, hi, step)]
+            return WordRange(self.table, self.lo + lo, self.lo + max(lo, hi))
+        n = self.hi - self.lo
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("WordRange index out of range")
+        return self.table[self.lo + index]
+
+    def __iter__(self) -> Iterator[AssembledWord]:
+        table = self.table
+        for k in range(self.lo, self.hi):
+            yield table[k]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (WordRange, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return "WordRange({}:{})".format(self.lo, self.hi)
+
+
+class TableSegment:
+    """Segment whose words are an index range of a WordTable.
+
+    Attributes:
+        speaker: Soniox speaker label, or None.
+        language: Dominant language of the segment's words.
+        start_s: Start of the first word.
+        duration_s: From the first word's start to the last word's end.
+        table: The transcript's WordTable.
+        lo: Index of the segment's first word in table.
+        hi: One past the index of its last word.
+    """
+
+    __slots__ = ("speaker", "language", "start_s", "duration_s", "table", "lo", "hi")
+
+    def __init__(
+        self,
+        speaker: Optional[str],
+        language: str,
+        start_s: float,
+        duration_s: float,
+        table: WordTable,
+        lo: int,
+        hi: int,
+    ) -> None:
+        self.speaker = speaker
+        self.language = language
+        self.start_s = start_s
+        self.duration_s = duration_s
+        self.table = table
+        self.lo = lo
+        self.hi = hi
+
+    @property
+    def words(self) -> WordRange:
+        """The segment's words as AssembledWord views."""
+        return WordRange(self.table, self.lo, self.hi)
+
+    def to_segment(self) -> Segment:
+        """Materialize as an object IR Segment."""
+        return Segment(speaker=self.speaker, language=self.language, start_s=self.start_s,
+                       duration_s=self.duration_s, words=list(self.words))
+
+    def __repr__(self) -> str:
+        return "TableSegment(speaker={!r}, words={}:{})".format(self.speaker, self.lo, self.hi)
+
+
+def to_columnar(transcript: Transcript) -> Transcript:
+    """Return transcript with its segments' words moved into one WordTable.
+
+    Speakers, language and file metadata are shared with the input. The
+    input's AssembledWord objects can be freed once it is dropped.
+    """
+    table = WordTable()
+    segments = []  # type: List[TableSegment]
+    for seg in transcript.segments:
+        lo = len(table)
+        for w in seg.words:
+            table.append(w.text, w.start_s, w.duration_s, w.confidence, w.word_type,
+                         w.eos, w.speaker, w.language, w.tags)
+        segments.append(TableSegment(seg.speaker, seg.language, seg.start_s, seg.duration_s,
+                                     table, lo, len(table)))
+    return Transcript(
+        segments=segments,  # type: ignore[arg-type]
+        speakers=transcript.speakers,
+        primary_language=transcript.primary_language,
+        source_filename=transcript.source_filename,
+        duration_s=transcript.duration_s,
+    )
+
+
+def to_objects(transcript: Transcript) -> Transcript:
+    """Return transcript with TableSegments materialized as object Segments."""
+    return Transcript(
+        segments=[seg.to_segment() if isinstance(seg, TableSegment) else seg
+                  for seg in transcript.segments],
+        speakers=transcript.speakers,
+        primary_language=transcript.primary_language,
+        source_filename=transcript.source_filename,
+        duration_s=transcript.duration_s,
+    )
@@ -6,16 +6,19 @@ create the formatter class, import it here, add one line.
 
 HOW: FORMATTERS maps string keys to formatter *classes* (not instances).
 Callers instantiate as needed: ``formatter = FORMATTERS["premiere_pro"]()``.
+run_formatters() runs a job's selection of formatters on one transcript and
+renders the captions of all selected SRT formatters in a single pass.
 
 RULES:
 - Keys are snake_case identifiers (used in CLI flags, config, etc.)
 - Values are BaseFormatter subclasses (not instances)
 - Every formatter listed here must be importable without side effects
+- Pipelines (CLI, GUI, API) run formatters through run_formatters()
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
 
 from soniox_converter.formatters.kinetic_words import KineticWordsFormatter
 from soniox_converter.formatters.plain_text import PlainTextFormatter
@@ -24,10 +27,13 @@ from soniox_converter.formatters.srt_captions import (
     SRTBroadcastFormatter,
     SRTCaptionFormatter,
     SRTSocialFormatter,
+    CaptionPresetFormatter,
+    render_srt,
 )
 
 if TYPE_CHECKING:
-    from soniox_converter.formatters.base import BaseFormatter
+    from soniox_converter.core.ir import Transcript
+    from soniox_converter.formatters.base import BaseFormatter, FormatterOutput
 
 FORMATTERS: dict[str, type[BaseFormatter]] = {
     "premiere_pro": PremiereProFormatter,
@@ -48,3 +54,45 @@ DEFAULT_FORMATTERS = [
     "srt_broadcast",
     "srt_social",
 ]
+
+
+def run_formatters(
+    transcript: Transcript,
+    keys: Sequence[str],
+    on_status: Optional[Callable[[str], None]] = None,
+) -> Dict[str, List[FormatterOutput]]:
+    """Run the formatters named by keys on one transcript.
+
+    The caption presets of every selected SRT formatter are rendered in one
+    render_srt() call before any formatter runs, and each SRT formatter is
+    handed its share of that result.
+
+    Args:
+        transcript: The complete IR with segments, speakers, and metadata.
+        keys: FORMATTERS keys, in output order.
+        on_status: Optional callback for a progress line per formatter.
+
+    Returns:
+        Formatter key -> its outputs, in the order of keys.
+
+    Raises:
+        KeyError: If a key is not in FORMATTERS.
+    """
+    formatters = {key: FORMATTERS[key]() for key in keys}
+    presets = [
+        preset
+        for formatter in formatters.values()
+        if isinstance(formatter, CaptionPresetFormatter)
+        for preset in formatter.presets
+    ]
+    rendered = render_srt(transcript, presets) if presets else {}
+
+    results = {}  # type: Dict[str, List[FormatterOutput]]
+    for key, formatter in formatters.items():
+        if on_status is not None:
+            on_status("  Running {} formatter...".format(formatter.name))
+        if isinstance(formatter, CaptionPresetFormatter):
+            results[key] = formatter.format_rendered(rendered)
+        else:
+            results[key] = formatter.format(transcript)
+    return results
@@ -6,7 +6,8 @@ so the GUI, CLI, and API layers can work with any formatter generically.
 
 HOW: BaseFormatter is an ABC with two requirements — a ``name`` property
 and a ``format()`` method. FormatterOutput is a plain dataclass that
-bundles a file suffix with its content (string or bytes) and MIME type.
+bundles a file suffix with its content (string or bytes), MIME type, and
+optional diagnostic metadata.
 
 RULES:
 - Subclasses MUST implement ``name`` (human-readable) and ``format()``
@@ -14,12 +15,15 @@ RULES:
   multi-file formatters (e.g. Kinetic Word Reveal) return several
 - ``suffix`` starts with a hyphen, e.g. ``"-transcript.json"``
 - The caller is responsible for prepending the source filename stem
+- ``metadata`` is never written into the file; callers may attach it to
+  job records or logs
 """
 
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Dict
 
 from soniox_converter.core.ir import Transcript
 
@@ -34,11 +38,14 @@ class FormatterOutput:
         content: The file content as a string (JSON, SRT, plain text)
                  or bytes (future binary formats).
         media_type: MIME type for the content, e.g. ``"application/json"``.
+        metadata: JSON-serializable diagnostics about how the output was
+                  produced, e.g. caption segmentation stats. Empty by default.
     """
 
     suffix: str
     content: str | bytes
     media_type: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class BaseFormatter(ABC):
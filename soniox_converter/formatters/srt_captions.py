@@ -7,8 +7,14 @@ are the bridge between the converter's Transcript IR and the caption library.
 
 HOW: Uses the caption_adapter to convert the Transcript IR into caption Word
 objects (merging punctuation, injecting speaker em-dashes, flipping EOS to
-segment_start). SRTBroadcastFormatter and SRTSocialFormatter each call format_srt()
-with a specific preset, producing one SRT output file each.
+segment_start). render_srt() adapts a transcript once and renders any set of
+presets in one format_srt_multi() call. SRTBroadcastFormatter and
+SRTSocialFormatter each produce one preset's file; a job that runs several
+SRT formatters renders all their presets in one render_srt() call
+(formatters.run_formatters()) and hands each formatter its outputs through
+format_rendered(). Each output carries the caption engine's SegmentationStats
+for its preset in metadata["caption_stats"], so slow files can be diagnosed
+from job records.
 
 RULES:
 - SRTBroadcastFormatter produces {stem}-broadcast.srt (16:9, 2-line, 42 chars)
@@ -17,18 +23,94 @@ RULES:
 - Registered as "srt_broadcast", "srt_social", and "srt_captions" in FORMATTERS dict
 - Media type for all outputs: "application/x-subrip"
 - Never modifies the Transcript IR
+- No state is kept between calls; sharing work across formatters is the
+  caller's job (see run_formatters())
 - Python 3.9.6 compatible — no slots=True, no match/case, no X | Y unions
 """
 
-from typing import List
+from typing import Dict, List, Sequence
 
-from format_captions import format_srt
+from format_captions import SegmentationStats, format_srt_multi
 from soniox_converter.adapters.caption_adapter import transcript_to_caption_words
 from soniox_converter.core.ir import Transcript
 from soniox_converter.formatters.base import BaseFormatter, FormatterOutput
 
+_SUFFIXES = {
+    "broadcast": "-broadcast.srt",
+    "social": "-social.srt",
+}
 
-class _SRTFormatterBase(BaseFormatter):
+
+def render_srt(transcript: Transcript, presets: Sequence[str]) -> Dict[str, FormatterOutput]:
+    """Render the transcript's captions with several presets at once.
+
+    The transcript is adapted to caption Words once and every preset is
+    rendered by one format_srt_multi() call, which shares the span index
+    between presets.
+
+    Args:
+        transcript: The complete IR with segments, speakers, and metadata.
+        presets: Preset names ("broadcast", "social"); duplicates are ignored.
+
+    Returns:
+        Preset name -> its SRT FormatterOutput, in the order of presets.
+    """
+    presets = list(dict.fromkeys(presets))
+    stats = {}  # type: Dict[str, SegmentationStats]
+    srts = format_srt_multi(transcript_to_caption_words(transcript), presets, stats=stats)
+    return {
+        preset: FormatterOutput(
+            suffix=_SUFFIXES[preset],
+            content=srts[preset],
+            media_type="application/x-subrip",
+            metadata={"caption_stats": stats[preset].as_dict()},
+        )
+        for preset in presets
+    }
+
+
+class CaptionPresetFormatter(BaseFormatter):
+    """Formatter whose outputs are SRT files of fixed caption presets.
+
+    WHY: A job that selects several SRT formatters should segment its
+    transcript in one format_srt_multi() call instead of one per formatter.
+    Declaring the presets lets the caller render them all up front.
+
+    HOW: Subclasses set self.presets. format() renders just those presets;
+    format_rendered() picks them out of a render_srt() result that covers
+    every SRT formatter of the job.
+
+    RULES:
+    - Outputs follow the order of self.presets
+    - Abstract: do not register this base class in FORMATTERS
+    """
+
+    presets = []  # type: List[str]
+
+    def format(self, transcript: Transcript) -> List[FormatterOutput]:
+        """Convert the Transcript IR into one SRT file per preset in self.presets.
+
+        Args:
+            transcript: The complete IR with segments, speakers, and metadata.
+
+        Returns:
+            One SRT FormatterOutput per preset, in order.
+        """
+        return self.format_rendered(render_srt(transcript, self.presets))
+
+    def format_rendered(self, rendered: Dict[str, FormatterOutput]) -> List[FormatterOutput]:
+        """Return this formatter's outputs from a render_srt() result.
+
+        Args:
+            rendered: Preset name -> output; must cover self.presets.
+
+        Returns:
+            One SRT FormatterOutput per preset, in order.
+        """
+        return [rendered[preset] for preset in self.presets]
+
+
+class _SRTFormatterBase(CaptionPresetFormatter):
     """Base class for SRT formatters with preset selection.
 
     WHY: Both broadcast and social formatters follow the same pipeline
@@ -36,7 +118,7 @@ class _SRTFormatterBase(BaseFormatter):
     parameter and output filename suffix.
 
     HOW: Subclasses set self.preset in __init__, and this base class handles
-    the conversion and formatting logic.
+    the conversion and formatting logic (see CaptionPresetFormatter).
 
     RULES:
     - Subclasses must set self.preset to "broadcast" or "social"
@@ -51,31 +133,7 @@ class _SRTFormatterBase(BaseFormatter):
             preset: Either "broadcast" or "social" (matches format_srt presets)
         """
         self.preset = preset
-
-    def format(self, transcript: Transcript) -> List[FormatterOutput]:
-        """Convert the Transcript IR into a single SRT file using self.preset.
-
-        Args:
-            transcript: The complete IR with segments, speakers, and metadata.
-
-        Returns:
-            A single-element list containing the SRT output for this preset.
-        """
-        caption_words = transcript_to_caption_words(transcript)
-        srt_content = format_srt(caption_words, preset=self.preset)
-
-        suffix_map = {
-            "broadcast": "-broadcast.srt",
-            "social": "-social.srt",
-        }
-
-        return [
-            FormatterOutput(
-                suffix=suffix_map[self.preset],
-                content=srt_content,
-                media_type="application/x-subrip",
-            )
-        ]
+        self.presets = [preset]
 
 
 class SRTBroadcastFormatter(_SRTFormatterBase):
@@ -124,7 +182,7 @@ class SRTSocialFormatter(_SRTFormatterBase):
         return "SRT Social (9:16)"
 
 
-class SRTCaptionFormatter(BaseFormatter):
+class SRTCaptionFormatter(CaptionPresetFormatter):
     """DEPRECATED: Use SRTBroadcastFormatter or SRTSocialFormatter instead.
 
     Formatter that produces both broadcast and social SRT caption files.
@@ -134,8 +192,7 @@ class SRTCaptionFormatter(BaseFormatter):
     should use the individual formatters for finer control.
 
     HOW: Converts the Transcript IR to caption Words via the adapter,
-    then runs format_srt() with each preset. Each call produces a
-    complete SRT string.
+    then renders both presets in one format_srt_multi() call.
 
     RULES:
     - Returns a 2-element list: broadcast first, social second
@@ -145,33 +202,8 @@ class SRTCaptionFormatter(BaseFormatter):
     - Registered as "srt_captions" (deprecated) in the FORMATTERS dict
     """
 
+    presets = ["broadcast", "social"]
+
     @property
     def name(self) -> str:
         return "SRT Captions (deprecated)"
-
-    def format(self, transcript: Transcript) -> List[FormatterOutput]:
-        """Convert the Transcript IR into broadcast and social SRT files.
-
-        Args:
-            transcript: The complete IR with segments, speakers, and metadata.
-
-        Returns:
-            Two FormatterOutput objects: broadcast SRT and social SRT.
-        """
-        caption_words = transcript_to_caption_words(transcript)
-
-        broadcast_srt = format_srt(caption_words, preset="broadcast")
-        social_srt = format_srt(caption_words, preset="social")
-
-        return [
-            FormatterOutput(
-                suffix="-broadcast.srt",
-                content=broadcast_srt,
-                media_type="application/x-subrip",
-            ),
-            FormatterOutput(
-                suffix="-social.srt",
-                content=social_srt,
-                media_type="application/x-subrip",
-            ),
-        ]
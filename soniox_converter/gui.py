@@ -34,8 +34,6 @@ import sys
 import threading
 import time
 import tkinter as tk
-import uuid
-from collections import Counter
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 from typing import Any, Dict, List, Optional, Tuple
@@ -48,7 +46,7 @@ from soniox_converter.config import (
     SONIOX_SUPPORTED_FORMATS,
     load_api_key,
 )
-from soniox_converter.core.assembler import assemble_tokens, filter_translation_tokens
+from soniox_converter.core.assembler import assemble_transcript
 from soniox_converter.core.context import (
     build_context,
     load_default_terms,
@@ -56,13 +54,8 @@ from soniox_converter.core.context import (
     load_terms,
     resolve_companion_files,
 )
-from soniox_converter.core.ir import (
-    AssembledWord,
-    Segment,
-    SpeakerInfo,
-    Transcript,
-)
-from soniox_converter.formatters import FORMATTERS
+from soniox_converter.core.ir import Transcript
+from soniox_converter.formatters import run_formatters
 from soniox_converter.formatters.base import FormatterOutput
 
 # ---------------------------------------------------------------------------
@@ -117,106 +110,6 @@ _CANCELLED_MSG = "cancelled"
 # Pipeline helpers (reused from cli.py pattern)
 # ---------------------------------------------------------------------------
 
-def _build_transcript(
-    words: List[AssembledWord],
-    source_filename: str,
-) -> Transcript:
-    """Build a Transcript IR from assembled words.
-
-    WHY: The assembler produces a flat list of AssembledWord objects.
-    Formatters expect a Transcript with speaker-grouped segments,
-    speaker metadata, and language info.
-
-    HOW: Walks through words and creates a new Segment whenever the
-    speaker label changes. Collects unique speakers and assigns UUIDs.
-
-    RULES:
-    - New segment whenever speaker changes
-    - SpeakerInfo gets a UUID v4 and "Speaker N" display name
-    - Primary language is the most frequent language among words
-    """
-    if not words:
-        return Transcript(
-            segments=[],
-            speakers=[],
-            primary_language="",
-            source_filename=source_filename,
-            duration_s=0.0,
-        )
-
-    segments: List[Segment] = []
-    current_speaker: Optional[str] = words[0].speaker
-    current_words: List[AssembledWord] = [words[0]]
-
-    for word in words[1:]:
-        if word.speaker != current_speaker and word.word_type == "word":
-            segments.append(_build_segment(current_words, current_speaker))
-            current_words = [word]
-            current_speaker = word.speaker
-        else:
-            current_words.append(word)
-
-    if current_words:
-        segments.append(_build_segment(current_words, current_speaker))
-
-    seen_speakers: Dict[str, SpeakerInfo] = {}
-    speaker_list: List[SpeakerInfo] = []
-    speaker_index = 1
-    for seg in segments:
-        label = seg.speaker
-        if label is not None and label not in seen_speakers:
-            info = SpeakerInfo(
-                soniox_label=label,
-                display_name="Speaker {}".format(speaker_index),
-                uuid=str(uuid.uuid4()),
-            )
-            seen_speakers[label] = info
-            speaker_list.append(info)
-            speaker_index += 1
-
-    lang_counts: Counter = Counter()
-    for word in words:
-        if word.language:
-            lang_counts[word.language] += 1
-    primary_language = lang_counts.most_common(1)[0][0] if lang_counts else ""
-
-    last_word = words[-1]
-    duration_s = last_word.start_s + last_word.duration_s
-
-    return Transcript(
-        segments=segments,
-        speakers=speaker_list,
-        primary_language=primary_language,
-        source_filename=source_filename,
-        duration_s=duration_s,
-    )
-
-
-def _build_segment(
-    words: List[AssembledWord],
-    speaker: Optional[str],
-) -> Segment:
-    """Build a single Segment from a list of words."""
-    first = words[0]
-    last_w = words[-1]
-    start_s = first.start_s
-    duration_s = (last_w.start_s + last_w.duration_s) - start_s
-
-    lang_counts: Counter = Counter()
-    for w in words:
-        if w.language:
-            lang_counts[w.language] += 1
-    language = lang_counts.most_common(1)[0][0] if lang_counts else ""
-
-    return Segment(
-        speaker=speaker,
-        language=language,
-        start_s=start_s,
-        duration_s=duration_s,
-        words=list(words),
-    )
-
-
 def _resolve_output_path(stem: str, suffix: str, output_dir: Path) -> Path:
     """Resolve the output file path, adding numeric suffix on conflict."""
     base_path = output_dir / "{}{}".format(stem, suffix)
@@ -968,6 +861,7 @@ class TranscriberApp:
         terms_path: Optional[Path],
     ) -> None:
         """Async pipeline implementation."""
+        from soniox_converter.api.cache import TokenCache, cache_key
         from soniox_converter.api.client import SonioxClient
 
         def on_status(msg: str) -> None:
@@ -1044,54 +938,58 @@ class TranscriberApp:
 
         try:
             async with SonioxClient() as client:
-                # Upload
-                check_cancel()
-                file_id = await client.upload_file(input_path, on_status=on_status)
-
-                # Create transcription
-                check_cancel()
-                transcription_id = await client.create_transcription(
-                    file_id=file_id,
+                # Reuse the token array of an earlier identical run
+                # Hashing the audio and reading the entry are blocking file I/O
+                cache = TokenCache()
+                cache_entry = await asyncio.to_thread(
+                    cache_key,
+                    input_path,
+                    model=client.model,
                     language_hints=language_hints,
                     enable_diarization=diarization,
                     enable_language_identification=True,
                     script_text=script_text,
                     terms=final_terms,
-                    on_status=on_status,
-                )
-
-                # Poll until complete (check cancel periodically)
-                check_cancel()
-                await client.poll_until_complete(
-                    transcription_id, on_status=on_status
-                )
-
-                # Fetch transcript
-                check_cancel()
-                tokens = await client.fetch_transcript(
-                    transcription_id, on_status=on_status
                 )
+                tokens = await asyncio.to_thread(cache.get, cache_entry)
+                if tokens is not None:
+                    on_status("Using cached transcript ({} tokens)".format(len(tokens)))
+                else:
+                    # Upload
+                    check_cancel()
+                    file_id = await client.upload_file(input_path, on_status=on_status)
+
+                    # Create transcription
+                    check_cancel()
+                    transcription_id = await client.create_transcription(
+                        file_id=file_id,
+                        language_hints=language_hints,
+                        enable_diarization=diarization,
+                        enable_language_identification=True,
+                        script_text=script_text,
+                        terms=final_terms,
+                        on_status=on_status,
+                    )
+
+                    # Poll until complete (check cancel periodically)
+                    check_cancel()
+                    await client.poll_until_complete(
+                        transcription_id, on_status=on_status
+                    )
+
+                    # Fetch transcript
+                    check_cancel()
+                    tokens = await client.fetch_transcript(
+                        transcription_id, on_status=on_status
+                    )
+                    await asyncio.to_thread(cache.put, cache_entry, tokens)
 
                 # Assemble tokens
                 on_status("Assembling tokens...")
-                token_dicts = [
-                    {
-                        "text": t.text,
-                        "start_ms": t.start_ms,
-                        "end_ms": t.end_ms,
-                        "confidence": t.confidence,
-                        "speaker": t.speaker,
-                        "language": t.language,
-                        "translation_status": t.translation_status,
-                    }
-                    for t in tokens
-                ]
-                filtered = filter_translation_tokens(token_dicts)
-                words = assemble_tokens(filtered)
-                on_status("  Assembled {} words".format(len(words)))
-
-                # Build Transcript IR
-                transcript = _build_transcript(words, input_path.name)
+                transcript = assemble_transcript(tokens, input_path.name)
+                on_status("  Assembled {} words".format(
+                    sum(len(seg.words) for seg in transcript.segments)))
+
                 on_status("  {} segments, {} speakers, primary language: {}".format(
                     len(transcript.segments),
                     len(transcript.speakers),
@@ -1103,11 +1001,7 @@ class TranscriberApp:
                 on_status("Formatting output...")
                 saved_files: List[Path] = []
 
-                for key in format_keys:
-                    formatter = FORMATTERS[key]()
-                    on_status("  Running {} formatter...".format(formatter.name))
-                    outputs = formatter.format(transcript)
-
+                for outputs in run_formatters(transcript, format_keys, on_status=on_status).values():
                     for output in outputs:
                         path = _resolve_output_path(stem, output.suffix, output_dir)
                         if isinstance(output.content, bytes):
@@ -1117,8 +1011,9 @@ class TranscriberApp:
                         saved_files.append(path)
                         on_status("  Saved: {}".format(path.name))
 
-                # Cleanup
-                await client.cleanup(transcription_id, file_id, on_status=on_status)
+                # Cleanup (nothing was uploaded on a cache hit)
+                if file_id and transcription_id:
+                    await client.cleanup(transcription_id, file_id, on_status=on_status)
 
                 # Build transcript preview
                 preview = self._build_preview(transcript)
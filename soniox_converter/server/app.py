@@ -33,7 +33,7 @@ from fastapi.responses import Response
 
 from soniox_converter.config import DEFAULT_DIARIZATION, DEFAULT_PRIMARY_LANGUAGE, SONIOX_SUPPORTED_FORMATS
 from soniox_converter.core.context import build_context
-from soniox_converter.formatters import DEFAULT_FORMATTERS, FORMATTERS
+from soniox_converter.formatters import DEFAULT_FORMATTERS, FORMATTERS, run_formatters
 from soniox_converter.server.jobs import Job, JobStatus, JobStore
 from soniox_converter.server.models import (
     ErrorResponse,
@@ -105,6 +105,7 @@ def _job_to_response(job: Job) -> JobResponse:
         config=job.config,
         error=job.error,
         output_files=job.output_files if job.output_files else None,
+        metadata=job.metadata if job.metadata else None,
     )
 
 
@@ -137,13 +138,14 @@ async def _run_transcription_pipeline(job_id: str, store: JobStore) -> None:
     - Catches all exceptions and marks job as failed
     - Cleans up Soniox resources (file + transcription) in a finally block
     - Output files are saved to the job's output_dir
+    - Unless config["use_cache"] is False, a cached token array for the same
+      audio and settings skips upload and transcription (api/cache.py)
+    - Cache hashing, reads and writes run in a worker thread, never on the
+      event loop that serves other requests
     """
+    from soniox_converter.api.cache import TokenCache, cache_key
     from soniox_converter.api.client import SonioxClient
-    from soniox_converter.core.assembler import (
-        assemble_tokens,
-        build_transcript,
-        filter_translation_tokens,
-    )
+    from soniox_converter.core.assembler import assemble_transcript
 
     job = store.get_job(job_id)
     if job is None:
@@ -169,55 +171,59 @@ async def _run_transcription_pipeline(job_id: str, store: JobStore) -> None:
         enable_diarization = config.get("diarization", True)
 
         async with SonioxClient() as client:
-            # Upload
-            store.update_job(job_id, status=JobStatus.UPLOADING)
-            file_id = await client.upload_file(input_path)
-
-            # Create transcription (with optional context)
-            store.update_job(job_id, status=JobStatus.TRANSCRIBING)
-            transcription_id = await client.create_transcription(
-                file_id=file_id,
-                language_hints=language_hints,
-                enable_diarization=enable_diarization,
-                enable_language_identification=True,
-                script_text=config.get("script_text"),
-                terms=config.get("terms"),
-                general_context=config.get("general_context"),
-            )
+            # Reuse the token array of an earlier identical request
+            cache = TokenCache() if config.get("use_cache", True) else None
+            cache_entry = None  # type: Optional[str]
+            tokens = None
+            if cache is not None:
+                # Hashing the audio and reading the entry are blocking file I/O
+                cache_entry = await asyncio.to_thread(
+                    cache_key,
+                    input_path,
+                    model=client.model,
+                    language_hints=language_hints,
+                    enable_diarization=enable_diarization,
+                    enable_language_identification=True,
+                    script_text=config.get("script_text"),
+                    terms=config.get("terms"),
+                    general_context=config.get("general_context"),
+                )
+                tokens = await asyncio.to_thread(cache.get, cache_entry)
+
+            if tokens is None:
+                # Upload
+                store.update_job(job_id, status=JobStatus.UPLOADING)
+                file_id = await client.upload_file(input_path)
+
+                # Create transcription (with optional context)
+                store.update_job(job_id, status=JobStatus.TRANSCRIBING)
+                transcription_id = await client.create_transcription(
+                    file_id=file_id,
+                    language_hints=language_hints,
+                    enable_diarization=enable_diarization,
+                    enable_language_identification=True,
+                    script_text=config.get("script_text"),
+                    terms=config.get("terms"),
+                    general_context=config.get("general_context"),
+                )
 
-            # Poll until complete
-            await client.poll_until_complete(transcription_id)
+                # Poll until complete
+                await client.poll_until_complete(transcription_id)
 
-            # Fetch transcript
+                # Fetch transcript
+                tokens = await client.fetch_transcript(transcription_id)
+                if cache is not None and cache_entry is not None:
+                    await asyncio.to_thread(cache.put, cache_entry, tokens)
             store.update_job(job_id, status=JobStatus.CONVERTING)
-            tokens = await client.fetch_transcript(transcription_id)
-
-            # Assemble tokens into words
-            token_dicts = [
-                {
-                    "text": t.text,
-                    "start_ms": t.start_ms,
-                    "end_ms": t.end_ms,
-                    "confidence": t.confidence,
-                    "speaker": t.speaker,
-                    "language": t.language,
-                    "translation_status": t.translation_status,
-                }
-                for t in tokens
-            ]
-            filtered = filter_translation_tokens(token_dicts)
-            words = assemble_tokens(filtered)
-
-            # Build Transcript IR
-            transcript = build_transcript(words, job.filename)
+
+            # Assemble tokens into the Transcript IR
+            transcript = assemble_transcript(tokens, job.filename)
 
             # Run formatters and save output files
             output_filenames = []
-            for key in format_keys:
-                if key not in FORMATTERS:
-                    continue
-                formatter = FORMATTERS[key]()
-                outputs = formatter.format(transcript)
+            output_metadata = {}
+            known_keys = [key for key in format_keys if key in FORMATTERS]
+            for outputs in run_formatters(transcript, known_keys).values():
                 for output in outputs:
                     stem = Path(job.filename).stem
                     out_filename = "{}{}".format(stem, output.suffix)
@@ -227,15 +233,19 @@ async def _run_transcription_pipeline(job_id: str, store: JobStore) -> None:
                     else:
                         out_path.write_text(output.content, encoding="utf-8")
                     output_filenames.append(out_filename)
+                    if output.metadata:
+                        output_metadata[out_filename] = output.metadata
 
             store.update_job(
                 job_id,
                 status=JobStatus.COMPLETED,
                 output_files=output_filenames,
+                metadata=output_metadata,
             )
 
-            # Cleanup Soniox resources
-            await client.cleanup(transcription_id, file_id)
+            # Cleanup Soniox resources (nothing was uploaded on a cache hit)
+            if file_id and transcription_id:
+                await client.cleanup(transcription_id, file_id)
 
     except Exception as exc:
         logger.exception("Transcription pipeline failed for job %s", job_id)
@@ -333,6 +343,15 @@ async def create_transcription(
             )
         ),
     ] = None,
+    use_cache: Annotated[
+        bool,
+        Form(
+            description=(
+                "Reuse the transcript of an earlier job with the same audio and "
+                "settings instead of transcribing again. Set false to bypass the cache."
+            )
+        ),
+    ] = True,
 ) -> JobCreatedResponse:
     # Sanitize filename to prevent path traversal
     raw_filename = file.filename or "upload"
@@ -405,6 +424,7 @@ async def create_transcription(
         "script_text": script_text,
         "terms": terms_list,
         "general_context": general_list,
+        "use_cache": use_cache,
     }
 
     # Create job
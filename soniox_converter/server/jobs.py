@@ -89,6 +89,8 @@ class Job:
     - progress: optional progress info dict (e.g. {"stage": "transcribing", "pct": 45})
     - config: job configuration dict (formats, languages, etc.)
     - output_files: list of output filenames available for download
+    - metadata: diagnostics keyed by output filename (e.g. caption
+      segmentation stats from the SRT formatters), for investigating slow jobs
     """
 
     id: str
@@ -102,6 +104,7 @@ class Job:
     progress: Optional[Dict[str, Any]] = None
     config: Dict[str, Any] = field(default_factory=dict)
     output_files: List[str] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class JobStore:
@@ -120,7 +123,7 @@ class JobStore:
     - All public methods that mutate state acquire self._lock
     - create_job() generates a UUID, creates a temp dir, and stores the job
     - get_job() returns None for missing job IDs (no exceptions)
-    - update_job() sets status, error, progress, and/or output_files
+    - update_job() sets status, error, progress, output_files, and/or metadata
     - delete_job() removes the job and cleans up its temp directory
     - cleanup_expired() removes jobs past their TTL and their temp dirs
     """
@@ -217,6 +220,7 @@ class JobStore:
         error: Optional[str] = None,
         progress: Optional[Dict[str, Any]] = None,
         output_files: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
     ) -> Optional[Job]:
         """Update a job's mutable fields.
 
@@ -247,6 +251,8 @@ class JobStore:
                 job.progress = progress
             if output_files is not None:
                 job.output_files = output_files
+            if metadata is not None:
+                job.metadata = metadata
 
             job.updated_at = now
 
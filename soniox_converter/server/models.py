@@ -65,6 +65,7 @@ class TranscriptionConfig(BaseModel):
     - secondary_language is optional (for code-switching)
     - diarization defaults to True
     - output_formats defaults to soniox_converter.formatters.DEFAULT_FORMATTERS
+    - use_cache defaults to True (reuse cached transcripts)
     """
 
     primary_language: str = Field(
@@ -86,6 +87,13 @@ class TranscriptionConfig(BaseModel):
             "formatter set used by the app (see soniox_converter.formatters.DEFAULT_FORMATTERS)."
         ),
     )
+    use_cache: bool = Field(
+        default=True,
+        description=(
+            "Reuse the transcript of an earlier job with the same audio and "
+            "settings. Set false to transcribe again."
+        ),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -104,6 +112,8 @@ class JobResponse(BaseModel):
     - status reflects the current pipeline stage
     - error is only set when status is 'failed'
     - output_files is only populated when status is 'completed'
+    - metadata is only populated when status is 'completed' and a
+      formatter reported diagnostics (e.g. caption_stats for SRT files)
     """
 
     id: str = Field(description="Unique job identifier (UUID).")
@@ -119,6 +129,13 @@ class JobResponse(BaseModel):
         default=None,
         description="List of output filenames, only present when status is 'completed'.",
     )
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description=(
+            "Diagnostics keyed by output filename (e.g. caption segmentation "
+            "stats under 'caption_stats'), only present when status is 'completed'."
+        ),
+    )
 
     model_config = {"json_schema_extra": {
         "examples": [
@@ -141,6 +158,7 @@ class JobResponse(BaseModel):
                 },
                 "error": None,
                 "output_files": None,
+                "metadata": None,
             }
         ]
     }}
@@ -335,6 +335,25 @@ class TestGetTranscription:
         body = resp.json()
         assert body["status"] == "completed"
         assert body["output_files"] == ["test-transcript.json", "test-captions.srt"]
+        assert body["metadata"] is None
+
+    def test_get_completed_job_with_metadata(self, client):
+        """Output diagnostics recorded by the pipeline appear in the response."""
+        resp = client.post(
+            "/transcriptions",
+            files=[_make_audio_file()],
+        )
+        job_id = resp.json()["id"]
+        stats = {"caption_stats": {"spans_evaluated": 12, "greedy_fallbacks": 0}}
+        job_store.update_job(
+            job_id,
+            status=JobStatus.COMPLETED,
+            output_files=["test-broadcast.srt"],
+            metadata={"test-broadcast.srt": stats},
+        )
+
+        resp = client.get("/transcriptions/{}".format(job_id))
+        assert resp.json()["metadata"] == {"test-broadcast.srt": stats}
 
     def test_get_failed_job_with_error(self, client):
         """A failed job includes the error message."""
@@ -21,12 +21,21 @@ RULES:
 - Floating-point comparisons use pytest.approx with default tolerance.
 """
 
+import random
+
 import pytest
 
+from soniox_converter.api.models import SonioxToken
 from soniox_converter.core.assembler import (
+    IncrementalAssembler,
     assemble_tokens,
+    assemble_tokens_numpy,
+    assemble_transcript,
+    build_transcript,
     filter_translation_tokens,
 )
+from soniox_converter.core.columnar import TableSegment, WordTable, to_objects
+from soniox_converter.core.ir import AssembledWord
 
 
 class TestLeadingSpaceWordBoundary:
@@ -364,3 +373,235 @@ class TestFullVerifiedSample:
             assert w.word_type == wtype, "Word {}: type mismatch".format(i)
             assert w.eos == eos, "Word {}: eos mismatch".format(i)
             assert w.speaker == speaker, "Word {}: speaker mismatch".format(i)
+
+
+def _random_tokens(rnd, n):
+    """Random token array mixing words, sub-words and punctuation runs."""
+    pieces = [" hej", " då", "tastic", " fan", "s", ".", ",", "?", "!", "...", "–",
+              " -", "-", ".\n", "a.", " ", "", "Start"]
+    tokens = []
+    t = 0
+    for _ in range(n):
+        dur = rnd.randint(0, 400)
+        token = {"text": rnd.choice(pieces), "start_ms": t, "end_ms": t + dur,
+                 "confidence": round(rnd.uniform(0.1, 1.0), 3)}
+        if rnd.random() < 0.9:
+            token["speaker"] = rnd.choice(["1", "2"])
+        if rnd.random() < 0.9:
+            token["language"] = rnd.choice(["sv", "en"])
+        tokens.append(token)
+        t += dur + rnd.randint(0, 50)
+    return tokens
+
+
+class TestVectorizedAssembler:
+    """assemble_tokens_numpy() matches the token loop word for word."""
+
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_verified_sample(self, verified_sample_tokens):
+        expected = assemble_tokens(verified_sample_tokens, use_numpy=False)
+        assert assemble_tokens_numpy(verified_sample_tokens) == expected
+        assert assemble_tokens(verified_sample_tokens, use_numpy=True) == expected
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_token_arrays(self, seed):
+        rnd = random.Random(seed)
+        tokens = _random_tokens(rnd, rnd.randint(1, 300))
+        assert assemble_tokens_numpy(tokens) == assemble_tokens(tokens, use_numpy=False)
+
+    def test_edge_cases(self):
+        cases = [
+            [],
+            [{"text": ".", "start_ms": 0, "end_ms": 10, "confidence": 0.9}],
+            [{"text": "tastic", "start_ms": 0, "end_ms": 10, "confidence": 0.9},
+             {"text": "!", "start_ms": 10, "end_ms": 20, "confidence": 0.8},
+             {"text": "s", "start_ms": 20, "end_ms": 30, "confidence": 0.7},
+             {"text": "?", "start_ms": 30, "end_ms": 40, "confidence": 0.6}],
+            [{"text": "..\n\n", "start_ms": 0, "end_ms": 10, "confidence": 0.9},
+             {"text": ".\n", "start_ms": 10, "end_ms": 20, "confidence": 0.9}],
+        ]
+        for tokens in cases:
+            assert assemble_tokens_numpy(tokens) == assemble_tokens(tokens, use_numpy=False)
+
+
+class TestColumnarTranscript:
+    """The columnar IR stores the same words and segments as the object IR."""
+
+    def test_table_round_trips_words(self, verified_sample_tokens):
+        words = assemble_tokens(verified_sample_tokens)
+        table = WordTable.from_words(words)
+        assert len(table) == len(words)
+        assert list(table) == words
+        assert table[-1] == words[-1]
+        assert table.speaker_labels == [None, "1", "2"]
+        assert table.language_codes == [None, "en"]
+
+    def test_none_fields_and_tags(self):
+        words = [
+            AssembledWord(text="Hej", start_s=0.0, duration_s=0.2, confidence=0.9, word_type="word"),
+            AssembledWord(text="då", start_s=0.3, duration_s=0.2, confidence=0.8, word_type="word",
+                          eos=True, speaker="1", language="sv", tags=["x"]),
+        ]
+        table = WordTable.from_words(words)
+        assert table[0].speaker is None and table[0].language is None
+        assert table[0].tags == [] and table[1].tags == ["x"]
+        assert list(table) == words
+
+    def test_views_are_copies(self, verified_sample_tokens):
+        table = WordTable.from_words(assemble_tokens(verified_sample_tokens))
+        view = table[0]
+        view.text = "changed"
+        view.tags.append("x")
+        assert table[0].text == "How"
+        assert table[0].tags == []
+
+    def test_build_transcript_columnar(self, verified_sample_tokens):
+        words = assemble_tokens(verified_sample_tokens)
+        objects = build_transcript(words, "sample.mp4")
+        columnar = build_transcript(words, "sample.mp4", columnar=True)
+        assert all(isinstance(seg, TableSegment) for seg in columnar.segments)
+        assert [(seg.lo, seg.hi) for seg in columnar.segments] == [(0, 6), (6, 13)]
+        assert columnar.segments[1].words[0].text == "I"
+        assert columnar.segments[1].words[1:3] == objects.segments[1].words[1:3]
+        for seg, expected in zip(columnar.segments, objects.segments):
+            assert seg.to_segment() == expected
+        assert to_objects(columnar).segments == objects.segments
+        assert columnar.duration_s == objects.duration_s
+        assert columnar.primary_language == objects.primary_language
+
+    def test_empty_transcript(self):
+        transcript = build_transcript([], "empty.mp4", columnar=True)
+        assert transcript.segments == []
+
+
+class TestFusedTranscriptPipeline:
+    """assemble_transcript() matches the step-by-step pipeline."""
+
+    @staticmethod
+    def _expected(tokens):
+        return build_transcript(assemble_tokens(filter_translation_tokens(tokens), use_numpy=False),
+                                "sample.mp4")
+
+    @staticmethod
+    def _assert_same(got, expected):
+        assert got.segments == expected.segments
+        assert [(s.soniox_label, s.display_name) for s in got.speakers] == [
+            (s.soniox_label, s.display_name) for s in expected.speakers]
+        assert got.primary_language == expected.primary_language
+        assert got.duration_s == expected.duration_s
+        assert got.source_filename == expected.source_filename
+
+    def test_verified_sample(self, verified_sample_tokens):
+        expected = self._expected(verified_sample_tokens)
+        self._assert_same(assemble_transcript(verified_sample_tokens, "sample.mp4"), expected)
+        objects = [SonioxToken.from_dict(t) for t in verified_sample_tokens]
+        self._assert_same(assemble_transcript(objects, "sample.mp4"), expected)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_token_arrays(self, seed):
+        rnd = random.Random(seed)
+        tokens = _random_tokens(rnd, rnd.randint(1, 300))
+        for token in tokens:
+            if rnd.random() < 0.1:
+                token["translation_status"] = "translation"
+        expected = self._expected(tokens)
+        self._assert_same(assemble_transcript(tokens, "sample.mp4"), expected)
+        self._assert_same(assemble_transcript(iter(SonioxToken.from_dict(t) for t in tokens),
+                                              "sample.mp4"), expected)
+
+    def test_empty_and_translation_only(self):
+        translation = {"text": " hej", "start_ms": None, "end_ms": None, "confidence": 0.9,
+                       "translation_status": "translation"}
+        for tokens in ([], [translation]):
+            transcript = assemble_transcript(tokens, "empty.mp4")
+            assert transcript.segments == []
+            assert transcript.duration_s == 0.0
+
+    def test_columnar(self, verified_sample_tokens):
+        transcript = assemble_transcript(verified_sample_tokens, "sample.mp4", columnar=True)
+        assert all(isinstance(seg, TableSegment) for seg in transcript.segments)
+        assert to_objects(transcript).segments == self._expected(verified_sample_tokens).segments
+
+
+class TestIncrementalAssembler:
+    """Chunked assembly emits exactly the batch words, in order."""
+
+    @staticmethod
+    def _feed_chunks(tokens, cuts):
+        assembler = IncrementalAssembler()
+        emitted = []
+        lo = 0
+        for hi in cuts + [len(tokens)]:
+            emitted.extend(assembler.feed(tokens[lo:hi]))
+            lo = hi
+        emitted.extend(assembler.finish())
+        return assembler, emitted
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_chunkings_match_batch(self, seed):
+        rnd = random.Random(seed)
+        tokens = _random_tokens(rnd, rnd.randint(1, 200))
+        cuts = sorted(rnd.sample(range(len(tokens) + 1), min(len(tokens), rnd.randint(0, 20))))
+        assembler, emitted = self._feed_chunks(tokens, cuts)
+        assert emitted == assemble_tokens(tokens, use_numpy=False)
+        expected = build_transcript(emitted, "sample.mp4")
+        transcript = assembler.transcript("sample.mp4")
+        assert transcript.segments == expected.segments
+        assert transcript.primary_language == expected.primary_language
+        assert [s.soniox_label for s in assembler.speakers] == [
+            s.soniox_label for s in expected.speakers]
+
+    def test_one_token_at_a_time(self, verified_sample_tokens):
+        cuts = list(range(1, len(verified_sample_tokens)))
+        _, emitted = self._feed_chunks(verified_sample_tokens, cuts)
+        assert emitted == assemble_tokens(verified_sample_tokens, use_numpy=False)
+
+    def test_holds_partial_word_and_pending_eos(self):
+        assembler = IncrementalAssembler()
+        assert assembler.feed([
+            {"text": "Hej", "start_ms": 0, "end_ms": 100, "confidence": 0.9},
+            {"text": " fan", "start_ms": 100, "end_ms": 200, "confidence": 0.8},
+        ]) == [AssembledWord(text="Hej", start_s=0.0, duration_s=0.1, confidence=0.9,
+                             word_type="word")]
+        # "fan" is complete but a sentence end may still follow
+        assert assembler.feed([
+            {"text": "tastic", "start_ms": 200, "end_ms": 300, "confidence": 0.7},
+            {"text": ",", "start_ms": 300, "end_ms": 310, "confidence": 0.9},
+        ]) == []
+        assert assembler.feed([
+            {"text": ".", "start_ms": 310, "end_ms": 320, "confidence": 0.9},
+        ]) == []
+        settled = assembler.feed([
+            {"text": " Nu", "start_ms": 400, "end_ms": 500, "confidence": 0.9},
+        ])
+        assert [(w.text, w.eos) for w in settled] == [("fantastic", True), (",", False),
+                                                     (".", False)]
+        assert settled[0].confidence == 0.7
+        assert [w.text for w in assembler.finish()] == ["Nu"]
+
+    def test_segments_grow_with_speaker_changes(self):
+        assembler = IncrementalAssembler()
+        assembler.feed([
+            {"text": " Hej", "start_ms": 0, "end_ms": 100, "confidence": 0.9, "speaker": "1"},
+            {"text": " då", "start_ms": 100, "end_ms": 200, "confidence": 0.9, "speaker": "2"},
+        ])
+        assert assembler.segments == []
+        assert [s.soniox_label for s in assembler.speakers] == ["1"]
+        assembler.feed([
+            {"text": " ja", "start_ms": 200, "end_ms": 300, "confidence": 0.9, "speaker": "2"},
+        ])
+        assert [s.speaker for s in assembler.segments] == ["1"]
+        assert [s.soniox_label for s in assembler.speakers] == ["1", "2"]
+        assert [s.speaker for s in assembler.transcript("x.mp4").segments] == ["1", "2"]
+        assembler.finish()
+        assert [len(s.words) for s in assembler.segments] == [1, 2]
+
+    def test_feed_after_finish_raises(self):
+        assembler = IncrementalAssembler()
+        assembler.finish()
+        assert assembler.finish() == []
+        with pytest.raises(RuntimeError):
+            assembler.feed([])
@@ -0,0 +1,132 @@
+"""Tests for batch rendering in the caption CLI (format_captions.batch).
+
+WHY: Batch mode re-renders whole transcript archives and skips outputs that
+are up to date, so a wrong skip decision silently leaves stale captions.
+
+HOW: Small JSON transcripts are written to tmp_path, rendered with
+run_batch() and the CLI entry point, then modified (input bytes, preset
+fingerprint, deleted output) to check which outputs are re-rendered.
+
+RULES:
+- Outputs must equal format_srt() for the same words and preset.
+- Runs use jobs=1 except where the process pool itself is under test.
+"""
+
+import io
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from format_captions import batch, format_srt
+from format_captions.batch import collect_inputs, output_path, run_batch
+from format_captions.cli import batch_main
+from format_captions.core import parse_input
+
+_TEXTS = ["Hej", "och", "välkommen", "till", "programmet.", "Idag", "pratar", "vi", "om", "räntan."]
+
+
+def _write_transcript(path: Path, texts: List[str]) -> None:
+    words = [{"word": text, "start": k * 0.4, "end": k * 0.4 + 0.3} for k, text in enumerate(texts)]
+    path.write_text(json.dumps([{"words": words}]), encoding="utf-8")
+
+
+@pytest.fixture
+def archive(tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    _write_transcript(inputs / "a.json", _TEXTS)
+    _write_transcript(inputs / "b.json", _TEXTS[::-1])
+    return inputs
+
+
+def _run(paths, out_dir, presets=("broadcast", "social"), **kwargs):
+    return run_batch(paths, out_dir, presets, log=io.StringIO(), **kwargs)
+
+
+class TestCollectInputs:
+    def test_directory_and_glob(self, archive):
+        (archive / "notes.txt").write_text("x")
+        assert collect_inputs([str(archive)]) == [archive / "a.json", archive / "b.json"]
+        assert collect_inputs([str(archive / "b*.json"), str(archive / "b.json")]) == [archive / "b.json"]
+
+    def test_no_match_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            collect_inputs([str(tmp_path / "*.json")])
+
+
+class TestRunBatch:
+    def test_outputs_match_format_srt(self, archive, tmp_path):
+        out = tmp_path / "out"
+        summary = _run(collect_inputs([str(archive)]), out)
+        assert (summary.rendered, summary.outputs, summary.skipped) == (2, 4, 0)
+        words = parse_input(json.loads((archive / "a.json").read_text(encoding="utf-8")))
+        for preset in ("broadcast", "social"):
+            srt = output_path(archive / "a.json", out, preset).read_text(encoding="utf-8")
+            assert srt == format_srt(words, preset)
+
+    def test_skips_unchanged_and_rerenders_changed(self, archive, tmp_path):
+        out = tmp_path / "out"
+        inputs = collect_inputs([str(archive)])
+        _run(inputs, out)
+        assert _run(inputs, out).skipped == 2
+
+        _write_transcript(archive / "a.json", _TEXTS + ["Tack."])
+        output_path(archive / "b.json", out, "social").unlink()
+        summary = _run(inputs, out)
+        assert (summary.rendered, summary.outputs, summary.skipped) == (2, 3, 0)
+        assert _run(inputs, out, force=True).outputs == 4
+
+    def test_preset_change_rerenders(self, archive, tmp_path, monkeypatch):
+        out = tmp_path / "out"
+        inputs = collect_inputs([str(archive)])
+        _run(inputs, out)
+        fingerprint = batch.preset_fingerprint
+        monkeypatch.setattr(batch, "preset_fingerprint",
+                            lambda name: fingerprint(name) + ("x" if name == "social" else ""))
+        summary = _run(inputs, out)
+        assert (summary.rendered, summary.outputs) == (2, 2)
+
+    def test_failed_file_is_reported_and_retried(self, archive, tmp_path):
+        (archive / "c.json").write_text('[{"word": x}]', encoding="utf-8")
+        out = tmp_path / "out"
+        inputs = collect_inputs([str(archive)])
+        summary = _run(inputs, out)
+        assert (summary.rendered, summary.failed) == (2, 1)
+        assert summary.errors[0][0].endswith("c.json")
+        assert _run(inputs, out).failed == 1
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_malformed_word_does_not_abort_batch(self, archive, tmp_path, jobs):
+        (archive / "c.json").write_text(
+            json.dumps([{"words": [{"word": "Hej", "start": None, "end": 0.3}]}]), encoding="utf-8")
+        out = tmp_path / "out"
+        summary = _run(collect_inputs([str(archive)]), out, jobs=jobs)
+        assert (summary.rendered, summary.failed) == (2, 1)
+        assert summary.errors[0][0].endswith("c.json")
+        manifest = batch.load_manifest(out)
+        assert sorted(Path(key).name for key, entry in manifest.items() if entry["presets"]) == [
+            "a.json", "b.json"]
+
+    def test_duplicate_stems_raise(self, archive, tmp_path):
+        other = tmp_path / "other"
+        other.mkdir()
+        _write_transcript(other / "a.json", _TEXTS)
+        with pytest.raises(ValueError):
+            _run([archive / "a.json", other / "a.json"], tmp_path / "out")
+
+    def test_parallel_jobs(self, archive, tmp_path):
+        summary = _run(collect_inputs([str(archive)]), tmp_path / "out", jobs=2)
+        assert (summary.rendered, summary.outputs, summary.failed) == (2, 4, 0)
+
+
+class TestBatchCli:
+    def test_batch_main(self, archive, tmp_path, capsys):
+        out = tmp_path / "out"
+        assert batch_main([str(archive), "--out-dir", str(out), "--format", "broadcast,some"]) == 0
+        assert output_path(archive / "b.json", out, "some").exists()
+        assert "Rendered 2 files" in capsys.readouterr().err
+
+    def test_unknown_format(self, archive, tmp_path):
+        assert batch_main([str(archive), "--out-dir", str(tmp_path), "--format", "cinema"]) == 1
@@ -0,0 +1,969 @@
+"""Tests for the caption engine internals (format_captions core performance layers).
+
+WHY: The DP segmenter is optimised with precomputed indexes and caches. Every
+optimisation must leave the SRT output byte-identical, so these tests pin the
+output on the real tuning transcripts and check each helper layer against the
+naive string computation it replaces.
+
+HOW: Golden tests compare format_srt() output with the SRT files committed
+under fixtures/caption_tuning (broadcast and social baseline outputs). Unit
+tests exercise the helper structures directly on small synthetic word lists.
+
+RULES:
+- Golden SRTs are the committed tuning outputs — regenerate them only when a
+  preset change is intended.
+- Synthetic word lists are built with _make_words() for deterministic timing.
+"""
+
+import copy
+import io
+import json
+import math
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from format_captions import (
+    LineBreakCache,
+    SegmentationStats,
+    SpanFeatures,
+    StreamingSegmenter,
+    format_srt,
+    format_srt_multi,
+)
+from format_captions.compiled import CompiledConfig, compile_config, compiled_preset
+from format_captions.core import (
+    _pruning_exact,
+    _span_best_line_break,
+    _span_segment,
+    best_line_break,
+    last_word_clean,
+    parse_input,
+    try_parse_json,
+    _score_two_lines,
+    _span_cost,
+    _span_cost_lower_bound,
+    forced_partitions,
+    segment_words,
+    two_line_split_scores,
+    visible_len,
+)
+from format_captions.models import Word, WordArray
+from format_captions.parallel import _batch_partitions, segment_words_parallel, sentence_anchors
+from format_captions.presets import PRESETS
+from format_captions.reader import iter_words, read_words
+from format_captions.spans import SpanIndex
+from format_captions.wordflags import (
+    COMMA_END,
+    END_WORD_FLAGS,
+    SENTENCE_END,
+    end_word_flags,
+)
+from soniox_converter.adapters.caption_adapter import transcript_to_caption_words
+from soniox_converter.core.assembler import (
+    assemble_tokens,
+    build_transcript,
+    filter_translation_tokens,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "caption_tuning"
+FIXTURE_NAMES = [
+    "long_sentences",
+    "medium_sentences",
+    "mixed_complexity",
+    "short_sentences",
+    "weak_words_heavy",
+]
+GOLDEN_DIRS = {
+    "broadcast": FIXTURES / "output_broadcast" / "broadcast",
+    "social": FIXTURES / "output" / "baseline",
+}
+
+
+def _load_caption_words(name: str) -> List[Word]:
+    """Load a tuning transcript and convert it to caption Words."""
+    with open(FIXTURES / "real_transcripts" / "{}.json".format(name), encoding="utf-8") as f:
+        data = json.load(f)
+    words = assemble_tokens(filter_translation_tokens(data["tokens"]))
+    transcript = build_transcript(words, source_filename=name)
+    return transcript_to_caption_words(transcript)
+
+
+def _make_words(texts, start=0.0, gap=0.3):
+    """Create Word objects with sequential timing; dashes become speaker markers."""
+    words = []  # type: List[Word]
+    t = start
+    for i, text in enumerate(texts):
+        is_speaker = text in ("–", "-", "—")
+        words.append(Word(
+            text=text,
+            start=t,
+            end=t + gap,
+            is_speaker_marker=is_speaker,
+            is_segment_start=(i == 0 and not is_speaker),
+        ))
+        t += gap + 0.05
+    return words
+
+
+def _fixture_spans(config):
+    """Every caption text the DP can visit on the tuning transcripts."""
+    for name in FIXTURE_NAMES:
+        words = _load_caption_words(name)
+        spans = SpanIndex(words)
+        lookback = spans.char_lookback(config["max_cue_chars"])
+        for j in range(1, len(words) + 1):
+            for i in range(lookback[j], j):
+                if spans.text_count(i, j):
+                    yield spans.text(i, j), spans.starts[i], spans.ends[j - 1]
+
+
+def _naive_text(words: List[Word]) -> str:
+    """Caption text exactly as the original per-span loop built it."""
+    parts = [w.text for w in words if not w.is_speaker_marker]
+    text = " ".join(parts)
+    if any(w.is_speaker_marker for w in words):
+        text = "– " + text
+    return text
+
+
+class TestGoldenOutput:
+    """format_srt() output stays byte-identical on the tuning transcripts."""
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    @pytest.mark.parametrize("name", FIXTURE_NAMES)
+    def test_matches_committed_srt(self, name, preset):
+        expected = (GOLDEN_DIRS[preset] / "{}.srt".format(name)).read_text(encoding="utf-8")
+        assert format_srt(_load_caption_words(name), preset=preset) == expected
+
+
+class TestFormatSrtMulti:
+    """Multi-preset rendering matches one format_srt() call per preset."""
+
+    @pytest.mark.parametrize("name", FIXTURE_NAMES)
+    def test_matches_format_srt(self, name):
+        words = _load_caption_words(name)
+        srts = format_srt_multi(words, ["broadcast", "social", "some"])
+        assert list(srts) == ["broadcast", "social", "some"]
+        for preset, srt in srts.items():
+            assert srt == format_srt(words, preset=preset)
+
+    def test_empty_words(self):
+        assert format_srt_multi([]) == {"broadcast": "", "social": ""}
+
+    def test_unknown_preset_raises(self):
+        with pytest.raises(ValueError, match="Unknown preset"):
+            format_srt_multi(_make_words(["Hej"]), ["broadcast", "cinema"])
+
+
+class TestSegmentationStats:
+    """Instrumentation counts DP work without changing the output."""
+
+    def test_counts_match_uncached_dp(self):
+        words = _load_caption_words(FIXTURE_NAMES[0])
+        stats = SegmentationStats()
+        assert format_srt(words, preset="broadcast", stats=stats) == format_srt(words, preset="broadcast")
+        assert stats.spans_evaluated == (
+            stats.empty_spans + stats.line_break_calls + stats.line_break_cache_hits
+        )
+        assert stats.partitions == len(forced_partitions(SpanIndex(words)))
+        assert stats.greedy_fallbacks == 0
+        assert set(stats.stage_times) == {"index", "segment", "srt"}
+
+    def test_cache_hits_are_not_line_break_calls(self):
+        words = _load_caption_words(FIXTURE_NAMES[0])
+        cache = LineBreakCache()
+        segment_words(words, PRESETS["social"], cache)
+        stats = SegmentationStats()
+        segment_words(words, PRESETS["social"], cache, stats=stats)
+        assert stats.line_break_calls == 0
+        assert stats.line_break_cache_hits == cache.hits
+
+    def test_greedy_fallback_is_reported(self):
+        words = _make_words(["Hej", "x" * 50, "då"])
+        stats = SegmentationStats()
+        segment_words(words, PRESETS["broadcast"], stats=stats)
+        assert stats.greedy_fallbacks == 1
+        assert stats.length_rejections > 0
+        assert "greedy" in stats.stage_times
+
+    def test_multi_reports_per_preset(self):
+        words = _load_caption_words(FIXTURE_NAMES[0])
+        stats = {}
+        format_srt_multi(words, ["broadcast", "social"], stats=stats)
+        assert list(stats) == ["broadcast", "social"]
+        assert stats["broadcast"].spans_evaluated != stats["social"].spans_evaluated
+
+    def test_parallel_merges_worker_counters(self):
+        words = _speaker_dense_words(30)
+        serial = SegmentationStats()
+        parallel = SegmentationStats()
+        segment_words(words, PRESETS["broadcast"], stats=serial)
+        segment_words_parallel(words, PRESETS["broadcast"], max_workers=2, stats=parallel)
+        assert parallel.as_dict()["spans_evaluated"] == serial.spans_evaluated
+        assert parallel.partitions == serial.partitions
+
+    def test_as_dict_is_json_serializable(self):
+        stats = SegmentationStats()
+        stats.add_time("segment", 0.5)
+        stats.add_time("segment", 0.25)
+        assert json.loads(json.dumps(stats.as_dict()))["stage_times"] == {"segment": 0.75}
+
+
+class TestCompiledConfig:
+    """Compiled presets are read-only, cached, and score like their dicts."""
+
+    def test_flattens_limits_and_weights(self):
+        cfg = compiled_preset("social")
+        assert cfg.max_line_chars == PRESETS["social"]["max_line_chars"]
+        assert cfg.w_weak_end == PRESETS["social"]["weights"]["weak_end"]
+        assert cfg.preferred_max_chars == 25
+        assert not cfg.two_lines
+
+    def test_defaults_for_optional_keys(self):
+        cfg = compiled_preset("broadcast")
+        assert cfg.preferred_max_chars == cfg.max_line_chars
+        assert cfg.w_over_preferred_max == 0.0
+
+    def test_read_only(self):
+        cfg = compiled_preset("broadcast")
+        with pytest.raises(AttributeError):
+            cfg.max_line_chars = 10
+
+    def test_compile_is_cached_by_value(self):
+        config = copy.deepcopy(PRESETS["broadcast"])
+        compiled = compile_config(config)
+        assert compile_config(copy.deepcopy(config)) is compiled
+        assert compile_config(compiled) is compiled
+
+    def test_source_is_private_copy(self):
+        config = copy.deepcopy(PRESETS["broadcast"])
+        compiled = CompiledConfig(config)
+        config["weights"]["weak_end"] = 99.0
+        assert compiled.w_weak_end == PRESETS["broadcast"]["weights"]["weak_end"]
+
+    def test_pickle_round_trip(self):
+        cfg = compiled_preset("social")
+        assert pickle.loads(pickle.dumps(cfg)) == cfg
+
+    def test_missing_key_raises(self):
+        config = copy.deepcopy(PRESETS["broadcast"])
+        del config["max_cps"]
+        with pytest.raises(KeyError):
+            compile_config(config)
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_dict_and_compiled_give_same_srt(self, preset):
+        words = _load_caption_words("mixed_complexity")
+        assert format_srt(words, config=PRESETS[preset]) == format_srt(words, config=compiled_preset(preset))
+
+
+class TestSpanIndex:
+    """SpanIndex measurements match the naive string computation."""
+
+    TEXTS = ["Hej", "och", "–", "välkommen", "<i>till</i>", "–",
+             "programmet.", "Vi", "ses."]
+
+    def test_text_and_length_match_naive(self):
+        words = _make_words(self.TEXTS)
+        spans = SpanIndex(words)
+        for i in range(len(words)):
+            for j in range(i + 1, len(words) + 1):
+                if not spans.text_count(i, j):
+                    continue
+                expected = _naive_text(words[i:j])
+                assert spans.text(i, j) == expected
+                assert spans.text_len(i, j) == len(expected)
+                assert spans.has_speaker(i, j) == any(
+                    w.is_speaker_marker for w in words[i:j]
+                )
+
+    def test_marker_only_span_is_empty(self):
+        words = _make_words(["Hej", "–", "då"])
+        spans = SpanIndex(words)
+        assert spans.text_count(1, 2) == 0
+        assert spans.text_len(1, 2) == 0
+
+    def test_duration_uses_first_start_and_last_end(self):
+        words = _make_words(["a", "b", "c"], gap=0.5)
+        spans = SpanIndex(words)
+        assert spans.duration(0, 3) == pytest.approx(words[2].end - words[0].start)
+
+    @pytest.mark.parametrize("budget", [0, 3, 10, 25])
+    def test_char_lookback_is_exact(self, budget):
+        words = _make_words(self.TEXTS)
+        spans = SpanIndex(words)
+        lo = spans.char_lookback(budget)
+        for j in range(1, len(words) + 1):
+            fits = [i for i in range(j) if spans.text_len(i, j) <= budget]
+            expected = min(fits) if fits else j
+            assert lo[j] == expected
+
+    def test_prev_break_points_at_last_marker(self):
+        words = _make_words(["–", "Hej", "–", "då", "du", "–", "ja"])
+        spans = SpanIndex(words)
+        # The marker at index 0 is not a forced break
+        assert spans.prev_break[:3] == [0, 0, 0]
+        assert spans.prev_break[3:6] == [2, 2, 2]
+        assert spans.prev_break[6:] == [5, 5]
+
+
+class TestLineBreakCache:
+    """Memoized line breaking returns exactly what the uncached path does."""
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    @pytest.mark.parametrize("name", FIXTURE_NAMES)
+    def test_cached_segments_match_uncached(self, name, preset):
+        words = _load_caption_words(name)
+        config = PRESETS[preset]
+        cache = LineBreakCache()
+        assert segment_words(words, config, cache) == segment_words(words, config)
+        assert cache.misses > 0
+
+    def test_repeat_call_hits_cache(self):
+        words = _load_caption_words("medium_sentences")
+        cache = LineBreakCache()
+        first = format_srt(words, preset="broadcast", cache=cache)
+        misses = cache.misses
+        second = format_srt(words, preset="broadcast", cache=cache)
+        assert first == second
+        assert cache.misses == misses
+        assert cache.hits == misses
+
+    def test_other_config_does_not_hit(self):
+        words = _load_caption_words("medium_sentences")
+        cache = LineBreakCache()
+        format_srt(words, preset="broadcast", cache=cache)
+        format_srt(words, preset="social", cache=cache)
+        assert cache.hits == 0
+
+    def test_rebinding_clears_entries(self):
+        cache = LineBreakCache()
+        words = _make_words(["Hej", "och", "välkommen."])
+        format_srt(words, preset="broadcast", cache=cache)
+        assert len(cache) > 0
+        format_srt(list(words), preset="broadcast", cache=cache)
+        assert cache.hits == 0
+
+    def test_size_is_bounded(self):
+        words = _load_caption_words("long_sentences")
+        cache = LineBreakCache(maxsize=16)
+        uncached = format_srt(words, preset="broadcast")
+        assert format_srt(words, preset="broadcast", cache=cache) == uncached
+        assert len(cache) == 16
+        assert cache.info()["maxsize"] == 16
+
+    def test_invalid_maxsize_raises(self):
+        with pytest.raises(ValueError, match="maxsize"):
+            LineBreakCache(maxsize=0)
+
+    def test_greedy_fallback_reuses_dp_layouts(self):
+        # A word longer than max_cue_chars makes the DP fail and fall back
+        words = _make_words(["Hej", "och", "x" * 90, "då."])
+        cache = LineBreakCache()
+        config = PRESETS["broadcast"]
+        assert segment_words(words, config, cache) == segment_words(words, config)
+        assert cache.hits > 0
+
+
+class TestTwoLineSplitScores:
+    """Batch split scoring is bit-identical to _score_two_lines()."""
+
+    @staticmethod
+    def _expected(words, text, start, end, config):
+        scores = []
+        for k in range(1, len(words)):
+            line1 = " ".join(words[:k])
+            line2 = " ".join(words[k:])
+            if max(visible_len(line1), visible_len(line2)) > config["max_line_chars"]:
+                scores.append(float("inf"))
+            else:
+                scores.append(_score_two_lines(line1, line2, text, start, end, config))
+        return scores
+
+    def _check_parity(self, config, use_numpy):
+        checked = 0
+        for text, start, end in _fixture_spans(config):
+            words = text.split()
+            got = two_line_split_scores(words, text, start, end, config, use_numpy=use_numpy)
+            assert got == self._expected(words, text, start, end, config)
+            checked += len(got)
+        assert checked > 0
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_python_backend_parity(self, preset):
+        self._check_parity(PRESETS[preset], use_numpy=False)
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_numpy_backend_parity(self, preset):
+        pytest.importorskip("numpy")
+        self._check_parity(PRESETS[preset], use_numpy=True)
+
+    def test_tagged_text_uses_exact_scorer(self):
+        config = PRESETS["broadcast"]
+        text = "Det här är <i>kursiv text</i> och sedan <b>fet</b> text."
+        words = text.split()
+        got = two_line_split_scores(words, text, 0.0, 3.0, config)
+        assert got == self._expected(words, text, 0.0, 3.0, config)
+
+    def test_single_word_has_no_splits(self):
+        assert two_line_split_scores(["Hej."], "Hej.", 0.0, 1.0, PRESETS["broadcast"]) == []
+
+
+def _reference_end_flags(text: str) -> int:
+    """End flags of a caption text (or line) from the string helpers."""
+    flags = end_word_flags(last_word_clean(text)) & END_WORD_FLAGS
+    if text.endswith((".", "!", "?", "…")):
+        flags |= SENTENCE_END
+    elif text.endswith((",", ";", ":")):
+        flags |= COMMA_END
+    return flags
+
+
+class TestWordFlags:
+    """Per-word flags in SpanIndex match the string helpers they replace."""
+
+    TEXTS = ["–", "Jag", "och", "du,", "vi", "\"ses\"", "–", "i", "(morgon).",
+             "Okej", "...", "–", "nej!", "en", "–", "."]
+
+    def _plain_spans(self, words):
+        spans = SpanIndex(words)
+        for j in range(1, len(words) + 1):
+            for i in range(j):
+                if spans.text_count(i, j) and spans.plain(i, j):
+                    yield spans, i, j
+
+    def _check(self, words):
+        checked = 0
+        for spans, i, j in self._plain_spans(words):
+            text = spans.text(i, j)
+            assert spans.end_flags(i, j) == _reference_end_flags(text)
+            tokens = text.split()
+            lengths, flags = spans.line_breaks(i, j)
+            lines = [" ".join(tokens[:k]) for k in range(1, len(tokens))]
+            assert lengths == [len(line) for line in lines]
+            assert flags == [_reference_end_flags(line) for line in lines]
+            checked += 1
+        assert checked > 0
+
+    def test_synthetic_spans(self):
+        self._check(_make_words(self.TEXTS))
+
+    def test_fixture_spans(self):
+        self._check(_load_caption_words(FIXTURE_NAMES[0])[:300])
+
+    def test_tagged_words_are_not_plain(self):
+        spans = SpanIndex(_make_words(["Hej", "<i>du</i>", "där."]))
+        assert spans.plain(0, 1)
+        assert not spans.plain(0, 2)
+        assert spans.plain(2, 3)
+
+    def test_appended_words_match_bulk_index(self):
+        words = _make_words(self.TEXTS)
+        streamed = SpanIndex([])
+        for w in words:
+            streamed.append(w)
+        bulk = SpanIndex(words)
+        assert streamed.word_flags == bulk.word_flags
+        for spans, i, j in self._plain_spans(words):
+            assert streamed.end_flags(i, j) == spans.end_flags(i, j)
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_span_line_break_matches_best_line_break(self, preset):
+        config = compiled_preset(preset)
+        words = _load_caption_words(FIXTURE_NAMES[0])[:300] + _make_words(self.TEXTS)
+        for spans, i, j in self._plain_spans(words):
+            if spans.text_len(i, j) > config.max_cue_chars:
+                continue
+            text = spans.text(i, j)
+            start, end = spans.starts[i], spans.ends[j - 1]
+            assert (_span_best_line_break(spans, i, j, text, start, end, config)
+                    == best_line_break(text, start, end, config))
+
+
+class TestSpanSegment:
+    """Winning-path segments rebuilt from break_at match best_line_break()."""
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_matches_line_break_strings(self, preset):
+        config = compiled_preset(preset)
+        words = _load_caption_words(FIXTURE_NAMES[0])[:200] + _make_words(
+            ["–", "Det", "är", "<i>kursiv", "text</i>", "och", "mer  text."])
+        spans = SpanIndex(words)
+        checked = 0
+        for j in range(1, len(words) + 1):
+            for i in range(max(0, j - 12), j):
+                if not spans.text_count(i, j):
+                    continue
+                text = spans.text(i, j)
+                lb = best_line_break(text, spans.starts[i], spans.ends[j - 1], config)
+                if not lb["ok"]:
+                    continue
+                seg = _span_segment(spans, i, j, lb["break_at"])
+                assert (seg["text"], seg["formatted"], seg["lines"]) == (
+                    text, lb["formatted"], lb["lines"])
+                assert seg["has_speaker"] == spans.has_speaker(i, j)
+                checked += 1
+        assert checked > 0
+
+
+def _speaker_dense_words(n_turns: int) -> List[Word]:
+    """A panel-style word list with a speaker change every few words."""
+    phrases = [
+        ["Jag", "tycker", "att", "budgeten", "är", "bra."],
+        ["Nej,", "det", "håller", "jag", "inte", "med", "om."],
+        ["Vi", "måste", "prata", "om", "räntan", "och", "inflationen", "nu."],
+    ]
+    texts = []  # type: List[str]
+    for turn in range(n_turns):
+        if turn:
+            texts.append("–")
+        texts.extend(phrases[turn % len(phrases)])
+    return _make_words(texts)
+
+
+def _monologue_words(n_sentences: int) -> List[Word]:
+    """A one-speaker word list where every sentence starts a transcript segment."""
+    phrases = [
+        ["Jag", "tycker", "att", "budgeten", "är", "bra", "för", "hela", "landet."],
+        ["Men", "det", "håller", "inte", "alla", "med", "om,", "tyvärr."],
+        ["Vi", "måste", "prata", "om", "räntan", "och", "inflationen", "nu."],
+    ]
+    words = []  # type: List[Word]
+    for n in range(n_sentences):
+        start = words[-1].end + 0.4 if words else 0.0
+        words.extend(_make_words(phrases[n % len(phrases)], start=start))
+    return words
+
+
+def _random_panel_words(seed: int) -> List[Word]:
+    """A random panel word list: short turns, few distinct word lengths.
+
+    Repeated words and timings give many spans of (nearly) equal cost, so
+    the DP meets ties that only float rounding decides.
+    """
+    vocab = ["Jag", "tycker", "att", "budgeten", "är", "bra.", "Nej,", "det", "håller",
+             "inte", "med", "om.", "Vi", "måste", "prata", "räntan", "och", "inflationen",
+             "nu.", "ja", "regeringen", "kommer", "satsa", "mycket", "pengar?"]
+    rng = random.Random(seed)
+    texts = []  # type: List[str]
+    for _ in range(rng.randint(20, 120)):
+        texts.append("–" if texts and rng.random() < 0.08 else rng.choice(vocab))
+    words = []  # type: List[Word]
+    t = 0.0
+    for i, text in enumerate(texts):
+        dur = rng.choice([0.2, 0.3, 0.25])
+        words.append(Word(text=text, start=t, end=t + dur,
+                          is_speaker_marker=text == "–", is_segment_start=i == 0))
+        t += dur + rng.choice([0.05, 0.05, 0.6])
+    return words
+
+
+class TestParallelSegmentation:
+    """Partitioned and parallel segmentation match the serial DP."""
+
+    def test_partitions_cover_words_at_forced_breaks(self):
+        words = _make_words(["–", "Hej", "–", "då", "du", "–", "ja"])
+        assert forced_partitions(SpanIndex(words)) == [(0, 2), (2, 5), (5, 7)]
+
+    def test_no_markers_is_one_partition(self):
+        words = _make_words(["Hej", "och", "välkommen."])
+        assert forced_partitions(SpanIndex(words)) == [(0, 3)]
+
+    def test_batches_keep_partition_order(self):
+        parts = [(0, 3), (3, 5), (5, 9), (9, 10), (10, 16)]
+        batches = _batch_partitions(parts, 3)
+        assert [p for batch in batches for p in batch] == parts
+
+    def test_parallel_matches_serial_on_near_ties(self):
+        """Workers and the serial path agree exactly on tie-heavy input.
+
+        Seeds 141, 227 and 301 hold spans whose costs tie within float
+        rounding, which resolve differently unless every partition is
+        solved from the same starting cost in both paths.
+        """
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            for seed in list(range(40)) + [141, 227, 301]:
+                words = _random_panel_words(seed)
+                config = PRESETS["social" if seed % 2 else "broadcast"]
+                assert segment_words_parallel(words, config, max_workers=2, executor=pool) == (
+                    segment_words(words, config)), seed
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_parallel_matches_serial(self, preset):
+        words = _speaker_dense_words(40)
+        config = PRESETS[preset]
+        assert segment_words_parallel(words, config, max_workers=2) == segment_words(words, config)
+
+    def test_format_srt_workers_matches_serial(self):
+        words = _speaker_dense_words(25)
+        assert format_srt(words, preset="broadcast", workers=2) == format_srt(words, preset="broadcast")
+
+    def test_infeasible_partition_falls_back_like_serial(self):
+        words = _speaker_dense_words(6)
+        words.insert(3, Word("x" * 90, words[3].start, words[3].end))
+        config = PRESETS["broadcast"]
+        assert segment_words_parallel(words, config, max_workers=2) == segment_words(words, config)
+
+
+class TestChunkedSegmentation:
+    """Long monologues split at sentence anchors and stitched at seams."""
+
+    def test_anchors_follow_sentence_ends(self):
+        words = _monologue_words(60)
+        spans = SpanIndex(words)
+        anchors = sentence_anchors(spans, 0, len(words), 100, 16)
+        assert len(anchors) >= 3
+        for prev, k in zip([0] + anchors, anchors):
+            assert k - prev >= 100
+            assert words[k].is_segment_start and words[k - 1].text.endswith(".")
+        assert anchors[-1] < len(words) - 25
+
+    def test_no_chunking_matches_serial(self):
+        words = _monologue_words(40)
+        config = PRESETS["broadcast"]
+        assert segment_words_parallel(words, config, max_workers=1) == segment_words(words, config)
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_chunked_covers_words_in_order(self, preset):
+        words = _monologue_words(80)
+        stats = SegmentationStats()
+        segments = segment_words_parallel(words, PRESETS[preset], max_workers=1, stats=stats,
+                                          chunk_words=150, overlap_words=32)
+        assert stats.seams >= 3
+        assert " ".join(s["text"] for s in segments) == " ".join(w.text for w in words)
+        assert all(a["end"] <= b["start"] for a, b in zip(segments, segments[1:]))
+
+    def test_chunked_matches_exact_with_wide_overlap(self):
+        words = _monologue_words(80)
+        config = PRESETS["broadcast"]
+        chunked = segment_words_parallel(words, config, max_workers=1, chunk_words=200, overlap_words=64)
+        assert chunked == segment_words(words, config)
+
+    def test_workers_match_serial_chunks(self):
+        words = _monologue_words(60) + _speaker_dense_words(6)
+        config = PRESETS["broadcast"]
+        serial = segment_words_parallel(words, config, max_workers=1, chunk_words=120, overlap_words=16)
+        assert segment_words_parallel(words, config, max_workers=2, chunk_words=120,
+                                      overlap_words=16) == serial
+
+    def test_format_srt_chunk_words(self):
+        words = _monologue_words(40)
+        srt = format_srt(words, preset="social", chunk_words=150)
+        assert srt.startswith("1\n")
+        assert "landet." in srt
+
+    def test_chunk_must_exceed_overlaps(self):
+        words = _monologue_words(10)
+        with pytest.raises(ValueError):
+            segment_words_parallel(words, PRESETS["broadcast"], chunk_words=100, overlap_words=50)
+
+
+class TestBranchAndBound:
+    """The span cost lower bound is admissible and pruning is exact."""
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_bound_never_exceeds_cost(self, preset):
+        config = compiled_preset(preset)
+        for name in FIXTURE_NAMES:
+            spans = SpanIndex(_load_caption_words(name))
+            assert _pruning_exact(spans, config)
+            lookback = spans.char_lookback(config.max_cue_chars)
+            for j in range(1, len(spans) + 1):
+                for i in range(lookback[j], j):
+                    scored = _span_cost(spans, i, j, config)
+                    if scored is not None:
+                        assert _span_cost_lower_bound(spans, i, j, config) <= scored[0]
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    @pytest.mark.parametrize("name", FIXTURE_NAMES)
+    def test_pruned_matches_full_dp(self, name, preset):
+        words = _load_caption_words(name)
+        stats = SegmentationStats()
+        pruned = segment_words(words, PRESETS[preset], stats=stats)
+        assert pruned == segment_words(words, PRESETS[preset], prune=False)
+        assert stats.spans_pruned > 0
+
+    def test_pruned_matches_full_dp_with_speakers(self):
+        words = _speaker_dense_words(30)
+        config = PRESETS["broadcast"]
+        assert segment_words(words, config) == segment_words(words, config, prune=False)
+
+    def test_tagged_text_disables_pruning(self):
+        words = _make_words(["Hej", "<i>och</i>", "välkommen", "hit."])
+        stats = SegmentationStats()
+        segment_words(words, PRESETS["broadcast"], stats=stats)
+        assert stats.spans_pruned == 0
+
+    def test_negative_two_line_weight_disables_pruning(self):
+        config = copy.deepcopy(PRESETS["broadcast"])
+        config["weights"]["balance"] = -0.1
+        assert not compile_config(config).bound_ok
+
+    def test_last_char(self):
+        spans = SpanIndex(_make_words(["–", "Hej", "du,", "–", "då."]))
+        assert spans.last_char(0, 1) == ""
+        assert spans.last_char(0, 3) == ","
+        assert spans.last_char(1, 4) == ","
+        assert spans.last_char(3, 5) == "."
+
+
+class TestBeamStrategy:
+    """The approximate beam search stays valid and converges to the exact DP."""
+
+    @staticmethod
+    def _beam(preset, width):
+        config = copy.deepcopy(PRESETS[preset])
+        config.update(strategy="beam", beam_width=width)
+        return config
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_full_width_matches_exact(self, preset):
+        width = PRESETS[preset]["max_lookback_words"]
+        for name in FIXTURE_NAMES:
+            words = _load_caption_words(name)
+            assert segment_words(words, self._beam(preset, width)) == segment_words(words, PRESETS[preset])
+
+    def test_narrow_beam_is_valid_and_never_cheaper(self):
+        words = _load_caption_words("long_sentences") + _speaker_dense_words(20)
+        exact, beam = SegmentationStats(), SegmentationStats()
+        expected = segment_words(words, PRESETS["broadcast"], stats=exact)
+        segments = segment_words(words, self._beam("broadcast", 2), stats=beam)
+        assert beam.spans_beam_skipped > 0
+        assert beam.spans_evaluated < exact.spans_evaluated
+        assert beam.path_cost >= exact.path_cost - 1e-9
+        assert " ".join(s["text"] for s in segments) == " ".join(s["text"] for s in expected)
+
+    def test_strategy_argument_overrides_config(self):
+        words = _load_caption_words("medium_sentences")
+        exact = format_srt(words, "broadcast")
+        assert format_srt(words, config=self._beam("broadcast", 1), strategy="exact") == exact
+        assert format_srt(words, "broadcast", strategy="beam") == format_srt(
+            words, config=self._beam("broadcast", 4))
+
+    def test_parallel_beam_matches_serial(self):
+        words = _speaker_dense_words(12)
+        config = self._beam("broadcast", 2)
+        assert segment_words_parallel(words, config, max_workers=2) == segment_words(words, config)
+
+    def test_unknown_strategy_raises(self):
+        words = _make_words(["Hej", "då."])
+        with pytest.raises(ValueError):
+            format_srt(words, strategy="greedy")
+        config = copy.deepcopy(PRESETS["social"])
+        config["strategy"] = "greedy"
+        with pytest.raises(ValueError):
+            compile_config(config)
+
+
+class TestSpanFeatures:
+    """Re-scoring extracted span features matches the full DP."""
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_span_costs_match_span_cost(self, preset):
+        config = compiled_preset(preset)
+        words = _load_caption_words("mixed_complexity")
+        features = SpanFeatures.extract(words, config)
+        costs = features.span_costs()
+        spans = SpanIndex(words)
+        assert len(costs) == features.n_spans
+        for (i, j), cost in zip(features._span_ij, costs):
+            assert cost == _span_cost(spans, i, j, config)[0]
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    @pytest.mark.parametrize("name", FIXTURE_NAMES)
+    def test_segment_matches_segment_words(self, name, preset):
+        words = _load_caption_words(name)
+        features = SpanFeatures.extract(words, PRESETS[preset])
+        assert features.segment() == segment_words(words, PRESETS[preset])
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    def test_new_weights_match_segment_words(self, preset):
+        words = _load_caption_words("weak_words_heavy")
+        features = SpanFeatures.extract(words, PRESETS[preset])
+        weights = {"balance": 0.1, "orphan": 3.0, "boundary_no_punct": 4.0,
+                   "cps_above_target": 0.9, "speaker_change_bonus": -1.0}
+        config = copy.deepcopy(PRESETS[preset])
+        config["weights"].update(weights)
+        assert features.segment(weights) == segment_words(words, config)
+
+    def test_tags_and_speakers(self):
+        words = _make_words(["Hej", "<i>och</i>", "välkommen,", "–", "hit", "till", "oss."])
+        words += _speaker_dense_words(10)
+        features = SpanFeatures.extract(words, PRESETS["broadcast"])
+        assert features.segment({"weak_end": 5.0}) == segment_words(
+            words, dict(PRESETS["broadcast"], weights=dict(
+                PRESETS["broadcast"]["weights"], weak_end=5.0)))
+
+    def test_empty(self):
+        assert SpanFeatures.extract([], PRESETS["social"]).segment() == []
+
+
+_SEGMENTED_JSON = json.dumps([
+    {"speaker": "1", "words": [
+        {"word": "Hej", "start": 0.0, "end": 0.4},
+        {"text": "och", "s": 0.5, "e": 0.7},
+        {"t": "välkommen.", "start": 0.8},
+    ]},
+    {"words": [{"word": "–", "start": 1.0, "end": 1.0},
+               {"word": "Tack,", "start": 1.1, "end": 1.5}]},
+    "skipped",
+    {"word": "flat", "start": 2.0, "end": 2.5},
+], indent=2)
+
+
+class TestJsonReader:
+    """The streaming reader matches parse_input(try_parse_json()) and repairs truncation."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_matches_parse_input(self, chunk_size):
+        expected = parse_input(try_parse_json(_SEGMENTED_JSON))
+        assert len(expected) == 6
+        assert list(iter_words(io.StringIO(_SEGMENTED_JSON), chunk_size)) == expected
+
+    def test_every_truncation_try_parse_json_accepts(self):
+        for cut in range(len(_SEGMENTED_JSON) + 1):
+            raw = _SEGMENTED_JSON[:cut]
+            try:
+                expected = parse_input(try_parse_json(raw))
+            except ValueError:
+                continue
+            assert list(iter_words(raw, chunk_size=5)) == expected, raw
+
+    @pytest.mark.parametrize("raw", [
+        _SEGMENTED_JSON + ",",
+        _SEGMENTED_JSON + " ,\n",
+        "[,",
+        "[] ,",
+        '[{"words": [,',
+        '[{,',
+    ])
+    def test_trailing_comma_like_try_parse_json(self, raw):
+        expected = parse_input(try_parse_json(raw))
+        for chunk_size in (1, 3, 4096):
+            assert read_words(raw, chunk_size).to_words() == expected
+
+    def test_every_truncation_with_trailing_comma(self):
+        for cut in range(len(_SEGMENTED_JSON) + 1):
+            raw = _SEGMENTED_JSON[:cut] + ","
+            try:
+                expected = parse_input(try_parse_json(raw))
+            except ValueError:
+                continue
+            assert list(iter_words(raw, chunk_size=5)) == expected, raw
+
+    def test_repairs_truncated_word_object(self):
+        raw = '[{"words": [{"word": "Hej", "start": 0.0, "end": 0.4}, {"word": "då", "start": 0.5, "end'
+        with pytest.raises(ValueError):
+            try_parse_json(raw)
+        words = list(iter_words(raw))
+        assert [(w.text, w.start, w.end) for w in words] == [("Hej", 0.0, 0.4), ("då", 0.5, 0.5)]
+
+    def test_truncated_inside_string(self):
+        words = list(iter_words('[{"word": "Hej", "start": 1}, {"word": "väl'))
+        assert [w.text for w in words] == ["Hej"]
+
+    def test_non_array_input(self):
+        assert list(iter_words('{"words": []}')) == []
+
+    @pytest.mark.parametrize("raw", ["", "  ", '[{"word": x}]', "[1 2]", '[{"word": "a"}] extra'])
+    def test_malformed_input_raises(self, raw):
+        with pytest.raises(ValueError):
+            list(iter_words(raw))
+
+    def test_read_words_returns_word_array(self):
+        words = read_words(io.StringIO(_SEGMENTED_JSON))
+        assert isinstance(words, WordArray)
+        assert words.to_words() == parse_input(json.loads(_SEGMENTED_JSON))
+
+
+class TestStreamingSegmenter:
+    """Streaming segmentation matches the batch DP when latency is unbounded."""
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    @pytest.mark.parametrize("name", FIXTURE_NAMES)
+    def test_segments_match_batch(self, name, preset):
+        words = _load_caption_words(name)
+        segmenter = StreamingSegmenter(preset=preset, max_latency=math.inf)
+        streamed = list(segmenter.iter_segments(words))
+        assert streamed == segment_words(words, PRESETS[preset])
+
+    def test_speaker_dense_matches_batch(self):
+        words = _speaker_dense_words(30)
+        segmenter = StreamingSegmenter(max_latency=math.inf)
+        assert list(segmenter.iter_segments(words)) == segment_words(words, PRESETS["broadcast"])
+
+    @pytest.mark.parametrize("name", FIXTURE_NAMES[:2])
+    def test_cues_join_to_format_srt(self, name):
+        words = _load_caption_words(name)
+        cues = list(StreamingSegmenter(max_latency=math.inf).iter_cues(words))
+        assert "\n".join(cues) == format_srt(words, preset="broadcast")
+
+    def test_commits_before_stream_ends(self):
+        words = _load_caption_words("long_sentences")
+        segmenter = StreamingSegmenter(max_latency=math.inf)
+        committed = 0
+        for word in words[:-1]:
+            committed += len(segmenter.push(word))
+        assert committed > 0
+        assert segmenter.pending_words < len(words) // 2
+
+    def test_latency_budget_bounds_buffer(self):
+        words = _load_caption_words("long_sentences")
+        segmenter = StreamingSegmenter(max_latency=4.0)
+        segments = []
+        for word in words:
+            segments.extend(segmenter.push(word))
+            buffered = segmenter._spans
+            if len(buffered) > 1:
+                assert buffered.ends[-1] - buffered.starts[0] <= 4.0
+        segments.extend(segmenter.flush())
+
+        spoken = " ".join(w.text for w in words if not w.is_speaker_marker)
+        captioned = " ".join(seg["text"].replace("– ", "") for seg in segments)
+        assert captioned == spoken
+
+
+class TestWordArray:
+    """Columnar words behave like Word lists throughout the engine."""
+
+    def test_round_trip(self):
+        words = _speaker_dense_words(4)
+        array = WordArray.from_words(words)
+        assert len(array) == len(words)
+        assert array.to_words() == words
+        assert array[-1] == words[-1]
+
+    def test_slice_is_columnar(self):
+        words = _make_words(["Hej", "–", "åter", "då."])
+        part = WordArray.from_words(words)[1:3]
+        assert isinstance(part, WordArray)
+        assert part.to_words() == words[1:3]
+
+    def test_span_index_matches_word_list(self):
+        words = _load_caption_words("mixed_complexity")
+        from_list = SpanIndex(words)
+        from_array = SpanIndex(WordArray.from_words(words))
+        n = len(words)
+        for i in range(n):
+            for j in range(i + 1, min(n, i + 20) + 1):
+                assert from_array.text(i, j) == from_list.text(i, j)
+                assert from_array.text_len(i, j) == from_list.text_len(i, j)
+        assert from_array.prev_break == from_list.prev_break
+        assert from_array.segment_starts == from_list.segment_starts
+
+    @pytest.mark.parametrize("preset", ["broadcast", "social"])
+    @pytest.mark.parametrize("name", FIXTURE_NAMES)
+    def test_segment_words_matches_word_list(self, name, preset):
+        words = _load_caption_words(name)
+        array = WordArray.from_words(words)
+        assert segment_words(array, PRESETS[preset]) == segment_words(words, PRESETS[preset])
+
+    def test_format_srt_parallel_accepts_array(self):
+        words = _speaker_dense_words(20)
+        array = WordArray.from_words(words)
+        assert format_srt(array, workers=2) == format_srt(words)
@@ -22,6 +22,8 @@ from typing import Any, Dict
 import jsonschema
 import pytest
 
+from format_captions import format_srt_multi
+from soniox_converter.core.columnar import to_columnar
 from soniox_converter.core.ir import (
     AssembledWord,
     Segment,
@@ -527,6 +529,45 @@ class TestSRTCaptionFormatter:
             assert " --> " in output.content
 
 
+    def test_job_renders_srt_presets_once(self, verified_sample_transcript, monkeypatch):
+        """All SRT formatters of one job share a single adapter and render pass."""
+        from soniox_converter import formatters
+        from soniox_converter.formatters import srt_captions
+        adapted = []
+        rendered = []
+
+        def counting_adapter(transcript):
+            adapted.append(transcript)
+            return transcript_to_caption_words(transcript)
+
+        def counting_multi(words, presets, **kwargs):
+            rendered.append(list(presets))
+            return format_srt_multi(words, presets, **kwargs)
+
+        monkeypatch.setattr(srt_captions, "transcript_to_caption_words", counting_adapter)
+        monkeypatch.setattr(srt_captions, "format_srt_multi", counting_multi)
+        results = formatters.run_formatters(
+            verified_sample_transcript, ["srt_captions", "plain_text", "srt_broadcast", "srt_social"])
+
+        assert len(adapted) == 1
+        assert rendered == [["broadcast", "social"]]
+        assert list(results) == ["srt_captions", "plain_text", "srt_broadcast", "srt_social"]
+        combined = [o.content for o in results["srt_captions"]]
+        assert combined == [o.content for o in results["srt_broadcast"] + results["srt_social"]]
+        assert combined == [o.content for o in srt_captions.SRTCaptionFormatter().format(
+            verified_sample_transcript)]
+
+    def test_outputs_carry_caption_stats(self, verified_sample_transcript):
+        """Each SRT output reports the segmentation stats of its preset."""
+        from soniox_converter.formatters.srt_captions import SRTBroadcastFormatter
+        outputs = SRTBroadcastFormatter().format(verified_sample_transcript)
+        stats = outputs[0].metadata["caption_stats"]
+        assert stats["spans_evaluated"] > 0
+        assert stats["greedy_fallbacks"] == 0
+        assert set(stats["stage_times"]) == {"index", "segment", "srt"}
+        json.dumps(stats)
+
+
 class TestSRTBroadcastFormatter:
     """SRT broadcast formatter tests."""
 
@@ -673,3 +714,67 @@ class TestCaptionAdapter:
         words = transcript_to_caption_words(verified_sample_transcript)
         non_markers = [w for w in words if not w.is_speaker_marker]
         assert non_markers[0].is_segment_start is True
+
+    def test_columnar_matches_word_list(self, verified_sample_transcript):
+        """columnar=True yields the same words as the Word-list path."""
+        words = transcript_to_caption_words(verified_sample_transcript)
+        columnar = transcript_to_caption_words(verified_sample_transcript, columnar=True)
+        assert len(columnar) == len(words)
+        assert columnar.to_words() == words
+
+    def test_columnar_speaker_markers_and_punctuation(self):
+        """Columnar path injects markers and caps punctuation merging like the list path."""
+        speaker1 = SpeakerInfo(soniox_label="1", display_name="Speaker 1", uuid="uuid-1")
+        speaker2 = SpeakerInfo(soniox_label="2", display_name="Speaker 2", uuid="uuid-2")
+        words_seg1 = [
+            AssembledWord(text=",", start_s=0.0, duration_s=0.1, confidence=0.9, word_type="punctuation", speaker="1"),
+            AssembledWord(text="Hej", start_s=0.1, duration_s=0.4, confidence=0.9, word_type="word", speaker="1"),
+        ] + [
+            AssembledWord(text=p, start_s=0.5 + 0.01 * k, duration_s=0.01, confidence=0.9, word_type="punctuation", speaker="1")
+            for k, p in enumerate(["!", "?", ".", "."])
+        ]
+        words_seg2 = [
+            AssembledWord(text="Hallå", start_s=1.0, duration_s=0.3, confidence=0.95, word_type="word", speaker="2"),
+            AssembledWord(text="där", start_s=1.4, duration_s=0.3, confidence=0.95, word_type="word", speaker=None),
+        ]
+        transcript = Transcript(
+            segments=[
+                Segment(speaker="1", language="sv", start_s=0.0, duration_s=0.6, words=words_seg1),
+                Segment(speaker="2", language="sv", start_s=1.0, duration_s=0.7, words=words_seg2),
+            ],
+            speakers=[speaker1, speaker2],
+            primary_language="sv",
+            source_filename="test.mp4",
+            duration_s=1.7,
+        )
+
+        words = transcript_to_caption_words(transcript)
+        columnar = transcript_to_caption_words(transcript, columnar=True)
+        assert columnar.to_words() == words
+        assert [w.text for w in words] == ["Hej!?.", ".", "–", "Hallå", "där"]
+
+
+# =========================================================================
+# Columnar IR Tests
+# =========================================================================
+
+class TestColumnarTranscriptFormatting:
+    """Every formatter produces identical output from the columnar IR."""
+
+    @pytest.mark.parametrize("formatter_cls", [
+        PremiereProFormatter,
+        PlainTextFormatter,
+        KineticWordsFormatter,
+        SRTCaptionFormatter,
+    ])
+    def test_formatter_output_identical(self, formatter_cls, verified_sample_transcript):
+        columnar = to_columnar(verified_sample_transcript)
+        expected = formatter_cls().format(verified_sample_transcript)
+        outputs = formatter_cls().format(columnar)
+        assert [(o.suffix, o.content) for o in outputs] == [(o.suffix, o.content) for o in expected]
+
+    def test_caption_words_identical(self, verified_sample_transcript):
+        columnar = to_columnar(verified_sample_transcript)
+        assert transcript_to_caption_words(columnar) == transcript_to_caption_words(verified_sample_transcript)
+        assert (transcript_to_caption_words(columnar, columnar=True).to_words()
+                == transcript_to_caption_words(verified_sample_transcript))
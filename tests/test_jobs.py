@@ -222,6 +222,13 @@ class TestJobUpdate:
         assert job.output_files == ["result.srt", "result.txt"]
         store.delete_job(job.id)
 
+    def test_update_metadata(self):
+        store = _make_store()
+        job = store.create_job("test.mp3")
+        store.update_job(job.id, metadata={"result.srt": {"caption_stats": {}}})
+        assert job.metadata == {"result.srt": {"caption_stats": {}}}
+        store.delete_job(job.id)
+
     def test_update_missing_job_returns_none(self):
         store = _make_store()
         result = store.update_job("nonexistent", status=JobStatus.FAILED)
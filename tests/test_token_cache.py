@@ -0,0 +1,180 @@
+"""Unit tests for the content-addressed token cache.
+
+WHY: A wrong cache hit silently returns another file's (or another
+setting's) transcript, and an unbounded cache fills the disk. These tests
+pin down what the key depends on, the LRU size bound, and that the API
+pipeline skips Soniox entirely on a hit.
+
+HOW: Tests are organized by concern:
+  - TestCacheKey: which inputs change the key and which do not
+  - TestTokenCache: round trip, misses, corrupt entries, LRU eviction
+  - TestPipelineCache: the API job pipeline with a mocked SonioxClient
+
+RULES:
+- Every cache lives in pytest's tmp_path; the user cache is never touched
+- Soniox API is never called (the client is mocked)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from soniox_converter.api.cache import TokenCache, cache_key
+from soniox_converter.api.models import SonioxToken
+from soniox_converter.server.jobs import JobStatus, JobStore
+
+
+def _tokens(n: int = 3) -> list:
+    return [
+        SonioxToken(text=" ord{}".format(k), start_ms=100 * k, end_ms=100 * k + 80,
+                    confidence=0.9, speaker="1", language="sv")
+        for k in range(n)
+    ]
+
+
+@pytest.fixture
+def audio(tmp_path: Path) -> Path:
+    path = tmp_path / "clip.mp3"
+    path.write_bytes(b"fake audio data")
+    return path
+
+
+class TestCacheKey:
+    """The key covers the audio content and every request parameter."""
+
+    def test_same_inputs_same_key(self, audio, tmp_path):
+        copy = tmp_path / "renamed.wav"
+        copy.write_bytes(audio.read_bytes())
+        assert cache_key(audio, "stt-async-v4", ["sv"]) == cache_key(copy, "stt-async-v4", ["sv"])
+
+    @pytest.mark.parametrize("changes", [
+        {"model": "stt-async-v3"},
+        {"language_hints": ["sv", "en"]},
+        {"enable_diarization": False},
+        {"enable_language_identification": False},
+        {"script_text": "Hej och välkommen."},
+        {"terms": ["SVT"]},
+        {"general_context": [{"key": "domain", "value": "Media"}]},
+    ])
+    def test_parameters_change_key(self, audio, changes):
+        params = {"model": "stt-async-v4", "language_hints": ["sv"]}
+        base = cache_key(audio, **params)
+        params.update(changes)
+        assert cache_key(audio, **params) != base
+
+    def test_audio_content_changes_key(self, audio):
+        base = cache_key(audio, "stt-async-v4")
+        audio.write_bytes(b"other audio data")
+        assert cache_key(audio, "stt-async-v4") != base
+
+    def test_empty_context_equals_none(self, audio):
+        assert cache_key(audio, "m", terms=[], script_text="") == cache_key(audio, "m")
+
+
+class TestTokenCache:
+    """Entries round-trip, misses are None, and the size bound holds."""
+
+    def test_round_trip(self, tmp_path):
+        cache = TokenCache(tmp_path / "cache")
+        tokens = _tokens() + [SonioxToken(text="hej", start_ms=None, end_ms=None,
+                                          confidence=0.5, translation_status="translation")]
+        cache.put("k", tokens)
+        assert cache.get("k") == tokens
+        assert cache.size_bytes() > 0
+
+    def test_miss(self, tmp_path):
+        assert TokenCache(tmp_path / "missing").get("k") is None
+
+    def test_corrupt_entry_is_discarded(self, tmp_path):
+        cache = TokenCache(tmp_path)
+        (tmp_path / "k.json.gz").write_bytes(b"not gzip")
+        assert cache.get("k") is None
+        assert not (tmp_path / "k.json.gz").exists()
+
+    def test_lru_eviction(self, tmp_path):
+        cache = TokenCache(tmp_path, max_bytes=10 ** 9)
+        for key in ("a", "b", "c"):
+            cache.put(key, _tokens(50))
+        for age, key in enumerate(("a", "b", "c")):
+            os.utime(tmp_path / (key + ".json.gz"), (1000 + age, 1000 + age))
+        assert cache.get("a") is not None  # a is now the most recently used
+        cache.max_bytes = cache.size_bytes() - 1
+        cache.put("c", _tokens(50))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_entry_larger_than_budget_is_not_kept(self, tmp_path):
+        cache = TokenCache(tmp_path, max_bytes=10)
+        cache.put("k", _tokens(50))
+        assert cache.get("k") is None
+
+    def test_clear(self, tmp_path):
+        cache = TokenCache(tmp_path)
+        cache.put("k", _tokens())
+        cache.clear()
+        assert cache.get("k") is None
+
+
+class TestPipelineCache:
+    """API jobs reuse cached tokens and skip upload unless use_cache is off."""
+
+    def _run_job(self, store: JobStore, use_cache: bool = True) -> MagicMock:
+        job = store.create_job(filename="clip.mp3", config={
+            "output_formats": ["plain_text"], "use_cache": use_cache,
+        })
+        (job.output_dir / "clip.mp3").write_bytes(b"fake audio data")
+
+        client = MagicMock()
+        client.model = "stt-async-v4"
+        client.upload_file = AsyncMock(return_value="file-1")
+        client.create_transcription = AsyncMock(return_value="tr-1")
+        client.poll_until_complete = AsyncMock()
+        client.fetch_transcript = AsyncMock(return_value=_tokens())
+        client.cleanup = AsyncMock()
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=None)
+
+        from soniox_converter.server.app import _run_transcription_pipeline
+        with patch("soniox_converter.api.client.SonioxClient", return_value=client):
+            asyncio.run(_run_transcription_pipeline(job.id, store))
+        assert store.get_job(job.id).status == JobStatus.COMPLETED
+        store.delete_job(job.id)
+        return client
+
+    def test_second_job_uses_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("soniox_converter.api.cache.TOKEN_CACHE_DIR", str(tmp_path / "cache"))
+        store = JobStore()
+        first = self._run_job(store)
+        assert first.upload_file.await_count == 1
+        second = self._run_job(store)
+        assert second.upload_file.await_count == 0
+        assert second.cleanup.await_count == 0
+
+    def test_use_cache_false_bypasses(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("soniox_converter.api.cache.TOKEN_CACHE_DIR", str(tmp_path / "cache"))
+        store = JobStore()
+        self._run_job(store)
+        bypass = self._run_job(store, use_cache=False)
+        assert bypass.upload_file.await_count == 1
+
+    def test_cache_io_runs_off_event_loop(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("soniox_converter.api.cache.TOKEN_CACHE_DIR", str(tmp_path / "cache"))
+        threads = []
+        for name in ("get", "put"):
+            original = getattr(TokenCache, name)
+
+            def recording(self, *args, _original=original):
+                threads.append(threading.current_thread())
+                return _original(self, *args)
+
+            monkeypatch.setattr(TokenCache, name, recording)
+        self._run_job(JobStore())
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""Caption engine benchmark tool.
+
+WHY: The caption DP must stay near-linear in transcript length, including on
+speaker-dense panel shows where every few words is a speaker marker. The
+tuning tools only measure caption quality, so this tool measures speed.
+
+HOW: Generates synthetic Swedish-like word streams at several lengths and
+speaker densities, runs segment_words() on each with the chosen preset, and
+prints wall time and microseconds per word. Flat µs/word across sizes and
+densities means linear scaling. The --forced-breaks mode also times the
+legal-start lookup on its own, comparing the old set scan with the
+prev_break index. --workers N compares the serial DP with
+segment_words_parallel() on N processes. --config-overhead times the
+per-call config handling: deep-copying a preset dict versus looking up its
+CompiledConfig, and the segment cost function with dict lookups versus
+compiled attributes. --memory runs the Transcript -> caption words ->
+segment_words() path on a synthetic Transcript with Word lists and with a
+columnar WordArray, and reports the words' retained size and the peak
+traced memory of each. --pruning compares the DP with and without
+branch-and-bound pruning and reports the share of spans the lower bound
+skipped.
+
+USAGE:
+    python tests/tools/bench_caption_engine.py
+    python tests/tools/bench_caption_engine.py --preset social --sizes 1000 4000
+    python tests/tools/bench_caption_engine.py --forced-breaks
+    python tests/tools/bench_caption_engine.py --workers 8 --sizes 20000
+    python tests/tools/bench_caption_engine.py --config-overhead
+    python tests/tools/bench_caption_engine.py --memory --sizes 5000 20000
+    python tests/tools/bench_caption_engine.py --pruning --preset social
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from format_captions.compiled import compiled_preset
+from format_captions.core import (
+    _compute_segment_cost,
+    best_line_break,
+    ends_comma,
+    ends_sentence,
+    last_word_clean,
+    segment_words,
+)
+from format_captions.models import Word
+from soniox_converter.adapters.caption_adapter import transcript_to_caption_words
+from soniox_converter.core.ir import AssembledWord, Segment, Transcript
+from format_captions.parallel import segment_words_parallel
+from format_captions.presets import PRESETS, WEAK_END_WORDS
+from format_captions.spans import SpanIndex
+from format_captions.stats import SegmentationStats
+
+# Small Swedish-like vocabulary: function words mixed with content words
+VOCABULARY = [
+    "och", "att", "som", "i", "på", "det", "är", "en", "ett", "jag", "vi",
+    "inte", "för", "med", "till", "har", "kan", "ska", "så", "men",
+    "regeringen", "budgeten", "Sverige", "ekonomin", "marknaden", "räntan",
+    "väldigt", "kanske", "mycket", "programmet", "Riksbanken", "inflationen",
+    "överenskommelse", "kommunerna", "arbetslösheten", "framtiden", "frågan",
+]
+
+
+def make_words(
+    n_words: int,
+    speaker_density: float = 0.0,
+    seed: int = 0,
+) -> List[Word]:
+    """Generate a synthetic caption word stream.
+
+    Args:
+        n_words: Number of spoken (non-marker) words.
+        speaker_density: Probability that a speaker marker precedes a word.
+        seed: Random seed for reproducible streams.
+
+    Returns:
+        Word list with punctuation, sentence starts and speaker markers.
+    """
+    rnd = random.Random(seed)
+    words = []  # type: List[Word]
+    t = 0.0
+    next_is_segment_start = True
+
+    for k in range(n_words):
+        if k > 0 and rnd.random() < speaker_density:
+            words.append(Word("–", t, t, is_speaker_marker=True))
+            next_is_segment_start = True
+
+        text = rnd.choice(VOCABULARY)
+        roll = rnd.random()
+        ends_sentence = roll < 0.08
+        if ends_sentence:
+            text += "."
+        elif roll < 0.13:
+            text += ","
+
+        dur = rnd.uniform(0.12, 0.55)
+        words.append(Word(text, t, t + dur, is_segment_start=next_is_segment_start))
+        next_is_segment_start = ends_sentence
+        t += dur + rnd.uniform(0.02, 0.25)
+
+    return words
+
+
+def make_transcript(n_words: int, speaker_density: float = 0.0, seed: int = 0) -> Transcript:
+    """Build a Transcript IR with the same word stream as make_words().
+
+    Trailing punctuation becomes a separate punctuation token and speaker
+    markers become speaker changes, so the caption adapter has its usual
+    merging and marker work to do.
+    """
+    ir_words = []  # type: List[AssembledWord]
+    speaker = 1
+    for w in make_words(n_words, speaker_density, seed):
+        if w.is_speaker_marker:
+            speaker = 3 - speaker
+            continue
+        text = w.text
+        punct = text[-1] if text[-1] in ".," else ""
+        if punct:
+            text = text[:-1]
+        dur = w.end - w.start
+        ir_words.append(AssembledWord(
+            text=text, start_s=w.start, duration_s=dur, confidence=0.9,
+            word_type="word", eos=punct == ".", speaker=str(speaker)))
+        if punct:
+            ir_words.append(AssembledWord(
+                text=punct, start_s=w.end, duration_s=0.0, confidence=0.9,
+                word_type="punctuation", speaker=str(speaker)))
+    end = ir_words[-1].start_s + ir_words[-1].duration_s if ir_words else 0.0
+    return Transcript(
+        segments=[Segment(speaker="1", language="sv", start_s=0.0,
+                          duration_s=end, words=ir_words)],
+        speakers=[],
+        primary_language="sv",
+        source_filename="synthetic.mp4",
+        duration_s=end,
+    )
+
+
+def _legacy_forced_break_scan(words: List[Word], max_lookback: int) -> int:
+    """The pre-index legal-start lookup: a full set scan per j and per i."""
+    forced_breaks = {i for i, w in enumerate(words) if w.is_speaker_marker and i > 0}
+    visited = 0
+    for j in range(1, len(words) + 1):
+        must_break_after = None
+        for fb in forced_breaks:
+            if fb < j and (must_break_after is None or fb > must_break_after):
+                must_break_after = fb
+        min_i = max(0, j - max_lookback)
+        if must_break_after is not None:
+            min_i = max(min_i, must_break_after)
+        for i in range(j - 1, min_i - 1, -1):
+            if not any(fb > i and fb < j for fb in forced_breaks):
+                visited += 1
+    return visited
+
+
+def _indexed_forced_break_scan(words: List[Word], max_lookback: int) -> int:
+    """The indexed legal-start lookup used by segment_words()."""
+    prev_break = SpanIndex(words).prev_break
+    visited = 0
+    for j in range(1, len(words) + 1):
+        min_i = max(0, j - max_lookback, prev_break[j])
+        visited += j - min_i
+    return visited
+
+
+def _legacy_segment_cost(
+    text: str, start: float, end: float, lb: Dict, has_speaker: bool, config: Dict
+) -> float:
+    """The pre-compilation segment cost: dict lookups for every term."""
+    w = config["weights"]
+    cost = lb["score"]
+    char_count = len(text.replace("\n", ""))
+    dur = max(0.001, end - start)
+    cost += w["cue_len_deviation"] * abs(char_count - config["target_cue_chars"])
+    if dur < config["min_cue_dur"]:
+        cost += w["cue_dur_below"] * (config["min_cue_dur"] - dur)
+    if dur > config["max_cue_dur"]:
+        cost += w["cue_dur_above"] * (dur - config["max_cue_dur"])
+    end_word = last_word_clean(text)
+    if ends_sentence(text):
+        cost += w["boundary_punct_bonus"]
+    elif ends_comma(text):
+        cost += w["boundary_punct_bonus"] * 0.3
+    elif end_word in WEAK_END_WORDS:
+        cost += w["boundary_weak_end"]
+    else:
+        cost += w.get("boundary_no_punct", 1.5)
+    if has_speaker:
+        cost += w["speaker_change_bonus"]
+    return cost
+
+
+def _time(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def bench_segment_words(preset: str, sizes: List[int], densities: List[float]) -> None:
+    """Print segment_words() timing for every size and speaker density."""
+    config = PRESETS[preset]
+    print("\nsegment_words() — preset: {}".format(preset))
+    print("{:>8} {:>9} {:>9} {:>10} {:>10}".format(
+        "Words", "Density", "Markers", "Seconds", "us/word"))
+    print("-" * 50)
+    for density in densities:
+        for n in sizes:
+            words = make_words(n, density)
+            markers = sum(1 for w in words if w.is_speaker_marker)
+            elapsed = _time(segment_words, words, config)
+            print("{:>8} {:>9.2f} {:>9} {:>10.3f} {:>10.1f}".format(
+                n, density, markers, elapsed, elapsed / len(words) * 1e6))
+
+
+def bench_forced_breaks(preset: str, sizes: List[int], densities: List[float]) -> None:
+    """Print legacy vs indexed forced-break lookup timing."""
+    max_lookback = PRESETS[preset]["max_lookback_words"]
+    print("\nForced-break lookup — preset: {}".format(preset))
+    print("{:>8} {:>9} {:>9} {:>12} {:>12} {:>9}".format(
+        "Words", "Density", "Markers", "Legacy s", "Indexed s", "Speedup"))
+    print("-" * 64)
+    for density in densities:
+        for n in sizes:
+            words = make_words(n, density)
+            markers = sum(1 for w in words if w.is_speaker_marker)
+            legacy = _time(_legacy_forced_break_scan, words, max_lookback)
+            indexed = _time(_indexed_forced_break_scan, words, max_lookback)
+            print("{:>8} {:>9.2f} {:>9} {:>12.4f} {:>12.4f} {:>8.0f}x".format(
+                n, density, markers, legacy, indexed, legacy / max(indexed, 1e-9)))
+
+
+def bench_parallel(
+    preset: str, sizes: List[int], densities: List[float], workers: int
+) -> None:
+    """Print serial vs parallel segmentation timing."""
+    config = PRESETS[preset]
+    print("\nParallel segmentation — preset: {}, workers: {}".format(preset, workers))
+    print("{:>8} {:>9} {:>9} {:>10} {:>11} {:>9}".format(
+        "Words", "Density", "Markers", "Serial s", "Parallel s", "Speedup"))
+    print("-" * 62)
+    for density in densities:
+        for n in sizes:
+            words = make_words(n, density)
+            markers = sum(1 for w in words if w.is_speaker_marker)
+            serial = _time(segment_words, words, config)
+            parallel = _time(segment_words_parallel, words, config, workers)
+            print("{:>8} {:>9.2f} {:>9} {:>10.3f} {:>11.3f} {:>8.1f}x".format(
+                n, density, markers, serial, parallel, serial / max(parallel, 1e-9)))
+
+
+def bench_pruning(preset: str, sizes: List[int], densities: List[float]) -> None:
+    """Print segment_words() timing with and without pruning, and the pruning ratio."""
+    config = compiled_preset(preset)
+    print("\nBranch-and-bound pruning — preset: {}".format(preset))
+    print("{:>8} {:>9} {:>10} {:>10} {:>10} {:>9} {:>9}".format(
+        "Words", "Density", "Spans", "Full s", "Pruned s", "Pruned", "Speedup"))
+    print("-" * 71)
+    for density in densities:
+        for n in sizes:
+            words = make_words(n, density)
+            full = min(_time(segment_words, words, config, None, None, None, False)
+                       for _ in range(3))
+            pruned = min(_time(segment_words, words, config, None, None, None, True)
+                         for _ in range(3))
+            stats = SegmentationStats()
+            segment_words(words, config, stats=stats)
+            print("{:>8} {:>9.2f} {:>10} {:>10.3f} {:>10.3f} {:>8.1%} {:>8.2f}x".format(
+                n, density, stats.spans_evaluated + stats.spans_pruned, full, pruned,
+                stats.pruning_ratio, full / max(pruned, 1e-9)))
+
+
+def bench_config_overhead(preset: str, calls: int = 20000) -> None:
+    """Print per-call config resolution and segment cost timing."""
+    config = PRESETS[preset]
+    compiled = compiled_preset(preset)
+
+    def resolve_legacy():
+        for _ in range(calls):
+            copy.deepcopy(config)
+
+    def resolve_compiled():
+        for _ in range(calls):
+            compiled_preset(preset)
+
+    words = make_words(400)
+    spans = SpanIndex(words)
+    samples = []
+    for i in range(0, len(words) - 8, 4):
+        text = spans.text(i, i + 8)
+        start, end = spans.starts[i], spans.ends[i + 7]
+        samples.append((text, start, end, best_line_break(text, start, end, compiled),
+                        spans.has_speaker(i, i + 8)))
+    rounds = max(1, calls // len(samples))
+
+    def cost_legacy():
+        for _ in range(rounds):
+            for text, start, end, lb, speaker in samples:
+                _legacy_segment_cost(text, start, end, lb, speaker, config)
+
+    def cost_compiled():
+        for _ in range(rounds):
+            for text, start, end, lb, speaker in samples:
+                _compute_segment_cost(text, start, end, lb, speaker, compiled)
+
+    print("\nConfig overhead — preset: {}".format(preset))
+    print("{:<26} {:>12} {:>12} {:>9}".format("Operation", "Dict us", "Compiled us", "Speedup"))
+    print("-" * 62)
+    rows = [
+        ("preset per format_srt()", resolve_legacy, resolve_compiled, calls),
+        ("segment cost per span", cost_legacy, cost_compiled, rounds * len(samples)),
+    ]
+    for label, legacy_fn, compiled_fn, n in rows:
+        legacy = _time(legacy_fn) / n * 1e6
+        fast = _time(compiled_fn) / n * 1e6
+        print("{:<26} {:>12.2f} {:>12.2f} {:>8.1f}x".format(
+            label, legacy, fast, legacy / max(fast, 1e-9)))
+
+
+def _traced(fn, *args):
+    """Run fn under tracemalloc; return (result, retained bytes, peak bytes).
+
+    Tracing slows the DP down many times over, so only sizes are reported.
+    """
+    tracemalloc.start()
+    result = fn(*args)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak
+
+
+def bench_memory(preset: str, sizes: List[int], density: float) -> None:
+    """Print retained and peak memory of Word-list vs WordArray caption input."""
+    config = PRESETS[preset]
+    print("\nCaption word memory — preset: {}, speaker density: {}".format(preset, density))
+    print("{:>8} {:<9} {:>12} {:>13} {:>13}".format(
+        "Words", "Storage", "Words MiB", "Adapt peak", "DP peak"))
+    print("-" * 59)
+    for n in sizes:
+        transcript = make_transcript(n, density)
+        for label, columnar in (("list", False), ("columnar", True)):
+            words, retained, adapt_peak = _traced(
+                transcript_to_caption_words, transcript, columnar)
+            _, _, dp_peak = _traced(segment_words, words, config)
+            print("{:>8} {:<9} {:>12.2f} {:>12.2f}M {:>12.2f}M".format(
+                n, label, retained / 2 ** 20, adapt_peak / 2 ** 20, dp_peak / 2 ** 20))
+            del words
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Caption engine benchmark tool",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--preset", default="broadcast", choices=sorted(PRESETS.keys()),
+                        help="Preset to benchmark (default: broadcast)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000],
+                        help="Word counts to benchmark")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.0, 0.02, 0.1, 0.25],
+                        help="Speaker marker probabilities per word")
+    parser.add_argument("--forced-breaks", action="store_true",
+                        help="Compare legacy and indexed forced-break lookup")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Compare serial and parallel segmentation on N processes")
+    parser.add_argument("--memory", action="store_true",
+                        help="Compare Word-list and WordArray memory (first density only)")
+    parser.add_argument("--config-overhead", action="store_true",
+                        help="Compare dict and compiled config handling per call")
+    parser.add_argument("--pruning", action="store_true",
+                        help="Compare the DP with and without branch-and-bound pruning")
+
+    args = parser.parse_args()
+
+    if args.memory:
+        bench_memory(args.preset, args.sizes, args.densities[0])
+    elif args.pruning:
+        bench_pruning(args.preset, args.sizes, args.densities)
+    elif args.config_overhead:
+        bench_config_overhead(args.preset)
+    elif args.workers:
+        bench_parallel(args.preset, args.sizes, args.densities, args.workers)
+    elif args.forced_breaks:
+        bench_forced_breaks(args.preset, args.sizes, args.densities)
+    else:
+        bench_segment_words(args.preset, args.sizes, args.densities)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
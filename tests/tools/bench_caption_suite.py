@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Caption engine benchmark suite with scaling curves and a regression gate.
+
+WHY: bench_caption_engine.py answers one-off questions ("is the DP linear?",
+"what does the parallel path buy?") by printing tables. Catching a slowdown
+before it ships needs repeatable numbers across programme lengths, speaker
+densities and both presets, stored as data and compared against a baseline.
+
+HOW: For every preset, programme length (1 minute to 10 hours of synthetic
+Swedish-like speech) and speaker density, the suite generates a word stream
+with bench_caption_engine.make_words() and times three stages separately:
+
+  segment_words   — the full DP, with a fresh LineBreakCache as format_srt() uses
+  best_line_break — every candidate span the DP visits for the first
+                    --line-break-words end positions, called directly
+  generate_srt    — SRT rendering of the DP's segments
+
+Each stage is timed repeatedly, and every timing runs between two runs of
+a fixed pure-Python calibration loop that shares no code with the engine.
+Dividing by the calibration time gives throughput per calibration unit
+(the *_per_cal fields), which cancels most of the CPU speed drift of a
+shared machine: raw words/s of identical runs differ by up to 50% there,
+calibrated values by up to 25% per case.
+
+Results are printed and optionally written as JSON (--output). With
+--baseline, the calibrated throughput of each stage is compared with a
+stored result file: the geometric mean of the per-case ratios, which stays
+within 5% between identical runs, must not drop by more than
+--max-regression percent (default 10). The script exits with status 1 on
+a regression, or if no case of the run is in the baseline at all.
+
+The gate's baseline is committed next to this script as
+caption_bench_baseline.json (GATE_BASELINE; a bare --baseline uses it). It
+covers the gate cases below. Calibration does not cancel differences
+between CPU models or Python versions, so the script warns when the
+baseline's machine or Python version differs, and the baseline is
+re-recorded (same command with --output) whenever the gate moves to other
+hardware or an intended slowdown lands.
+
+USAGE:
+    python tests/tools/bench_caption_suite.py --output bench.json
+    python tests/tools/bench_caption_suite.py --minutes 1 10 --densities 0 0.1
+
+    Regression gate (exit status 1 on a regression):
+    python tests/tools/bench_caption_suite.py --minutes 1 10 60 --repeat 5 \
+        --baseline tests/tools/caption_bench_baseline.json
+
+    Re-record the gate's baseline on the machine that runs the gate:
+    python tests/tools/bench_caption_suite.py --minutes 1 10 60 --repeat 5 \
+        --output tests/tools/caption_bench_baseline.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_caption_engine import make_words
+from format_captions.cache import LineBreakCache
+from format_captions.compiled import compiled_preset
+from format_captions.core import best_line_break, generate_srt, segment_words
+from format_captions.models import Word
+from format_captions.spans import SpanIndex
+
+# make_words() averages ~0.47 s per word (duration plus gap), ~128 words/min
+WORDS_PER_MINUTE = 128
+
+DEFAULT_MINUTES = [1, 10, 60, 600]
+DEFAULT_DENSITIES = [0.0, 0.05, 0.25]
+DEFAULT_PRESETS = ["broadcast", "social"]
+
+# Calibrated throughput compared by the regression gate, per stage
+GATED_METRICS = ["dp_words_per_cal", "line_breaks_per_cal", "srt_cues_per_cal"]
+
+# Stages are re-run until each timing covers at least this long
+MIN_TIMING_S = 0.02
+
+# Committed results the regression gate compares against (see USAGE)
+GATE_BASELINE = Path(__file__).parent / "caption_bench_baseline.json"
+
+
+def _calibration_work() -> int:
+    """Fixed pure-Python work that shares no code with the caption engine."""
+    table = {}  # type: Dict[str, int]
+    for k in range(20000):
+        key = "w{}".format(k * 7919 % 20011)
+        table[key] = len(key) + k
+    return sum(len(key) for key in sorted(table))
+
+
+def _time_per_call(fn) -> Tuple[float, Any]:
+    """Wall time of one fn() call, averaged over enough calls to be measurable."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        result = fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIMING_S:
+            return elapsed / calls, result
+
+
+def _best_time(fn, repeat: int) -> Tuple[float, float, Any]:
+    """Time fn repeat times, each between two runs of the calibration work.
+
+    On a shared machine the speed of the CPU drifts by 2x within a minute,
+    so a wall time alone does not compare between runs. The calibration
+    work runs right before and after every timing, and the stage time is
+    divided by its mean to give a time in calibration units.
+
+    Returns:
+        (fastest wall time, median calibrated time, last result).
+    """
+    best = float("inf")
+    calibrated = []  # type: List[float]
+    result = None
+    for _ in range(repeat):
+        before, _ = _time_per_call(_calibration_work)
+        elapsed, result = _time_per_call(fn)
+        after, _ = _time_per_call(_calibration_work)
+        best = min(best, elapsed)
+        calibrated.append(elapsed / ((before + after) / 2))
+    return best, statistics.median(calibrated), result
+
+
+def _candidate_spans(words: List[Word], preset: str, end_limit: int) -> List[Tuple[str, float, float]]:
+    """Span texts the DP visits for end positions 1..end_limit."""
+    config = compiled_preset(preset)
+    spans = SpanIndex(words)
+    lookback = spans.char_lookback(config.max_cue_chars)
+    candidates = []
+    for j in range(1, min(end_limit, len(words)) + 1):
+        min_i = max(lookback[j], j - config.max_lookback_words, spans.prev_break[j])
+        for i in range(min_i, j):
+            if spans.text_count(i, j):
+                candidates.append((spans.text(i, j), spans.starts[i], spans.ends[j - 1]))
+    return candidates
+
+
+def run_case(
+    preset: str, minutes: float, density: float, repeat: int, line_break_words: int
+) -> Dict[str, Any]:
+    """Benchmark one preset / length / density combination."""
+    config = compiled_preset(preset)
+    words = make_words(max(1, int(minutes * WORDS_PER_MINUTE)), density)
+
+    dp_s, dp_cal, segments = _best_time(
+        lambda: segment_words(words, config, LineBreakCache()), repeat)
+
+    candidates = _candidate_spans(words, preset, line_break_words)
+
+    def break_all():
+        for text, start, end in candidates:
+            best_line_break(text, start, end, config)
+
+    lb_s, lb_cal, _ = _best_time(break_all, repeat)
+    srt_s, srt_cal, _ = _best_time(lambda: generate_srt(segments, config), repeat)
+
+    return {
+        "preset": preset,
+        "minutes": minutes,
+        "density": density,
+        "words": len(words),
+        "audio_s": round(words[-1].end, 1),
+        "segments": len(segments),
+        "dp_s": dp_s,
+        "dp_words_per_s": len(words) / max(dp_s, 1e-9),
+        "dp_words_per_cal": len(words) / max(dp_cal, 1e-9),
+        "line_break_calls": len(candidates),
+        "line_break_s": lb_s,
+        "line_breaks_per_s": len(candidates) / max(lb_s, 1e-9),
+        "line_breaks_per_cal": len(candidates) / max(lb_cal, 1e-9),
+        "srt_s": srt_s,
+        "srt_cues_per_s": len(segments) / max(srt_s, 1e-9),
+        "srt_cues_per_cal": len(segments) / max(srt_cal, 1e-9),
+    }
+
+
+def _case_key(result: Dict[str, Any]) -> Tuple[str, float, float]:
+    return result["preset"], float(result["minutes"]), float(result["density"])
+
+
+def check_regressions(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    max_regression_pct: float,
+) -> List[str]:
+    """Compare calibrated throughput with a baseline run.
+
+    Single cases still vary by up to 25% between identical runs on a shared
+    machine, even calibrated, so each stage is gated on the geometric mean
+    of its throughput ratios over every case the two runs share (within 5%
+    between identical runs). The worst single case is named to help find
+    the cause.
+
+    Args:
+        results: Result entries of this run.
+        baseline: Result entries of the stored run.
+        max_regression_pct: Allowed drop of a stage's mean throughput, in percent.
+
+    Returns:
+        One message per stage whose mean throughput dropped by more than
+        the allowed percentage, or a single message if no case of the run
+        is in the baseline.
+    """
+    stored = {_case_key(r): r for r in baseline}
+    pairs = [(stored[_case_key(r)], r) for r in results if _case_key(r) in stored]
+    if not pairs:
+        return ["no benchmark case of this run is in the baseline"] if results else []
+    failures = []
+    for metric in GATED_METRICS:
+        ratios = [(new[metric] / old[metric], new) for old, new in pairs if old.get(metric)]
+        if not ratios:
+            continue
+        mean = math.exp(sum(math.log(ratio) for ratio, _ in ratios) / len(ratios))
+        change = (mean - 1) * 100
+        if change < -max_regression_pct:
+            worst, case = min(ratios, key=lambda item: item[0])
+            failures.append(
+                "{}: {:+.1f}% over {} cases (worst: {} {:g} min density {:g}, {:+.1f}%)".format(
+                    metric, change, len(ratios), case["preset"], case["minutes"],
+                    case["density"], (worst - 1) * 100))
+    return failures
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print one table row per benchmark case."""
+    print("{:<10} {:>7} {:>8} {:>8} {:>9} {:>11} {:>12} {:>12}".format(
+        "Preset", "Minutes", "Density", "Words", "DP s", "DP words/s",
+        "Breaks/s", "SRT cues/s"))
+    print("-" * 84)
+    for r in results:
+        print("{:<10} {:>7g} {:>8.2f} {:>8} {:>9.3f} {:>11.0f} {:>12.0f} {:>12.0f}".format(
+            r["preset"], r["minutes"], r["density"], r["words"], r["dp_s"],
+            r["dp_words_per_s"], r["line_breaks_per_s"], r["srt_cues_per_s"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Caption engine benchmark suite",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--presets", nargs="+", default=DEFAULT_PRESETS,
+                        help="Presets to benchmark (default: broadcast social)")
+    parser.add_argument("--minutes", type=float, nargs="+", default=DEFAULT_MINUTES,
+                        help="Programme lengths in minutes (default: 1 10 60 600)")
+    parser.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES,
+                        help="Speaker marker probabilities per word")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per stage; the fastest is recorded")
+    parser.add_argument("--line-break-words", type=int, default=5000,
+                        help="End positions whose candidate spans time best_line_break()")
+    parser.add_argument("--output", type=Path,
+                        help="Write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, nargs="?", const=GATE_BASELINE,
+                        help="Stored results JSON to compare throughput against "
+                             "(without a path: the committed gate baseline)")
+    parser.add_argument("--max-regression", type=float, default=10.0,
+                        help="Allowed drop of a stage's mean calibrated throughput "
+                             "against the baseline, in percent")
+
+    args = parser.parse_args()
+
+    results = []
+    for preset in args.presets:
+        for minutes in args.minutes:
+            for density in args.densities:
+                results.append(run_case(
+                    preset, minutes, density, args.repeat, args.line_break_words))
+                print("  {} {:g} min density {:g} done".format(preset, minutes, density),
+                      file=sys.stderr)
+
+    print_results(results)
+
+    if args.output:
+        payload = {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print("\nWrote {}".format(args.output))
+
+    if args.baseline:
+        stored = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if (stored.get("machine"), stored.get("python")) != (platform.machine(), platform.python_version()):
+            print("\nWarning: baseline was recorded on {} / Python {}; throughput may not compare".format(
+                stored.get("machine"), stored.get("python")), file=sys.stderr)
+        failures = check_regressions(results, stored["results"], args.max_regression)
+        if failures:
+            print("\nThroughput regressions over {:g}%:".format(args.max_regression))
+            for line in failures:
+                print("  " + line)
+            return 1
+        print("\nNo throughput regression over {:g}% against {}".format(
+            args.max_regression, args.baseline))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
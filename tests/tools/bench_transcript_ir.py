@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Transcript IR benchmark tool.
+
+WHY: Long archives (multi-hour lectures, whole broadcast days) are held in
+memory as a Transcript IR while every formatter runs. The object IR costs
+one AssembledWord dataclass per word and punctuation mark; the columnar IR
+(core.columnar) stores the same fields in typed arrays. This tool measures
+what that saves and what the lazy word views cost the formatters.
+
+HOW: Generates a synthetic Soniox token array for each --hours length
+(sub-word splits, punctuation tokens, speaker changes; ~150 words per
+minute), assembles it, and builds the Transcript with
+build_transcript(columnar=False) and (columnar=True). For each IR it
+reports:
+
+  retained — memory held by the finished Transcript (tracemalloc), once
+             the assembled word list is dropped
+  per item — retained bytes per word or punctuation mark
+  build    — build_transcript() time, without tracing
+  format   — plain text + Premiere Pro formatter time on that IR
+
+USAGE:
+    python tests/tools/bench_transcript_ir.py
+    python tests/tools/bench_transcript_ir.py --hours 1 10
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_caption_engine import VOCABULARY
+from soniox_converter.core.assembler import assemble_tokens, build_transcript
+from soniox_converter.formatters.plain_text import PlainTextFormatter
+from soniox_converter.formatters.premiere_pro import PremiereProFormatter
+
+WORDS_PER_MINUTE = 150
+
+
+def make_tokens(n_words: int, speaker_density: float = 0.02, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate a synthetic Soniox token array.
+
+    Words longer than six characters are split into two sub-word tokens.
+    About one word in eight ends a sentence and one in twenty is followed
+    by a comma; both are separate punctuation tokens.
+    """
+    rnd = random.Random(seed)
+    tokens = []  # type: List[Dict[str, Any]]
+    t = 0
+    speaker = "1"
+    for k in range(n_words):
+        if k and rnd.random() < speaker_density:
+            speaker = "2" if speaker == "1" else "1"
+        text = rnd.choice(VOCABULARY)
+        dur = rnd.randint(120, 550)
+        conf = round(rnd.uniform(0.6, 1.0), 3)
+        lead = " " if k else ""
+        if len(text) > 6:
+            cut = len(text) // 2
+            half = dur // 2
+            tokens.append({"text": lead + text[:cut], "start_ms": t, "end_ms": t + half,
+                           "confidence": conf, "speaker": speaker, "language": "sv"})
+            tokens.append({"text": text[cut:], "start_ms": t + half, "end_ms": t + dur,
+                           "confidence": round(rnd.uniform(0.6, 1.0), 3), "speaker": speaker,
+                           "language": "sv"})
+        else:
+            tokens.append({"text": lead + text, "start_ms": t, "end_ms": t + dur,
+                           "confidence": conf, "speaker": speaker, "language": "sv"})
+        t += dur
+        roll = rnd.random()
+        if roll < 0.18:
+            tokens.append({"text": "." if roll < 0.13 else ",", "start_ms": t, "end_ms": t + 20,
+                           "confidence": 0.99, "speaker": speaker, "language": "sv"})
+            t += 20
+        t += rnd.randint(20, 250)
+    return tokens
+
+
+def _retained(tokens: List[Dict[str, Any]], columnar: bool):
+    """Build the Transcript under tracemalloc; return (transcript, retained bytes, peak bytes)."""
+    gc.collect()
+    tracemalloc.start()
+    words = assemble_tokens(tokens)
+    base = tracemalloc.get_traced_memory()[0]
+    transcript = build_transcript(words, "synthetic.mp4", columnar=columnar)
+    del words
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return transcript, retained, peak - base
+
+
+def bench_memory(hours: List[float]) -> None:
+    """Print retained memory and timings of the object and columnar IR."""
+    print("{:>6} {:>9} {:<9} {:>12} {:>10} {:>12} {:>10} {:>10}".format(
+        "Hours", "Items", "IR", "Retained", "Per item", "Build peak", "Build", "Format"))
+    print("-" * 84)
+    formatters = [PlainTextFormatter(), PremiereProFormatter()]
+    for h in hours:
+        tokens = make_tokens(int(h * 60 * WORDS_PER_MINUTE))
+        words = assemble_tokens(tokens)
+        n_items = len(words)
+        for label, columnar in (("objects", False), ("columnar", True)):
+            started = time.perf_counter()
+            build_transcript(words, "synthetic.mp4", columnar=columnar)
+            build_s = time.perf_counter() - started
+
+            transcript, retained, peak = _retained(tokens, columnar)
+            started = time.perf_counter()
+            for formatter in formatters:
+                formatter.format(transcript)
+            format_s = time.perf_counter() - started
+            del transcript
+            print("{:>6g} {:>9,} {:<9} {:>11.1f}M {:>9.0f}B {:>11.1f}M {:>9.2f}s {:>9.2f}s".format(
+                h, n_items, label, retained / 2 ** 20, retained / n_items, peak / 2 ** 20,
+                build_s, format_s))
+        del words
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript IR benchmark tool")
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 10],
+                        help="Transcript lengths in hours (default: 1 10)")
+    args = parser.parse_args()
+    bench_memory(args.hours)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
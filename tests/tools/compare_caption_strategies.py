@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Compare the approximate "beam" segmentation strategy with the exact DP.
+
+WHY: strategy="beam" scores only the few most promising caption starts per
+DP end position. Whether a width is good enough for drafts and previews is
+a trade-off between DP cost, the caption quality metrics the tuning tools
+report, and speed — it has to be measured, not guessed.
+
+HOW: For every preset and beam width, the fixture transcripts (the ones
+tune_caption_search.py uses) are segmented with the exact DP and with the
+beam, and the report lists, per strategy:
+
+  path_cost — total DP cost of the chosen captions (SegmentationStats),
+              relative to the exact DP in parentheses
+  identical — fixtures whose SRT is byte-identical to the exact output
+  metrics   — analyze_broadcast_captions() / analyze_captions(), summed
+              over fixtures as tune_caption_search.aggregate() does
+  synthetic — path_cost on a --minutes long synthetic programme
+              (bench_caption_engine.make_words()), relative to the exact DP
+  layouts   — best_line_break() computations on that programme, a
+              machine-independent measure of DP work
+  speed     — DP words per second on that programme, best of --repeat runs
+
+The table is printed as Markdown; --output also writes the numbers as JSON.
+
+USAGE:
+    python tests/tools/compare_caption_strategies.py
+    python tests/tools/compare_caption_strategies.py --widths 2 4 8 --minutes 60
+    python tests/tools/compare_caption_strategies.py --presets broadcast --output beam.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_caption_engine import make_words
+from format_captions import LineBreakCache, SegmentationStats
+from format_captions.compiled import compile_config, compiled_preset
+from format_captions.core import generate_srt, segment_words
+from format_captions.models import Word
+from tune_caption_search import ANALYZERS, aggregate, load_fixture_words
+
+# make_words() averages ~128 words per minute (see bench_caption_suite.py)
+WORDS_PER_MINUTE = 128
+
+DEFAULT_WIDTHS = [2, 3, 4, 6]
+DEFAULT_PRESETS = ["broadcast", "social"]
+
+# Metrics shown in the Markdown table, per preset
+TABLE_METRICS = {
+    "broadcast": ["weak_word_stragglers", "short_word_endings", "unpunctuated_boundaries",
+                  "single_line_blocks", "total_blocks"],
+    "social": ["weak_word_stragglers", "short_word_stragglers", "orphan_blocks",
+               "unpunctuated_boundaries", "total_blocks"],
+}
+
+
+def evaluate(
+    preset: str,
+    fixtures: Dict[str, List[Word]],
+    speed_words: List[Word],
+    width: Optional[int],
+    repeat: int,
+) -> Dict[str, Any]:
+    """Measure one strategy: width None is the exact DP, else the beam width."""
+    config = compiled_preset(preset).as_dict()
+    if width is not None:
+        config.update(strategy="beam", beam_width=width)
+    cfg = compile_config(config)
+
+    path_cost = 0.0
+    srts = {}  # type: Dict[str, str]
+    per_fixture = []  # type: List[Dict[str, Any]]
+    for name, words in fixtures.items():
+        stats = SegmentationStats()
+        segments = segment_words(words, cfg, LineBreakCache(), stats=stats)
+        path_cost += stats.path_cost
+        srts[name] = generate_srt(segments, cfg) if segments else ""
+        per_fixture.append(ANALYZERS[preset](srts[name]))
+
+    seconds = float("inf")
+    for _ in range(repeat):
+        stats = SegmentationStats()
+        started = time.perf_counter()
+        segment_words(speed_words, cfg, LineBreakCache(), stats=stats)
+        seconds = min(seconds, time.perf_counter() - started)
+
+    return {
+        "strategy": "exact" if width is None else "beam",
+        "beam_width": width,
+        "path_cost": path_cost,
+        "synthetic_path_cost": stats.path_cost,
+        "line_break_calls": stats.line_break_calls,
+        "metrics": aggregate(per_fixture),
+        "words_per_s": len(speed_words) / seconds if seconds > 0 else 0.0,
+        "srts": srts,
+    }
+
+
+def _cost_cell(cost: float, exact: float) -> str:
+    delta = (cost - exact) / abs(exact) * 100 if exact else 0.0
+    return "{:.1f} ({:+.2f}%)".format(cost, delta)
+
+
+def print_report(preset: str, rows: List[Dict[str, Any]]) -> None:
+    """Print one preset's comparison as a Markdown table."""
+    exact = rows[0]
+    metrics = TABLE_METRICS[preset]
+    header = (["strategy", "path_cost", "identical"] + metrics
+              + ["synthetic path_cost", "layouts", "words/s", "speed-up"])
+    print("\n### {}\n".format(preset))
+    print("| " + " | ".join(header) + " |")
+    print("|" + "---|" * len(header))
+    for row in rows:
+        label = "exact" if row["beam_width"] is None else "beam {}".format(row["beam_width"])
+        identical = sum(row["srts"][name] == srt for name, srt in exact["srts"].items())
+        cells = [
+            label,
+            _cost_cell(row["path_cost"], exact["path_cost"]),
+            "{}/{}".format(identical, len(exact["srts"])),
+        ]
+        cells += [str(row["metrics"][key]) for key in metrics]
+        cells += [
+            _cost_cell(row["synthetic_path_cost"], exact["synthetic_path_cost"]),
+            "{:,}".format(row["line_break_calls"]),
+            "{:,.0f}".format(row["words_per_s"]),
+            "{:.2f}x".format(row["words_per_s"] / exact["words_per_s"]),
+        ]
+        print("| " + " | ".join(cells) + " |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare beam segmentation with the exact DP")
+    parser.add_argument("--presets", nargs="+", default=DEFAULT_PRESETS, help="Presets to compare")
+    parser.add_argument("--widths", nargs="+", type=int, default=DEFAULT_WIDTHS, help="Beam widths")
+    parser.add_argument("--minutes", type=float, default=30,
+                        help="Length of the synthetic programme timed for speed (default: 30)")
+    parser.add_argument("--speaker-density", type=float, default=0.02,
+                        help="Speaker marker probability of the synthetic programme")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per strategy (best is kept)")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    fixtures = load_fixture_words()
+    speed_words = make_words(int(args.minutes * WORDS_PER_MINUTE), args.speaker_density)
+    print("{} fixtures; speed measured on {} synthetic words".format(len(fixtures), len(speed_words)))
+
+    results = {}  # type: Dict[str, List[Dict[str, Any]]]
+    for preset in args.presets:
+        rows = [evaluate(preset, fixtures, speed_words, None, args.repeat)]
+        for width in args.widths:
+            rows.append(evaluate(preset, fixtures, speed_words, width, args.repeat))
+        print_report(preset, rows)
+        results[preset] = rows
+
+    if args.output:
+        for rows in results.values():
+            for row in rows:
+                del row["srts"]
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print("\nWrote {}".format(args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Measure how often chunked monologue segmentation differs from the exact DP.
+
+WHY: segment_words_parallel(chunk_words=...) splits long stretches without
+speaker changes at sentence anchors and solves the chunks independently, so
+a two-hour lecture can use every core and each DP holds one window. The
+chunk paths are joined at seams, and the captions near a seam can differ
+from what the exact DP over the whole stretch would choose.
+
+HOW: For every preset, --seeds synthetic monologues of --minutes minutes
+(bench_caption_engine.make_words(), no speaker markers) are segmented with
+segment_words() and with every --chunks x --overlaps combination. Per
+combination the report lists:
+
+  seams     — anchors the monologues were split at
+  repaired  — seams whose chunk paths shared no caption boundary and were
+              re-solved exactly (SegmentationStats.seams_repaired)
+  differing — seams where the captions overlapping the seam's overlap
+              window (anchor +/- overlap words) are not exactly those of
+              the exact DP
+  captions  — captions not in the exact DP's output, out of all captions
+  speed     — words per second with --workers processes, and vs the exact
+              DP on one process
+
+The table is printed as Markdown; --output also writes it as JSON.
+
+USAGE:
+    python tests/tools/compare_chunked_segmentation.py
+    python tests/tools/compare_chunked_segmentation.py --minutes 240 --workers 4
+    python tests/tools/compare_chunked_segmentation.py --chunks 1000 --overlaps 16 32 64 128
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_caption_engine import make_words
+from format_captions import SegmentationStats
+from format_captions.compiled import compiled_preset
+from format_captions.core import segment_words
+from format_captions.models import Word
+from format_captions.parallel import segment_words_parallel, sentence_anchors
+from format_captions.spans import SpanIndex
+
+# make_words() averages ~128 words per minute (see bench_caption_suite.py)
+WORDS_PER_MINUTE = 128
+
+DEFAULT_PRESETS = ["broadcast", "social"]
+DEFAULT_CHUNKS = [500, 1000, 2000]
+DEFAULT_OVERLAPS = [16, 32, 64]
+
+CaptionKey = Tuple[float, float, str]
+
+
+def _keys(segments: List[Dict[str, Any]]) -> List[CaptionKey]:
+    return [(s["start"], s["end"], s["formatted"]) for s in segments]
+
+
+def _near(keys: List[CaptionKey], t0: float, t1: float) -> Set[CaptionKey]:
+    """Captions overlapping the time range [t0, t1]."""
+    return {k for k in keys if k[1] >= t0 and k[0] <= t1}
+
+
+def compare(
+    words: List[Word],
+    preset: str,
+    exact: List[CaptionKey],
+    chunk_words: int,
+    overlap_words: int,
+    workers: int,
+) -> Dict[str, Any]:
+    """Chunked segmentation of one monologue against its exact captions."""
+    config = compiled_preset(preset)
+    stats = SegmentationStats()
+    started = time.perf_counter()
+    segments = segment_words_parallel(words, config, max_workers=workers, stats=stats,
+                                      chunk_words=chunk_words, overlap_words=overlap_words)
+    seconds = time.perf_counter() - started
+    chunked = _keys(segments)
+
+    spans = SpanIndex(words)
+    differing = 0
+    for k in sentence_anchors(spans, 0, len(words), chunk_words, overlap_words):
+        t0 = words[max(0, k - overlap_words)].start
+        t1 = words[min(len(words) - 1, k + overlap_words)].end
+        differing += _near(chunked, t0, t1) != _near(exact, t0, t1)
+
+    exact_set = set(exact)
+    return {
+        "seams": stats.seams,
+        "repaired": stats.seams_repaired,
+        "differing": differing,
+        "captions": len(chunked),
+        "captions_differing": sum(k not in exact_set for k in chunked),
+        "seconds": seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare chunked monologue segmentation with the exact DP")
+    parser.add_argument("--presets", nargs="+", default=DEFAULT_PRESETS, help="Presets to compare")
+    parser.add_argument("--minutes", type=float, default=120, help="Length of each monologue (default: 120)")
+    parser.add_argument("--seeds", type=int, default=3, help="Monologues per preset (default: 3)")
+    parser.add_argument("--chunks", nargs="+", type=int, default=DEFAULT_CHUNKS, help="chunk_words values")
+    parser.add_argument("--overlaps", nargs="+", type=int, default=DEFAULT_OVERLAPS, help="overlap_words values")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for chunked runs (default: 1)")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    n_words = int(args.minutes * WORDS_PER_MINUTE)
+    monologues = [make_words(n_words, 0.0, seed) for seed in range(args.seeds)]
+    print("{} monologues of {} words; chunked runs on {} process(es)".format(
+        len(monologues), n_words, args.workers))
+
+    results = {}  # type: Dict[str, List[Dict[str, Any]]]
+    for preset in args.presets:
+        exact_keys = []  # type: List[List[CaptionKey]]
+        exact_seconds = 0.0
+        for words in monologues:
+            started = time.perf_counter()
+            exact_keys.append(_keys(segment_words(words, compiled_preset(preset))))
+            exact_seconds += time.perf_counter() - started
+
+        rows = []  # type: List[Dict[str, Any]]
+        for chunk_words in args.chunks:
+            for overlap_words in args.overlaps:
+                if chunk_words <= 2 * overlap_words:
+                    continue
+                runs = [
+                    compare(words, preset, exact, chunk_words, overlap_words, args.workers)
+                    for words, exact in zip(monologues, exact_keys)
+                ]
+                row = {"chunk_words": chunk_words, "overlap_words": overlap_words}  # type: Dict[str, Any]
+                for key in ("seams", "repaired", "differing", "captions", "captions_differing", "seconds"):
+                    row[key] = sum(run[key] for run in runs)
+                rows.append(row)
+
+        total_words = n_words * len(monologues)
+        print("\n### {}\n".format(preset))
+        print("Exact DP: {:,.0f} words/s\n".format(total_words / exact_seconds))
+        print("| chunk_words | overlap_words | seams | repaired | differing | captions differing | words/s | vs exact |")
+        print("|---|---|---|---|---|---|---|---|")
+        for row in rows:
+            print("| {} | {} | {} | {} | {} ({:.1f}%) | {} of {} ({:.2f}%) | {:,.0f} | {:.2f}x |".format(
+                row["chunk_words"], row["overlap_words"], row["seams"], row["repaired"],
+                row["differing"], row["differing"] / row["seams"] * 100 if row["seams"] else 0.0,
+                row["captions_differing"], row["captions"],
+                row["captions_differing"] / row["captions"] * 100 if row["captions"] else 0.0,
+                total_words / row["seconds"], exact_seconds / row["seconds"],
+            ))
+        results[preset] = rows
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print("\nWrote {}".format(args.output))
+
+
+if __name__ == "__main__":
+    main()
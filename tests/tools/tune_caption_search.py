@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""Parallel hyperparameter search over caption preset weights and limits.
+
+WHY: tune_social_captions.py and tune_broadcast_captions.py evaluate one
+hand-written preset per run and re-load and re-assemble every fixture
+transcript each time, so a sweep over weights means hours of scripted
+re-runs. A search wants to score hundreds of configurations against the
+same fixtures.
+
+HOW: The fixture transcripts are loaded, assembled and adapted to caption
+words once, in the parent process, and handed to every worker of a process
+pool through its initializer. Each worker also builds one SpanIndex per
+fixture (it is preset-independent), so a task is just "segment this fixture
+with this config and measure it". Workers extract SpanFeatures once per
+fixture and set of limits, so configs that only change weights re-run the
+DP from the stored features instead of re-scoring every span. Candidate configs are the base preset
+with some weights or limits replaced:
+
+  random  — --trials configs sampled from the search space
+  grid    — every combination of the space's grid values
+  halving — successive halving: --trials random configs are scored on a
+            few fixtures, the best 1/--eta advance to more fixtures, and so
+            on until the survivors are scored on the full corpus
+
+Quality metrics are the ones the tuning tools already report
+(analyze_captions() for social, analyze_broadcast_captions() for
+broadcast), summed over fixtures with ratios recomputed from the totals.
+Configs are ranked by --objective (lower is better), ties broken by
+unpunctuated boundaries, and the leaderboard is printed and written as
+JSON with each config's overrides.
+
+SEARCH SPACE:
+    By default every weight of the base preset varies between 0.5x and 2x
+    its value (grid: 0.5x, 1x, 2x). --params restricts the varied keys.
+    --space FILE gives explicit ranges as JSON, keyed by weight name or
+    top-level config key: a list is a set of values, {"min": a, "max": b}
+    a continuous range (integers stay integers), e.g.
+        {"weak_end": [20, 35, 50], "max_lookback_words": {"min": 6, "max": 14}}
+
+USAGE:
+    python tests/tools/tune_caption_search.py --preset social --trials 200
+    python tests/tools/tune_caption_search.py --preset broadcast --strategy grid \\
+        --params weak_end boundary_weak_end punct_bonus
+    python tests/tools/tune_caption_search.py --preset social --strategy halving \\
+        --trials 500 --eta 3 --output leaderboard.json
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from format_captions.core import generate_srt
+from format_captions.features import SpanFeatures
+from format_captions.models import Word
+from format_captions.presets import PRESETS
+from format_captions.spans import SpanIndex
+from soniox_converter.adapters.caption_adapter import transcript_to_caption_words
+from tune_broadcast_captions import analyze_broadcast_captions
+from tune_social_captions import analyze_captions, load_test_transcript
+
+CORPUS_DIR = Path(__file__).parent.parent / "fixtures/caption_tuning/real_transcripts"
+
+ANALYZERS = {
+    "broadcast": analyze_broadcast_captions,
+    "social": analyze_captions,
+}
+
+# Metrics that are per-block means rather than counts; aggregated weighted by blocks
+_MEAN_METRICS = ("avg_block_length", "block_length_std", "avg_line_balance")
+
+# Default multiplicative range for weights without an explicit space
+DEFAULT_SCALES = (0.5, 1.0, 2.0)
+
+# Per-worker state, set by _init_worker()
+_FIXTURES = {}  # type: Dict[str, Tuple[List[Word], SpanIndex]]
+_FEATURES = {}  # type: Dict[Tuple[str, str], SpanFeatures]
+
+
+def load_fixture_words(corpus_dir: Path = CORPUS_DIR) -> Dict[str, List[Word]]:
+    """Load every fixture transcript once and adapt it to caption words."""
+    return {
+        path.stem: transcript_to_caption_words(load_test_transcript(path))
+        for path in sorted(corpus_dir.glob("*.json"))
+    }
+
+
+def _init_worker(fixture_words: Dict[str, List[Word]]) -> None:
+    """Process pool initializer: index each fixture once per worker."""
+    global _FIXTURES
+    _FIXTURES = {name: (words, SpanIndex(words)) for name, words in fixture_words.items()}
+
+
+def _features(fixture: str, config: Dict) -> SpanFeatures:
+    """SpanFeatures of a fixture for config's limits, extracted once per worker."""
+    limits = json.dumps({k: v for k, v in config.items() if k != "weights"}, sort_keys=True)
+    key = (fixture, limits)
+    if key not in _FEATURES:
+        words, spans = _FIXTURES[fixture]
+        _FEATURES[key] = SpanFeatures.extract(words, config, spans)
+    return _FEATURES[key]
+
+
+def _evaluate(task: Tuple[int, str, Dict, str]) -> Tuple[int, str, Dict[str, Any]]:
+    """Worker task: segment one fixture with one config and measure the SRT."""
+    config_id, preset, config, fixture = task
+    segments = _features(fixture, config).segment(config["weights"])
+    srt = generate_srt(segments, config) if segments else ""
+    return config_id, fixture, ANALYZERS[preset](srt)
+
+
+def aggregate(per_fixture: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-fixture metrics: counts summed, ratios and means re-derived."""
+    totals = {}  # type: Dict[str, Any]
+    blocks = sum(m["total_blocks"] for m in per_fixture)
+    for key in per_fixture[0]:
+        if key.endswith("_ratio"):
+            continue
+        if key in _MEAN_METRICS:
+            weighted = sum(m[key] * m["total_blocks"] for m in per_fixture)
+            totals[key] = weighted / blocks if blocks else 0.0
+        else:
+            totals[key] = sum(m[key] for m in per_fixture)
+    totals["weak_word_ratio"] = totals["weak_word_stragglers"] / blocks * 100 if blocks else 0.0
+    if "single_line_blocks" in totals:
+        totals["single_line_ratio"] = totals["single_line_blocks"] / blocks * 100 if blocks else 0.0
+    return totals
+
+
+# ---------------------------------------------------------------------------
+# Search space
+# ---------------------------------------------------------------------------
+
+def build_space(
+    base: Dict, params: Optional[List[str]], space_file: Optional[Path]
+) -> Dict[str, Any]:
+    """Return {key: list of values | {"min", "max"}} for the keys to vary.
+
+    Raises:
+        ValueError: If a key is neither a weight nor a config key of base.
+    """
+    explicit = {}  # type: Dict[str, Any]
+    if space_file is not None:
+        explicit = json.loads(space_file.read_text(encoding="utf-8"))
+
+    keys = params or list(explicit) or list(base["weights"])
+    space = {}  # type: Dict[str, Any]
+    for key in keys:
+        current = _get_value(base, key)
+        if key in explicit:
+            space[key] = explicit[key]
+        elif isinstance(current, int):
+            values = [max(1, int(round(current * s))) for s in DEFAULT_SCALES]
+            space[key] = {"values": values, "min": values[0], "max": values[-1]}
+        else:
+            values = [current * s for s in DEFAULT_SCALES]
+            space[key] = {"values": values, "min": values[0], "max": values[-1]}
+    return space
+
+
+def _get_value(config: Dict, key: str) -> Any:
+    if key in config["weights"]:
+        return config["weights"][key]
+    if key in config and key != "weights":
+        return config[key]
+    raise ValueError("Unknown config key '{}'".format(key))
+
+
+def apply_overrides(base: Dict, overrides: Dict[str, Any]) -> Dict:
+    """Return a copy of base with weights or limits replaced by overrides."""
+    config = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if key in config["weights"]:
+            config["weights"][key] = value
+        else:
+            config[key] = value
+    return config
+
+
+def _grid_values(spec: Any) -> List[Any]:
+    if isinstance(spec, list):
+        values = spec
+    elif "values" in spec:
+        values = spec["values"]
+    elif isinstance(spec["min"], int) and isinstance(spec["max"], int):
+        values = [spec["min"], (spec["min"] + spec["max"]) // 2, spec["max"]]
+    else:
+        values = [spec["min"], (spec["min"] + spec["max"]) / 2, spec["max"]]
+    # Zero weights scale to the same value three times
+    return list(dict.fromkeys(values))
+
+
+def _sample(spec: Any, rng: random.Random) -> Any:
+    if isinstance(spec, list):
+        return rng.choice(spec)
+    lo, hi = spec["min"], spec["max"]
+    if isinstance(lo, int) and isinstance(hi, int):
+        return rng.randint(lo, hi)
+    return round(rng.uniform(min(lo, hi), max(lo, hi)), 4)
+
+
+def grid_candidates(space: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Every combination of the space's grid values."""
+    keys = list(space)
+    return [dict(zip(keys, combo))
+            for combo in itertools.product(*(_grid_values(space[k]) for k in keys))]
+
+
+def random_candidates(space: Dict[str, Any], n: int, seed: int) -> List[Dict[str, Any]]:
+    """n configs sampled from the space; the first is the unchanged base."""
+    rng = random.Random(seed)
+    candidates = [{}]  # type: List[Dict[str, Any]]
+    while len(candidates) < n:
+        candidates.append({key: _sample(spec, rng) for key, spec in space.items()})
+    return candidates
+
+
+# ---------------------------------------------------------------------------
+# Search driver
+# ---------------------------------------------------------------------------
+
+class Search:
+    """Scores candidate configs on fixture subsets, reusing earlier results."""
+
+    def __init__(self, preset: str, base: Dict, pool: ProcessPoolExecutor,
+                 workers: int, fixtures: List[str]) -> None:
+        self.preset = preset
+        self.base = base
+        self.pool = pool
+        self.workers = workers
+        self.fixtures = fixtures
+        self.candidates = []  # type: List[Dict[str, Any]]
+        self.results = {}  # type: Dict[int, Dict[str, Dict[str, Any]]]
+
+    def add(self, overrides: Dict[str, Any]) -> int:
+        self.candidates.append(overrides)
+        self.results[len(self.candidates) - 1] = {}
+        return len(self.candidates) - 1
+
+    def score(self, config_ids: List[int], n_fixtures: int) -> None:
+        """Evaluate configs on the first n_fixtures fixtures not yet scored."""
+        tasks = []
+        for cid in config_ids:
+            config = apply_overrides(self.base, self.candidates[cid])
+            for fixture in self.fixtures[:n_fixtures]:
+                if fixture not in self.results[cid]:
+                    tasks.append((cid, self.preset, config, fixture))
+        chunk = max(1, len(tasks) // (4 * self.workers))
+        for cid, fixture, metrics in self.pool.map(_evaluate, tasks, chunksize=chunk):
+            self.results[cid][fixture] = metrics
+
+    def summary(self, cid: int) -> Dict[str, Any]:
+        return aggregate([self.results[cid][f] for f in self.fixtures if f in self.results[cid]])
+
+
+def _rank_key(objective: str):
+    return lambda metrics: (metrics[objective], metrics["unpunctuated_boundaries"])
+
+
+def successive_halving(search: Search, ids: List[int], eta: int, objective: str) -> None:
+    """Score ids on growing fixture subsets, keeping the best 1/eta each rung."""
+    n = len(search.fixtures)
+    rungs = max(1, int(math.log(max(len(ids), 1), eta)))
+    budgets = sorted({max(1, math.ceil(n / eta ** k)) for k in range(rungs)})
+    if budgets[-1] != n:
+        budgets.append(n)
+    key = _rank_key(objective)
+    for budget in budgets:
+        search.score(ids, budget)
+        print("  rung: {} configs on {} fixtures".format(len(ids), budget), file=sys.stderr)
+        if budget == n:
+            break
+        ids.sort(key=lambda cid: key(search.summary(cid)))
+        ids = ids[:max(1, len(ids) // eta)]
+
+
+def leaderboard(search: Search, objective: str, fixtures_needed: int) -> List[Dict[str, Any]]:
+    """Ranked entries for configs scored on the full corpus."""
+    key = _rank_key(objective)
+    entries = []
+    for cid, overrides in enumerate(search.candidates):
+        if len(search.results[cid]) < fixtures_needed:
+            continue
+        entries.append({"overrides": overrides, "metrics": search.summary(cid)})
+    entries.sort(key=lambda e: key(e["metrics"]))
+    for rank, entry in enumerate(entries, 1):
+        entry["rank"] = rank
+    return entries
+
+
+def print_leaderboard(entries: List[Dict[str, Any]], objective: str, top: int) -> None:
+    print("\n{:>4} {:>12} {:>8} {:>8} {:>8}  {}".format(
+        "Rank", objective[:12], "Blocks", "Weak", "NoPunct", "Overrides"))
+    print("-" * 100)
+    for entry in entries[:top]:
+        m = entry["metrics"]
+        overrides = ", ".join("{}={:g}".format(k, v) for k, v in sorted(entry["overrides"].items()))
+        print("{:>4} {:>12.3f} {:>8} {:>8} {:>8}  {}".format(
+            entry["rank"], m[objective], m["total_blocks"], m["weak_word_stragglers"],
+            m["unpunctuated_boundaries"], overrides or "(base preset)"))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parallel caption preset hyperparameter search",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--preset", default="social", choices=sorted(ANALYZERS),
+                        help="Base preset and metric set (default: social)")
+    parser.add_argument("--strategy", default="random", choices=["random", "grid", "halving"],
+                        help="Search strategy (default: random)")
+    parser.add_argument("--trials", type=int, default=100,
+                        help="Configs to sample for random and halving search")
+    parser.add_argument("--eta", type=int, default=3,
+                        help="Successive halving keeps 1/eta of the configs per rung")
+    parser.add_argument("--params", nargs="+",
+                        help="Weights or config keys to vary (default: all weights)")
+    parser.add_argument("--space", type=Path,
+                        help="JSON file with explicit value ranges per key")
+    parser.add_argument("--objective", default="weak_word_ratio",
+                        help="Aggregate metric to minimize (default: weak_word_ratio)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--top", type=int, default=20, help="Leaderboard rows to print")
+    parser.add_argument("--output", type=Path, help="Write the full leaderboard as JSON")
+
+    args = parser.parse_args()
+
+    base = copy.deepcopy(PRESETS[args.preset])
+    metric_names = aggregate([ANALYZERS[args.preset]("")])
+    if args.objective not in metric_names:
+        print("Unknown objective '{}'. Available: {}".format(
+            args.objective, ", ".join(sorted(metric_names))))
+        return 1
+    space = build_space(base, args.params, args.space)
+    if args.strategy == "grid":
+        candidates = grid_candidates(space)
+    else:
+        candidates = random_candidates(space, args.trials, args.seed)
+
+    started = time.perf_counter()
+    fixture_words = load_fixture_words()
+    # Largest fixtures last, so halving's early rungs run on the cheap ones
+    fixtures = sorted(fixture_words, key=lambda name: len(fixture_words[name]))
+    print("Loaded {} fixtures; searching {} configs ({}) on {} workers".format(
+        len(fixtures), len(candidates), args.strategy, args.workers), file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(fixture_words,)) as pool:
+        search = Search(args.preset, base, pool, args.workers, fixtures)
+        ids = [search.add(c) for c in candidates]
+        if args.strategy == "halving":
+            successive_halving(search, ids, args.eta, args.objective)
+        else:
+            search.score(ids, len(fixtures))
+
+    entries = leaderboard(search, args.objective, len(fixtures))
+    elapsed = time.perf_counter() - started
+    print_leaderboard(entries, args.objective, args.top)
+    print("\n{} configs scored in {:.1f}s".format(len(search.candidates), elapsed))
+
+    if args.output:
+        payload = {
+            "preset": args.preset,
+            "strategy": args.strategy,
+            "objective": args.objective,
+            "space": space,
+            "fixtures": fixtures,
+            "leaderboard": entries,
+        }
+        args.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print("Wrote {}".format(args.output))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())